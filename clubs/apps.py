@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class ClubsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'clubs'
+
+    def ready(self):
+        # register the signal receivers maintaining denormalized counters
+        from . import signals
+
+        # SQLite tuning and health checks of persistent connections, see system/database.py
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+        from system.database import apply_pragmas, check_connections
+        connection_created.connect(apply_pragmas)
+        request_started.connect(check_connections)
@@ -0,0 +1,89 @@
+"""Front-end assets served from our own static files instead of third-party CDNs.
+
+VENDOR_ASSETS pins the libraries the pages load, and the copies in static/vendor are committed.
+`manage.py vendor_assets` downloads them and checks each file against its Subresource Integrity
+hash, and with --check verifies the committed copies; a library that has not been vendored yet is
+linked from its CDN by the {% vendor_asset %} tag. BUNDLES lists the page scripts that
+`manage.py build_assets` concatenates from static/js/src into static/js.
+
+In production whitenoise serves all of it under content-hashed names, gzip and brotli compressed
+ahead of time, with far-future immutable cache headers (see STATIC_MANIFEST in settings).
+"""
+import base64
+import hashlib
+import os
+from typing import NamedTuple
+
+from django.conf import settings
+
+
+class VendorAsset(NamedTuple):
+    path: str
+    url: str
+    # sha384-... as in an integrity attribute, or None for files the CDN pages did not pin
+    integrity: str = None
+
+
+VENDOR_ASSETS = {
+    'bootstrap.css': VendorAsset(
+        'vendor/bootstrap-5.1.3/bootstrap.min.css',
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css',
+        'sha384-1BmE4kWBq78iYhFldvKuhfTAU6auU8tT94WrHftjDbrCEXSU1oBoqyl2QvZ6jIW3',
+    ),
+    'bootstrap.js': VendorAsset(
+        'vendor/bootstrap-5.1.3/bootstrap.min.js',
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.min.js',
+        'sha384-QJHtvGhmr9XOIpI6YVutG+2QOK9T+ZnN4kzFN1RtK3zEFEIsxhlmWl5/YESvpZ13',
+    ),
+    'jquery.js': VendorAsset(
+        'vendor/jquery-3.6.0/jquery.min.js',
+        'https://code.jquery.com/jquery-3.6.0.min.js',
+        'sha256-/xUj+3OJU5yExlq6GSYGSHk7tPXikynS7ogEvDej/m4=',
+    ),
+    'popper.js': VendorAsset(
+        'vendor/popper-2.10.2/popper.min.js',
+        'https://cdn.jsdelivr.net/npm/@popperjs/core@2.10.2/dist/umd/popper.min.js',
+        'sha384-7+zCNj/IqJ95wo16oMtfsKbZ9ccEh31eOz1HGyDuCQ6wgnyJNSYdrPa03rtR1zdB',
+    ),
+}
+
+BUNDLES = {
+    'js/home.js': ['js/src/common.js', 'js/src/home.js'],
+    'js/clubs.js': ['js/src/common.js', 'js/src/clubs.js'],
+    'js/tournament.js': ['js/src/common.js', 'js/src/tournament.js'],
+}
+
+
+def static_dir():
+    """The project's own static directory, where vendored files and bundles are written."""
+    return settings.STATICFILES_DIRS[0]
+
+
+def integrity_of(content, algorithm = 'sha384'):
+    digest = hashlib.new(algorithm, content).digest()
+    return f'{algorithm}-{base64.b64encode(digest).decode()}'
+
+
+def check_integrity(asset, content):
+    """Return whether content matches the asset's pinned hash; unpinned assets always match."""
+    if asset.integrity is None:
+        return True
+    algorithm = asset.integrity.split('-', 1)[0]
+    return integrity_of(content, algorithm) == asset.integrity
+
+
+def is_vendored(asset):
+    return os.path.isfile(os.path.join(static_dir(), asset.path))
+
+
+def build_bundle(sources):
+    """Return the concatenation of the given files of static_dir().
+
+    The bundles are not minified: whitenoise serves them gzip and brotli compressed, which leaves
+    little for a minifier to save.
+    """
+    parts = []
+    for source in sources:
+        with open(os.path.join(static_dir(), source), encoding = 'utf-8') as file:
+            parts.append(file.read())
+    return f'/* built by manage.py build_assets from {", ".join(sources)} */\n' + ''.join(parts)
@@ -0,0 +1,111 @@
+"""Cached club rosters, tournament summaries and club profiles.
+
+Entries live in the CLUB_CACHE alias of CACHES and are keyed by club, by the club's version and by
+a per-club generation number kept in the same cache. Club.version is in the database, so a write
+made by any worker retires the entries of every other worker, whatever the cache backend; the
+receivers in clubs.signals bump it whenever anything an entry shows changes. They also bump the
+generation, now and again when the transaction commits, so that an entry computed from data as
+it was before the commit, or in a transaction that rolls back, never becomes current. For the
+same reason misses are computed from the primary database even in views that read from a replica.
+
+With CLUB_CACHE_STATS, hits and misses are counted in the cache as well, so a backend shared by
+several workers reports their totals. That costs a cache round trip per lookup, and FileBasedCache
+increments by reading and rewriting a file, so concurrent workers can lose counts.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from system.routers import replica_reads_enabled
+
+KINDS = ('roster', 'tournaments', 'profile')
+
+
+def club_cache():
+    return caches[settings.CLUB_CACHE]
+
+
+def generation_key(club_id):
+    return f'club:{club_id}:generation'
+
+
+def generation(club_id):
+    return generations([club_id])[club_id]
+
+
+def generations(club_ids) -> dict:
+    """Return {club id: generation}, with one cache round trip when every generation is known."""
+    cache = club_cache()
+    keys = {generation_key(club_id): club_id for club_id in club_ids}
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        # a clock value rather than 0, so that an evicted generation never revives old entries
+        now = time.time_ns()
+        for key in missing:
+            cache.add(key, now, timeout = None)
+        found.update(cache.get_many(missing))
+    return {keys[key]: value for key, value in found.items()}
+
+
+def bump_generation(club_id):
+    cache = club_cache()
+    try:
+        cache.incr(generation_key(club_id))
+    except ValueError:
+        cache.add(generation_key(club_id), time.time_ns(), timeout = None)
+
+
+def invalidate_club(club_id):
+    """Retire the cached entries of a club, now and once the current transaction commits."""
+    bump_generation(club_id)
+    transaction.on_commit(lambda: bump_generation(club_id))
+
+
+def count(kind, outcome):
+    if not settings.CLUB_CACHE_STATS:
+        return
+    cache = club_cache()
+    key = f'stats:{kind}:{outcome}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout = None):
+            cache.incr(key)
+
+
+def cached(kind, club, parts, compute):
+    """Return the entry of the given kind for the club and parts, computing and storing it on a miss."""
+    cache = club_cache()
+    # club.version and the generation are read before compute() reads the database, see the module docstring
+    raw = ':'.join(str(part) for part in parts)
+    key = f'{kind}:{club.pk}:{club.version}:{generation(club.pk)}:{hashlib.md5(raw.encode()).hexdigest()}'
+    value = cache.get(key)
+    if value is not None:
+        count(kind, 'hits')
+        return value
+    count(kind, 'misses')
+    token = replica_reads_enabled.set(False)
+    try:
+        value = compute()
+    finally:
+        replica_reads_enabled.reset(token)
+    cache.set(key, value)
+    return value
+
+
+def cache_stats() -> dict:
+    """Return {kind: {'hits': n, 'misses': n}} as counted since the last reset_cache_stats()."""
+    keys = [f'stats:{kind}:{outcome}' for kind in KINDS for outcome in ('hits', 'misses')]
+    values = club_cache().get_many(keys)
+    return {
+        kind: {outcome: values.get(f'stats:{kind}:{outcome}', 0) for outcome in ('hits', 'misses')}
+        for kind in KINDS
+    }
+
+
+def reset_cache_stats():
+    club_cache().delete_many([f'stats:{kind}:{outcome}' for kind in KINDS for outcome in ('hits', 'misses')])
@@ -0,0 +1,203 @@
+"""Server-sent events telling open dashboards that their club changed.
+
+clubs.signals publishes a small event for every change logged in ClubChange. Streams only say
+*that* something changed; the page then fetches the delta from /club/changes.
+"""
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http.cookies import SimpleCookie
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import close_old_connections
+from django.db.models import Max
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from django.utils.module_loading import import_string
+
+from system.database import check_connections
+
+
+class LocalBroker:
+    """In-process pub/sub. Only reaches streams served by the same process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = defaultdict(set)
+
+    def publish(self, club_id, event):
+        # Called from sync code on any thread; each subscriber's queue belongs to its event loop
+        with self.lock:
+            subscribers = list(self.subscribers.get(club_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    async def subscribe(self, club_id):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self.lock:
+            self.subscribers[club_id].add(subscriber)
+        try:
+            while True:
+                yield await subscriber[1].get()
+        finally:
+            with self.lock:
+                self.subscribers[club_id].discard(subscriber)
+                if not self.subscribers[club_id]:
+                    del self.subscribers[club_id]
+
+
+class ChangeLogBroker(LocalBroker):
+    """Broker for several worker processes: every worker watches the shared ClubChange table,
+    with one poll per club that has open streams rather than one per stream.
+
+    The polls run on a thread of the broker's own, with its own database connection, rather than on
+    the single thread sync_to_async gives the worker's sync code, so they never wait behind it."""
+
+    def __init__(self, interval=1.0):
+        super().__init__()
+        self.interval = interval
+        self.pollers = {}
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="club-events-poll")
+
+    def publish(self, club_id, event):
+        # the change is already in the database, where every worker's poller will find it
+        pass
+
+    async def subscribe(self, club_id):
+        if club_id not in self.pollers:
+            self.pollers[club_id] = asyncio.ensure_future(self.poll(club_id))
+        try:
+            async for event in super().subscribe(club_id):
+                yield event
+        finally:
+            if club_id not in self.subscribers and club_id in self.pollers:
+                self.pollers.pop(club_id).cancel()
+
+    def latest_change(self, club_id):
+        from clubs.models import ClubChange
+
+        # the poll thread has no request cycle, so its connection is recycled and checked here instead
+        close_old_connections()
+        check_connections()
+        return ClubChange.objects.filter(club_id=club_id).aggregate(latest=Max("id"))["latest"] or 0
+
+    async def poll(self, club_id):
+        loop = asyncio.get_running_loop()
+        since = await loop.run_in_executor(self.executor, self.latest_change, club_id)
+        while True:
+            await asyncio.sleep(self.interval)
+            latest = await loop.run_in_executor(self.executor, self.latest_change, club_id)
+            if latest > since:
+                since = latest
+                super().publish(club_id, {"club": club_id})
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.CLUB_EVENTS_BROKER)(**settings.CLUB_EVENTS_BROKER_OPTIONS)
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    if setting in ("CLUB_EVENTS_BROKER", "CLUB_EVENTS_BROKER_OPTIONS"):
+        get_broker.cache_clear()
+
+
+def publish(club_id, event):
+    get_broker().publish(club_id, event)
+
+
+@sync_to_async
+def club_for_stream(scope):
+    """Return (status, club id) for an event stream request, authenticating it with the session cookie."""
+    from clubs.models import ClubMembership
+
+    cookies = SimpleCookie()
+    for name, value in scope.get("headers", []):
+        if name == b"cookie":
+            cookies.load(value.decode("latin-1"))
+    session_key = cookies[settings.SESSION_COOKIE_NAME].value if settings.SESSION_COOKIE_NAME in cookies else None
+    session = import_string(settings.SESSION_ENGINE + ".SessionStore")(session_key)
+    user = get_user(SimpleNamespace(session=session))
+    if not user.is_authenticated:
+        return 403, None
+
+    club_name = parse_qs(scope.get("query_string", b"").decode()).get("name", [None])[0]
+    if not club_name:
+        return 400, None
+    membership = ClubMembership.objects.filter(foreign_club__name=club_name, foreign_user=user).values_list(
+        "foreign_club_id", "membership"
+    ).first()
+    if membership is None or membership[1] < ClubMembership.UserLevels.MEMBER:
+        return 403, None
+    return 200, membership[0]
+
+
+def cors_headers(scope) -> list:
+    """Headers letting the pages of CLUB_EVENTS_ALLOWED_ORIGINS open a stream served from another host."""
+    origin = dict(scope.get("headers", [])).get(b"origin", b"").decode("latin-1")
+    if origin not in settings.CLUB_EVENTS_ALLOWED_ORIGINS:
+        return []
+    return [
+        (b"access-control-allow-origin", origin.encode("latin-1")),
+        (b"access-control-allow-credentials", b"true"),
+        (b"vary", b"Origin"),
+    ]
+
+
+async def club_events_app(scope, receive, send):
+    """ASGI application streaming a club's events as text/event-stream."""
+    status, club_id = await club_for_stream(scope)
+    if status != 200:
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"text/plain"), *cors_headers(scope)]})
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no"),
+            *cors_headers(scope),
+        ],
+    })
+    await send({"type": "http.response.body", "body": b"retry: 5000\n\n", "more_body": True})
+
+    async def disconnected():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    events = get_broker().subscribe(club_id)
+    next_event = asyncio.ensure_future(events.__anext__())
+    disconnect = asyncio.ensure_future(disconnected())
+    try:
+        while True:
+            done, _ = await asyncio.wait(
+                {next_event, disconnect},
+                timeout=settings.CLUB_EVENTS_KEEPALIVE,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnect in done:
+                break
+            if next_event in done:
+                body = f"event: change\ndata: {json.dumps(next_event.result())}\n\n"
+                next_event = asyncio.ensure_future(events.__anext__())
+            else:
+                # comments keep proxies from closing an idle connection
+                body = ": keepalive\n\n"
+            await send({"type": "http.response.body", "body": body.encode(), "more_body": True})
+    finally:
+        next_event.cancel()
+        disconnect.cancel()
+        # the subscription unregisters itself once the pending __anext__ has been cancelled
+        await asyncio.gather(next_event, disconnect, return_exceptions=True)
+        await events.aclose()
@@ -0,0 +1,131 @@
+"""Streaming exports of club rosters and tournament participants, as CSV or JSON lines.
+
+Rows are read with iterator(chunk_size=EXPORT_CHUNK_SIZE) and sent in buffers of about
+EXPORT_BUFFER_SIZE characters, so memory use does not grow with the club. The views in
+clubs/views/export_views.py stream them with StreamingHttpResponse, and `manage.py export_club`
+writes them to a file. The views are served by WSGI workers only (see system/asgi.py), where an
+export occupies one request thread and no other request waits for it.
+"""
+import csv
+import io
+import json
+from typing import Iterator, NamedTuple
+
+from django.conf import settings
+from django.db import router
+from django.utils.text import slugify
+
+from clubs.models import User, Club, ClubMembership, Tournament, TournamentOrganizer, TournamentParticipant
+
+EXPORT_FORMATS = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+MEMBER_COLUMNS = ("id", "name", "email", "experience", "level", "bio")
+PARTICIPANT_COLUMNS = ("id", "name", "email", "experience", "bio")
+# spreadsheet applications run cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class Export(NamedTuple):
+    filename: str
+    content_type: str
+    chunks: Iterator[bytes]
+
+
+def member_rows(club, using = None):
+    levels = dict(ClubMembership.UserLevels.choices)
+    experience = dict(User.ChessExperience.choices)
+    memberships = ClubMembership.objects.using(using).filter(
+        foreign_club = club, membership__gte = ClubMembership.UserLevels.MEMBER
+    ).order_by("-membership", "id").values_list(
+        "foreign_user_id", "foreign_user__name", "foreign_user__email",
+        "foreign_user__chess_experience", "membership", "foreign_user__bio"
+    )
+    for user_id, name, email, chess_experience, membership, bio in memberships.iterator(chunk_size = settings.EXPORT_CHUNK_SIZE):
+        yield (user_id, name, email, experience.get(chess_experience, chess_experience), levels[membership], bio)
+
+
+def participant_rows(tournament, using = None):
+    experience = dict(User.ChessExperience.choices)
+    participants = TournamentParticipant.objects.using(using).filter(tournament = tournament).order_by("id").values_list(
+        "participant_id", "participant__name", "participant__email", "participant__chess_experience", "participant__bio"
+    )
+    for user_id, name, email, chess_experience, bio in participants.iterator(chunk_size = settings.EXPORT_CHUNK_SIZE):
+        yield (user_id, name, email, experience.get(chess_experience, chess_experience), bio)
+
+
+def csv_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def encode_rows(export_format, columns, rows):
+    """Yield the rows as CSV with a header line, or as one JSON object per line, in UTF-8 buffers."""
+    buffer = io.StringIO()
+    if export_format == "csv":
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        write = lambda row: writer.writerow([csv_cell(value) for value in row])
+    else:
+        write = lambda row: buffer.write(json.dumps(dict(zip(columns, row))) + "\n")
+    for row in rows:
+        write(row)
+        if buffer.tell() >= settings.EXPORT_BUFFER_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def members_export(club, export_format, using = None) -> Export:
+    return Export(
+        f"{slugify(club.name) or 'club'}-members.{export_format}",
+        EXPORT_FORMATS[export_format],
+        encode_rows(export_format, MEMBER_COLUMNS, member_rows(club, using))
+    )
+
+
+def participants_export(tournament, export_format, using = None) -> Export:
+    return Export(
+        f"{slugify(tournament.club.name) or 'club'}-{slugify(tournament.name) or 'tournament'}-participants.{export_format}",
+        EXPORT_FORMATS[export_format],
+        encode_rows(export_format, PARTICIPANT_COLUMNS, participant_rows(tournament, using))
+    )
+
+
+# The functions below check a request's parameters and permissions and return (status, Export or None).
+# The rows are read after the view has returned, so they pin the database the router chooses now.
+
+def club_members_export(user, params):
+    """Export of a club's members (?name=club&format=csv|jsonl), for its owner and officers."""
+    club_name = params.get("name")
+    export_format = params.get("format", "csv")
+    if not club_name or export_format not in EXPORT_FORMATS:
+        return 400, None
+    membership = ClubMembership.objects.filter(foreign_club__name = club_name, foreign_user = user).select_related("foreign_club").first()
+    if membership is None:
+        if not Club.objects.filter(name = club_name).exists():
+            return 404, None
+        return 403, None
+    if membership.membership < ClubMembership.UserLevels.OFFICER:
+        return 403, None
+    return 200, members_export(membership.foreign_club, export_format, router.db_for_read(ClubMembership))
+
+
+def tournament_participants_export(user, params):
+    """Export of a tournament's participants (?club=...&tournament=...&format=csv|jsonl), for its
+    organizers and the club's owner and officers."""
+    club_name = params.get("club")
+    tournament_name = params.get("tournament")
+    export_format = params.get("format", "csv")
+    if not club_name or not tournament_name or export_format not in EXPORT_FORMATS:
+        return 400, None
+    tournament = Tournament.objects.filter(club__name = club_name, name = tournament_name).select_related("club").first()
+    if tournament is None:
+        return 404, None
+    is_organizer = TournamentOrganizer.objects.filter(tournament = tournament, organizer = user).exists()
+    is_staff = ClubMembership.objects.filter(
+        foreign_club = tournament.club, foreign_user = user, membership__gte = ClubMembership.UserLevels.OFFICER
+    ).exists()
+    if not is_organizer and not is_staff:
+        return 403, None
+    return 200, participants_export(tournament, export_format, router.db_for_read(TournamentParticipant))
@@ -1,7 +1,7 @@
 """Forms for the microblogs app."""
 from django import forms
 from django.contrib.auth import authenticate
-from .models import User, Club, Tournament, ClubMembership, TournamentOrganizer, TournamentParticipant
+from .models import User, Club, Tournament, ClubMembership, TournamentOrganizer
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
 from django.contrib.auth.forms import UserChangeForm
@@ -45,12 +45,11 @@ class CreateTournamentForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         user = kwargs.pop('user')
         super().__init__(*args, **kwargs)
-        cm = ClubMembership.objects.filter(foreign_user = user, membership__gte = ClubMembership.UserLevels.OFFICER)
-        list = []
-        for clubs in cm:
-            list.append(clubs.foreign_club.id)
-
-        self.fields['club'].queryset = Club.objects.filter(id__in=list)
+        # clubs the user is an officer or the owner of
+        self.fields['club'].queryset = Club.objects.filter(
+            clubmembership__foreign_user = user,
+            clubmembership__membership__gte = ClubMembership.UserLevels.OFFICER
+        )
 
 
     def clean(self):
@@ -192,31 +191,7 @@ class TournamentOrganizerForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         # print('after')
 
-        # get officers and owner of the club where the tournament is held
-        club_officers = ClubMembership.objects.filter(
-            foreign_club = tournament.club,
-            membership__gte = ClubMembership.UserLevels.OFFICER
-        )
-
-        # add the ids of retrieved moderators to a list
-        officers_list = []
-        for officer in club_officers:
-            officers_list.append(officer.foreign_user.id)
-
-        # retrieve and remove all moderators that are already participating in the tournament
-        participating_officers = TournamentParticipant.objects.filter(
-            tournament = tournament,
-            participant_id__in = officers_list
-        )
-        for po in participating_officers:
-            officers_list.remove(po.participant.id)
-
-        # retrieve and remove all moderators that are already coorganizing the tournament
-        organizing_officers = TournamentOrganizer.objects.filter(tournament = tournament)
-        for oo in organizing_officers:
-            officers_list.remove(oo.organizer.id)
-
-        self.fields['organizer'].queryset = User.objects.filter(id__in = officers_list)
+        self.fields['organizer'].queryset = tournament.eligible_coorganizers()
 
         self.tournament = tournament
         self.organizing_role = TournamentOrganizer.OrganizingRoles.COORGANIZER
@@ -1,5 +1,14 @@
+import base64
+import binascii
+import hashlib
+import json
+from functools import wraps
 from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
 from django.shortcuts import redirect
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from system.routers import read_from_replica
 
 #decorator which stops the user from logging in to the system
 def login_prohibited(view_function):
@@ -9,3 +18,61 @@ def login_prohibited(view_function):
         else:
             return view_function(request)
     return modified_view_function
+
+#decorator letting a read-only view read from the replica, unless the client wrote recently (see system/routers.py)
+def replica_reads(view_function):
+    def use_replica(request):
+        return request.method in ('GET', 'HEAD') and settings.REPLICA_STICKY_COOKIE not in request.COOKIES
+
+    @wraps(view_function)
+    def modified_view_function(request, *args, **kwargs):
+        if not use_replica(request):
+            return view_function(request, *args, **kwargs)
+        with read_from_replica():
+            return view_function(request, *args, **kwargs)
+    return modified_view_function
+
+#opaque cursor tokens used for keyset pagination
+def encode_cursor(*values):
+    raw = ':'.join(str(value) for value in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+#range of the integer columns cursors and change log positions are compared with
+MIN_DB_INTEGER = -2 ** 63
+MAX_DB_INTEGER = 2 ** 63 - 1
+
+#raises ValueError when the token was not produced by encode_cursor
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token.encode()).decode()
+    except (binascii.Error, UnicodeError):
+        raise ValueError('Invalid cursor')
+    values = tuple(int(value) for value in raw.split(':'))
+    if any(not MIN_DB_INTEGER <= value <= MAX_DB_INTEGER for value in values):
+        raise ValueError('Invalid cursor')
+    return values
+
+#strong ETag for a JSON payload determined by the given values (e.g. a club's version and the caller)
+def version_etag(*values):
+    raw = ':'.join(str(value) for value in values)
+    return '"' + hashlib.md5(raw.encode()).hexdigest() + '"'
+
+#True when the request's If-None-Match already names this ETag, also as the weak ETag of a compressed response
+def etag_matches(request, etag):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is None:
+        return False
+    return if_none_match.strip() == '*' or etag in [tag[2:] if tag.startswith('W/') else tag for tag in parse_etags(if_none_match)]
+
+#JSON response carrying an ETag, revalidated by the browser on every poll
+def json_response(payload, etag):
+    response = HttpResponse(json.dumps(payload), content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+def not_modified(etag):
+    response = HttpResponseNotModified()
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
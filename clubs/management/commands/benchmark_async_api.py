@@ -0,0 +1,103 @@
+#comparing throughput of the read-only JSON APIs under concurrent clients through the WSGI and the ASGI
+#handler, which is why the Procfile serves them from WSGI
+import asyncio
+import contextlib
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from clubs.management.commands.benchmark_routes import build_fixture
+
+
+class Command(BaseCommand):
+    help = "Seeds a throwaway database and measures requests per second of the read-only JSON APIs through the WSGI handler (one thread per worker) and the ASGI handler (concurrent requests on one event loop, with the views on the single thread Django runs sync views on)."
+
+    ROUTES = {
+        "club": {"name": "{club}"},
+        "club_dashboard": {"name": "{club}"},
+        "pending_applications": {"name": "{club}"},
+        "club_tournaments": {"name": "{club}"},
+        "applications": {},
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=10000, help="Approximate club memberships in the dataset.")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per route and deployment.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                call_command(
+                    "seed", "--bulk", "--users", str(max(1, options["scale"] // 5)), "--clubs", "10",
+                    "--count", "5", "--tournaments", "10", stdout=io.StringIO()
+                )
+            fixture = build_fixture()
+            urls = {}
+            for name, params in Command.ROUTES.items():
+                params = {key: value.format(**fixture) for key, value in params.items()}
+                urls[name] = reverse(name) + ("?" + urlencode(params) if params else "")
+
+            wsgi = self.measure_wsgi(urls, fixture["owner_user"], options["requests"], options["concurrency"])
+            asgi = self.measure_asgi(urls, fixture["owner_user"], options["requests"], options["concurrency"])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{options['concurrency']} concurrent clients, {options['requests']} requests per route")
+        self.stdout.write(f"{'route':24} {'WSGI req/s':>12} {'ASGI req/s':>12} {'ratio':>7}")
+        for name in urls:
+            self.stdout.write(f"{name:24} {wsgi[name]:>12.1f} {asgi[name]:>12.1f} {asgi[name] / wsgi[name]:>7.2f}")
+
+    #A thread per client, like that many sync gunicorn workers.
+    def measure_wsgi(self, urls, user, requests, concurrency) -> dict:
+        clients = []
+        for _ in range(concurrency):
+            clients.append(Client())
+            clients[-1].force_login(user)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for name, url in urls.items():
+                def work(client, count):
+                    for _ in range(count):
+                        assert client.get(url).status_code == 200
+                started = time.perf_counter()
+                list(pool.map(work, clients, self.share(requests, concurrency)))
+                results[name] = requests / (time.perf_counter() - started)
+        return results
+
+    #All clients on one event loop, like a single uvicorn worker. The views run on the handler's one
+    #thread for sync code, which they share with everything else the worker runs through sync_to_async.
+    def measure_asgi(self, urls, user, requests, concurrency) -> dict:
+        login = Client()
+        login.force_login(user)
+        clients = []
+        for _ in range(concurrency):
+            clients.append(AsyncClient())
+            clients[-1].cookies = login.cookies
+
+        async def run(url):
+            async def work(client, count):
+                for _ in range(count):
+                    assert (await client.get(url)).status_code == 200
+            await asyncio.gather(*(work(client, count) for client, count in zip(clients, self.share(requests, concurrency))))
+
+        results = {}
+        for name, url in urls.items():
+            started = time.perf_counter()
+            asyncio.run(run(url))
+            results[name] = requests / (time.perf_counter() - started)
+        return results
+
+    def share(self, requests, concurrency) -> list:
+        return [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
@@ -0,0 +1,69 @@
+#measuring bytes on the wire and CPU per request of the JSON APIs with and without response compression
+import contextlib
+import io
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from clubs.management.commands.benchmark_routes import build_fixture
+
+
+class Command(BaseCommand):
+    help = "Seeds a throwaway database and requests the roster, pending members and tournaments APIs with each Accept-Encoding, reporting the response size and the CPU time per request. \"cold\" compresses every response; \"cached\" serves the compressed body kept under the response's ETag (system.middleware.CompressionMiddleware)."
+
+    ROUTES = ["club", "pending_applications", "club_tournaments"]
+    ENCODINGS = ["identity", "gzip", "br"]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=10000, help="Approximate club memberships in the dataset.")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per route, encoding and mode.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                call_command(
+                    "seed", "--bulk", "--users", str(max(1, options["scale"] // 5)), "--clubs", "10",
+                    "--count", "5", "--tournaments", "10", stdout=io.StringIO()
+                )
+            fixture = build_fixture()
+            client = Client()
+            client.force_login(fixture["owner_user"])
+            rows = []
+            for name in Command.ROUTES:
+                url = reverse(name) + "?" + urlencode({"name": fixture["club"]})
+                for encoding in Command.ENCODINGS:
+                    size, cold = self.measure(client, url, encoding, options["requests"], cached=False)
+                    _, warm = self.measure(client, url, encoding, options["requests"], cached=True)
+                    rows.append((name, encoding, size, cold, warm))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{options['requests']} requests per route, encoding and mode; CPU ms per request")
+        self.stdout.write(f"{'route':24} {'encoding':>9} {'bytes':>9} {'ratio':>7} {'cold ms':>9} {'cached ms':>10}")
+        identity = {}
+        for name, encoding, size, cold, warm in rows:
+            identity.setdefault(name, size)
+            self.stdout.write(f"{name:24} {encoding:>9} {size:>9} {size / identity[name]:>7.2f} {cold:>9.3f} {warm:>10.3f}")
+
+    def measure(self, client, url, encoding, requests, cached):
+        """Return the body size and the mean CPU milliseconds per request."""
+        caches = {**settings.CACHES, "compression_benchmark": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache" if cached else "django.core.cache.backends.dummy.DummyCache", "LOCATION": "compression_benchmark"}}
+        with override_settings(CACHES=caches, COMPRESSION_CACHE="compression_benchmark"):
+            # the first request warms up the club cache and, in cached mode, the compressed body
+            response = client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+            assert response.status_code == 200
+            assert response.get("Content-Encoding", "identity") == encoding
+            started = time.process_time()
+            for _ in range(requests):
+                client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+            elapsed = time.process_time() - started
+        return len(response.content), elapsed * 1000 / requests
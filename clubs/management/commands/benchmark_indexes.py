@@ -0,0 +1,84 @@
+#reporting query plans and timings of the hot lookups with and without the composite indexes
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from clubs.models import User, Club, ClubMembership, Tournament, TournamentOrganizer, TournamentParticipant
+
+
+class Command(BaseCommand):
+    help = "Prints EXPLAIN output and timings of the hot lookups before and after the composite indexes. Run against a seeded database (e.g. 1M memberships)."
+
+    # The composite indexes added for the access paths below (see clubs/migrations/0004_composite_indexes.py)
+    INDEXES = [
+        "membership_roster_idx",
+        "membership_user_level_idx",
+        "tournament_club_deadline_idx",
+        "organizer_role_idx",
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="How many times each query is timed.")
+
+    def handle(self, *args, **options):
+        club = Club.objects.annotate(size=Count("clubmembership")).order_by("-size").first()
+        tournament = Tournament.objects.filter(club=club).first() or Tournament.objects.first()
+        user = User.objects.annotate(size=Count("clubmembership")).order_by("-size").first()
+        if club is None or tournament is None or user is None:
+            raise CommandError("Seed the database first, e.g. with `manage.py seed`.")
+
+        queries = self.queries(club, tournament, user)
+        self.stdout.write(f"{ClubMembership.objects.count()} memberships, largest club '{club.name}' with {club.size} members.")
+        after = self.measure(queries, options["repeat"], "after")
+        with transaction.atomic():
+            # DDL is transactional on SQLite and Postgres, so the indexes come back on rollback
+            with connection.cursor() as cursor:
+                for name in Command.INDEXES:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+            before = self.measure(queries, options["repeat"], "before")
+            transaction.set_rollback(True)
+
+        for label in queries:
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            for state, results in (("before", before), ("after", after)):
+                plan, seconds = results[label]
+                self.stdout.write(f"  {state}: {seconds * 1000:.3f} ms")
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+    #The lookups the views in clubs/views issue on every request.
+    def queries(self, club, tournament, user) -> dict:
+        return {
+            "club roster page": ClubMembership.objects.filter(
+                foreign_club=club, membership__gte=ClubMembership.UserLevels.MEMBER
+            ).order_by("-membership", "id")[:50],
+            "club owner": ClubMembership.objects.filter(foreign_club=club, membership=ClubMembership.UserLevels.OWNER),
+            "pending applications": ClubMembership.objects.filter(foreign_club=club, membership=ClubMembership.UserLevels.PENDING),
+            "caller membership": ClubMembership.objects.filter(foreign_club__name=club.name, foreign_user=user),
+            "user applications": ClubMembership.objects.filter(foreign_user=user, membership=ClubMembership.UserLevels.PENDING),
+            "open club tournaments": Tournament.objects.filter(club=club, signup_deadline__gte=timezone.now()),
+            "tournament by name": Tournament.objects.filter(club__name=club.name, name=tournament.name),
+            "tournament organizer": TournamentOrganizer.objects.filter(
+                tournament=tournament, organizing_role=TournamentOrganizer.OrganizingRoles.ORGANIZER
+            ),
+            "participation": TournamentParticipant.objects.filter(tournament=tournament, participant=user),
+        }
+
+    #Returns {label: (query plan, mean seconds per evaluation)}.
+    def measure(self, queries, repeat, phase) -> dict:
+        results = {}
+        for label, queryset in queries.items():
+            plan = self.explain(queryset, phase)
+            seconds = timeit.timeit(lambda: list(queryset.all()), number=repeat) / repeat
+            results[label] = (plan, seconds)
+        return results
+
+    def explain(self, queryset, phase) -> str:
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            # the comment keeps SQLite from reusing a plan prepared before the indexes were dropped
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql} /* {phase} */", params)
+            return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
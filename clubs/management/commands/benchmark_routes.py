@@ -0,0 +1,221 @@
+#benchmarking query count, latency and response size of every route at several data sizes
+import contextlib
+import copy
+import io
+import json
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import reverse
+from faker import Faker
+
+from clubs.models import Club, ClubMembership, Tournament
+from system.urls import apipatterns, urlpatterns
+
+
+class Command(BaseCommand):
+    help = "Seeds throwaway databases at several sizes, requests every route and compares query counts, latency and response sizes with a baseline."
+
+    DEFAULT_BASELINE = settings.BASE_DIR / "benchmarks" / "routes_baseline.json"
+
+    # url name -> (method, who is logged in, parameters); parameters are formatted with the fixture
+    # built for each dataset. Every named route in system/urls.py must be listed here.
+    ROUTES = {
+        "index": ("GET", None, {}),
+        "log_in": ("GET", None, {}),
+        "sign_up": ("GET", None, {}),
+        "log_out": ("GET", "owner", {}),
+        "home": ("GET", "owner", {}),
+        "profile": ("GET", "owner", {}),
+        "edit_profile": ("GET", "owner", {}),
+        "password": ("GET", "owner", {}),
+        "clubs": ("GET", "owner", {}),
+        "club_profile": ("GET", "owner", {"name": "{club}"}),
+        "club_application": ("GET", "owner", {"email": "{pending}", "name": "{club}"}),
+        "create_club": ("GET", "owner", {}),
+        "create_tournament": ("GET", "owner", {}),
+        "tournament": ("GET", "owner", {}),
+        "club_tournament": ("GET", "owner", {"club": "{club}", "tournament": "{tournament}"}),
+        "manage_tournament": ("GET", "owner", {"club": "{club}", "tournament": "{tournament}"}),
+        "club": ("GET", "owner", {"name": "{club}"}),
+        "club_dashboard": ("GET", "owner", {"name": "{club}"}),
+        "club_changes": ("GET", "owner", {"name": "{club}", "since": "0"}),
+        "pending_applications": ("GET", "owner", {"name": "{club}"}),
+        "club_tournaments": ("GET", "owner", {"name": "{club}"}),
+        "applications": ("GET", "member", {}),
+        "submit_application": ("POST", "member", {"name": "{other_club}"}),
+        "change_rank": ("POST", "owner", {"email": "{member}", "name": "{club}", "promoting": "true"}),
+        "toggle_tournament": ("POST", "member", {"club": "{club}", "tournament": "{tournament}"}),
+        "manage_tournament_coorganizers": ("GET", "owner", {"club": "{club}", "tournament": "{tournament}"}),
+        "export_club_members": ("GET", "owner", {"name": "{club}"}),
+        "export_tournament_participants": ("GET", "owner", {"club": "{club}", "tournament": "{tournament}"}),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000, 100000], help="Approximate club memberships per dataset.")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed requests per route.")
+        parser.add_argument("--baseline", default=str(Command.DEFAULT_BASELINE), help="Baseline JSON to compare with.")
+        parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative growth of latency and response size.")
+        parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline instead of comparing.")
+
+    def handle(self, *args, **options):
+        check_routes()
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            results = {str(scale): self.run_scale(scale, options["repeat"]) for scale in options["scales"]}
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.report(results)
+        if options["update_baseline"]:
+            with open(options["baseline"], "w") as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+                f.write("\n")
+            self.stdout.write(f"Wrote baseline to {options['baseline']}.")
+            return
+
+        try:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            raise CommandError(f"No baseline at {options['baseline']}; run with --update-baseline first.")
+        regressions = compare(results, baseline, options["tolerance"])
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(regression))
+        if regressions:
+            raise CommandError(f"{len(regressions)} performance regressions.")
+        self.stdout.write(self.style.SUCCESS("No performance regressions."))
+
+    #Seeds a fresh dataset of the given size and measures every route against it.
+    def run_scale(self, scale, repeat) -> dict:
+        call_command("flush", interactive=False, verbosity=0)
+        random.seed(scale)
+        Faker.seed(scale)
+        clubs, per_user = 10, 5
+        with contextlib.redirect_stdout(io.StringIO()):
+            call_command(
+                "seed", "--bulk", "--users", str(max(1, scale // per_user)), "--clubs", str(clubs),
+                "--count", str(per_user), "--tournaments", "10", stdout=io.StringIO()
+            )
+
+        fixture = build_fixture()
+        clients = {None: Client()}
+        for role in ("owner", "member"):
+            clients[role] = Client()
+            clients[role].force_login(fixture[role + "_user"])
+
+        results = {}
+        # expected 403/404 responses would otherwise log a warning per request
+        logger = logging.getLogger("django.request")
+        level = logger.level
+        logger.setLevel(logging.ERROR)
+        try:
+            for name, (method, role, params) in Command.ROUTES.items():
+                params = {key: value.format(**fixture) for key, value in params.items()}
+                results[name] = measure(clients[role], method, reverse(name), params, repeat)
+        finally:
+            logger.setLevel(level)
+        return results
+
+    def report(self, results):
+        scales = list(results)
+        self.stdout.write(f"{'route':32} " + " ".join(f"{'q@' + scale:>9}" for scale in scales) + f" {'p50 ms':>8} {'p95 ms':>8} {'bytes':>9}")
+        for name in Command.ROUTES:
+            queries = [results[scale][name]["queries"] for scale in scales]
+            largest = results[scales[-1]][name]
+            grows = " grows with data" if queries[-1] > queries[0] else ""
+            self.stdout.write(
+                f"{name:32} " + " ".join(f"{q:>9}" for q in queries)
+                + f" {largest['p50_ms']:>8.2f} {largest['p95_ms']:>8.2f} {largest['bytes']:>9}{grows}"
+            )
+
+
+def check_routes():
+    """Raise CommandError unless every named route has a benchmark entry."""
+    names = {pattern.name for pattern in urlpatterns + apipatterns if getattr(pattern, "name", None)}
+    missing = sorted(names - set(Command.ROUTES))
+    if missing:
+        raise CommandError(f"Routes without a benchmark entry: {', '.join(missing)}")
+
+
+def build_fixture() -> dict:
+    """Pick the largest club, its owner, one of its members and matching objects to request."""
+    club = Club.objects.order_by("-member_count", "id").first()
+    memberships = ClubMembership.objects.filter(foreign_club=club).select_related("foreign_user")
+    owner = memberships.get(membership=ClubMembership.UserLevels.OWNER).foreign_user
+    member = memberships.filter(membership=ClubMembership.UserLevels.MEMBER).order_by("id").first()
+    member = member.foreign_user if member else owner
+    pending = memberships.filter(membership=ClubMembership.UserLevels.PENDING).order_by("id").first()
+    other_club = Club.objects.exclude(clubmembership__foreign_user=member).order_by("id").first() or club
+    tournament = Tournament.objects.filter(club=club).order_by("id").first()
+    return {
+        "club": club.name,
+        "other_club": other_club.name,
+        "tournament": tournament.name if tournament else "",
+        "owner_user": owner,
+        "member_user": member,
+        "member": member.email,
+        "pending": pending.foreign_user.email if pending else member.email,
+    }
+
+
+def measure(client, method, url, params, repeat) -> dict:
+    """Request a route repeatedly, rolling back any writes, and summarise queries, latency and size."""
+    timings = []
+    queries = size = 0
+    for i in range(repeat + 1):
+        cookies = copy.deepcopy(client.cookies)
+        # CaptureQueriesContext counts by offset into a bounded log, which stops growing once full
+        connection.queries_log.clear()
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = getattr(client, method.lower())(url, params)
+                # streamed exports read their rows while the body is consumed
+                content = b"".join(response.streaming_content) if response.streaming else response.content
+                elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        client.cookies = cookies
+        # the first request warms up caches and is not timed
+        if i:
+            timings.append(elapsed * 1000)
+            queries = max(queries, len(context.captured_queries))
+            size = max(size, len(content))
+    timings.sort()
+    return {
+        "queries": queries,
+        "p50_ms": round(percentile(timings, 0.5), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "bytes": size,
+    }
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, round(fraction * (len(values) - 1)))] if values else 0.0
+
+
+def compare(results, baseline, tolerance) -> list:
+    """Return a message for every route that got worse than the baseline."""
+    regressions = []
+    for scale, routes in results.items():
+        for name, current in routes.items():
+            previous = baseline.get(scale, {}).get(name)
+            if previous is None:
+                continue
+            if current["queries"] > previous["queries"]:
+                regressions.append(f"{name} @ {scale}: {current['queries']} queries, baseline {previous['queries']}")
+            # a little absolute slack keeps sub-millisecond noise from failing the build
+            if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance) + 1:
+                regressions.append(f"{name} @ {scale}: p95 {current['p95_ms']:.2f} ms, baseline {previous['p95_ms']:.2f} ms")
+            if current["bytes"] > previous["bytes"] * (1 + tolerance):
+                regressions.append(f"{name} @ {scale}: {current['bytes']} bytes, baseline {previous['bytes']}")
+    return regressions
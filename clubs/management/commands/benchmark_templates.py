@@ -0,0 +1,90 @@
+#timing renders of the clubs, tournaments and club profile pages with and without template caching
+import statistics
+import time
+from datetime import datetime
+
+import pytz
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory, override_settings
+
+from clubs.models import User, Club
+
+
+class Command(BaseCommand):
+    help = "Prints the time to render clubs.html, tournaments.html and club_profile.html with N rows: with the default loaders, with the cached loader, and with the cached loader and warm {% cache %} fragments. Renders in-memory objects, so it needs no database."
+
+    LOADERS = [
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader",
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000], help="Clubs or tournaments per page.")
+        parser.add_argument("--repeat", type=int, default=5, help="Renders timed per template and configuration.")
+
+    def handle(self, *args, **options):
+        configurations = {
+            "default loaders": (self.LOADERS, "django.core.cache.backends.dummy.DummyCache"),
+            "cached loader": ([("django.template.loaders.cached.Loader", self.LOADERS)], "django.core.cache.backends.dummy.DummyCache"),
+            "cached + fragments": ([("django.template.loaders.cached.Loader", self.LOADERS)], "django.core.cache.backends.locmem.LocMemCache"),
+        }
+        request = RequestFactory().get("/")
+        request.user = User(name="benchmark", email="benchmark@example.org")
+
+        self.stdout.write(f"{'template':20} {'rows':>7} " + " ".join(f"{name:>20}" for name in configurations) + "   (median ms)")
+        for rows in options["rows"]:
+            for template_name, context in self.contexts(rows).items():
+                timings = []
+                for loaders, fragment_cache in configurations.values():
+                    caches = {**settings.CACHES, "template_fragments": {"BACKEND": fragment_cache, "LOCATION": "benchmark"}}
+                    with override_settings(CACHES=caches):
+                        timings.append(self.time_render(loaders, template_name, context, request, options["repeat"]))
+                self.stdout.write(f"{template_name:20} {rows:>7} " + " ".join(f"{timing:>20.1f}" for timing in timings))
+
+    def time_render(self, loaders, template_name, context, request, repeat) -> float:
+        engine = DjangoTemplates({
+            "NAME": "benchmark",
+            "DIRS": [],
+            "APP_DIRS": False,
+            "OPTIONS": {
+                "loaders": loaders,
+                "context_processors": settings.TEMPLATES[0]["OPTIONS"]["context_processors"],
+            },
+        })
+        # the first render fills the loader cache and the fragments, as earlier requests would have
+        engine.get_template(template_name).render(context, request)
+        durations = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            # like render(), which looks the template up on every request
+            engine.get_template(template_name).render(context, request)
+            durations.append((time.perf_counter() - started) * 1000)
+        return statistics.median(durations)
+
+    def contexts(self, rows) -> dict:
+        clubs = []
+        for i in range(rows):
+            club = Club(id=i + 1, name=f"club {i}", location="london", description="A chess club", member_count=i % 50)
+            club.owner_name = f"owner {i}"
+            club.status = i % 4 - 3
+            clubs.append(club)
+        deadline = datetime(2030, 1, 1, tzinfo=pytz.UTC)
+        tournaments = [{
+            "name": f"tournament {i}",
+            "club": clubs[i % len(clubs)],
+            "description": "A chess tournament",
+            "signup_deadline": deadline,
+        } for i in range(rows)]
+        profile = {
+            "club": clubs[0],
+            "members": clubs[0].member_count,
+            "owner": {"name": "owner 0", "gravatar": "https://www.gravatar.com/avatar/0"},
+            "tournaments": [{"name": tour["name"], "description": tour["description"], "members": 8} for tour in tournaments],
+        }
+        return {
+            "clubs.html": {"clubs": clubs},
+            "tournaments.html": {"tournaments": tournaments, "stamp": "benchmark"},
+            "club_profile.html": profile,
+        }
@@ -0,0 +1,34 @@
+#bundling the page scripts listed in clubs.assets.BUNDLES
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from clubs.assets import BUNDLES, build_bundle, static_dir
+
+
+class Command(BaseCommand):
+    help = "Concatenates the page scripts of static/js/src into the bundles the templates load (clubs/assets.py). Run it after editing a page script and commit the bundles; collectstatic then gives them content-hashed names."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Only report bundles that are out of date, and fail if there are any.")
+
+    def handle(self, *args, **options):
+        stale = []
+        for bundle, sources in BUNDLES.items():
+            path = os.path.join(static_dir(), bundle)
+            content = build_bundle(sources)
+            current = None
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as file:
+                    current = file.read()
+            if current == content:
+                continue
+            stale.append(bundle)
+            if not options["check"]:
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(content)
+                self.stdout.write(f"Built {bundle} ({len(content)} bytes).")
+        if options["check"] and stale:
+            raise CommandError(f"Out of date: {', '.join(stale)}. Run manage.py build_assets.")
+        if not stale:
+            self.stdout.write("All bundles are up to date.")
@@ -0,0 +1,23 @@
+#reporting how often the club cache answered rosters, tournament summaries and profiles
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from clubs.cache import cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Prints the hits and misses of the club cache (clubs/cache.py), counted when the CLUB_CACHE_STATS environment variable is set. The counters live in the cache itself, so with the default per-process LocMemCache this command only sees its own process; use a shared backend such as FileBasedCache to see the workers' totals."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Set the counters back to zero after printing them.")
+
+    def handle(self, *args, **options):
+        if not settings.CLUB_CACHE_STATS:
+            self.stderr.write("CLUB_CACHE_STATS is not set, so nothing has been counted.")
+        self.stdout.write(f"{'kind':12} {'hits':>10} {'misses':>10} {'hit rate':>9}")
+        for kind, counts in cache_stats().items():
+            total = counts["hits"] + counts["misses"]
+            rate = f"{counts['hits'] / total:.1%}" if total else "-"
+            self.stdout.write(f"{kind:12} {counts['hits']:>10} {counts['misses']:>10} {rate:>9}")
+        if options["reset"]:
+            reset_cache_stats()
@@ -0,0 +1,32 @@
+#compacting the club change log down to the newest entry per changed member or tournament of an existing club
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+
+from clubs.models import Club, ClubChange
+
+
+class Command(BaseCommand):
+    help = "Deletes club change log entries superseded by a newer entry for the same member or tournament, and the entries of deleted clubs. Safe to run periodically (e.g. from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many entries would be deleted.")
+
+    def handle(self, *args, **options):
+        # /club/changes serves the current state of every subject changed after `since`, so
+        # an older entry for a subject tells a client nothing the newest one does not
+        superseded = ClubChange.objects.filter(Exists(ClubChange.objects.filter(
+            club=OuterRef("club"),
+            kind=OuterRef("kind"),
+            subject_id=OuterRef("subject_id"),
+            id__gt=OuterRef("id")
+        )))
+        # ClubChange.club has no database constraint, so deleting a club leaves its entries behind
+        orphaned = ClubChange.objects.filter(~Exists(Club.objects.filter(pk=OuterRef("club_id"))))
+        if options["dry_run"]:
+            self.stdout.write(f"Found {superseded.count()} superseded change log entries.")
+            self.stdout.write(f"Found {orphaned.count()} change log entries of deleted clubs.")
+        else:
+            deleted, _ = superseded.delete()
+            self.stdout.write(f"Deleted {deleted} superseded change log entries.")
+            deleted, _ = orphaned.delete()
+            self.stdout.write(f"Deleted {deleted} change log entries of deleted clubs.")
@@ -0,0 +1,38 @@
+#streaming a club's members, or a tournament's participants, to a file as CSV or JSON lines
+from django.core.management.base import BaseCommand, CommandError
+
+from clubs.exports import EXPORT_FORMATS, members_export, participants_export
+from clubs.models import Club, Tournament
+
+
+class Command(BaseCommand):
+    help = "Writes a club's members, or with --tournament the participants of one of its tournaments, as CSV or JSON lines. Rows are streamed in chunks (clubs/exports.py), so memory use stays flat however large the club is."
+
+    def add_arguments(self, parser):
+        parser.add_argument("club", help="Name of the club.")
+        parser.add_argument("--tournament", help="Export the participants of this tournament of the club instead of its members.")
+        parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv", help="Output format.")
+        parser.add_argument("--output", help="File to write; defaults to standard output.")
+
+    def handle(self, *args, **options):
+        club = Club.objects.filter(name=options["club"]).first()
+        if club is None:
+            raise CommandError(f"No club named {options['club']!r}.")
+        if options["tournament"] is None:
+            export = members_export(club, options["format"])
+        else:
+            tournament = Tournament.objects.filter(club=club, name=options["tournament"]).select_related("club").first()
+            if tournament is None:
+                raise CommandError(f"{club.name} has no tournament named {options['tournament']!r}.")
+            export = participants_export(tournament, options["format"])
+
+        if options["output"] is None:
+            for chunk in export.chunks:
+                self.stdout.write(chunk.decode(), ending="")
+            return
+        size = 0
+        with open(options["output"], "wb") as file:
+            for chunk in export.chunks:
+                file.write(chunk)
+                size += len(chunk)
+        self.stderr.write(f"Wrote {size} bytes to {options['output']}.")
@@ -0,0 +1,31 @@
+#recomputing the denormalized member and participant counters from the underlying rows
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from clubs.models import Club, ClubMembership, Tournament, TournamentParticipant
+
+
+class Command(BaseCommand):
+    help = "Recomputes and repairs the member and participant counters of clubs and tournaments."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report counters that are out of date.")
+
+    def handle(self, *args, **options):
+        members = ClubMembership.objects.filter(foreign_club=OuterRef("pk")).order_by().values("foreign_club").annotate(count=Count("id")).values("count")
+        participants = TournamentParticipant.objects.filter(tournament=OuterRef("pk")).order_by().values("tournament").annotate(count=Count("id")).values("count")
+        with transaction.atomic():
+            clubs = self.repair(Club.objects.all(), "member_count", members, options["dry_run"])
+            tournaments = self.repair(Tournament.objects.all(), "participant_count", participants, options["dry_run"])
+        verb = "Found" if options["dry_run"] else "Repaired"
+        self.stdout.write(f"{verb} {clubs} club and {tournaments} tournament counters.")
+
+    #Updates every row whose counter differs from the actual count in one UPDATE and returns how many there were.
+    def repair(self, queryset, field, actual, dry_run) -> int:
+        stale = queryset.annotate(actual=Coalesce(Subquery(actual), 0)).exclude(**{field: F("actual")})
+        stale_ids = list(stale.values_list("id", flat=True))
+        if stale_ids and not dry_run:
+            queryset.filter(id__in=stale_ids).update(**{field: Coalesce(Subquery(actual), 0)})
+        return len(stale_ids)
@@ -1,10 +1,15 @@
 #seeding random fake users and objects of the system into the database
 import pytz
 import random
+import time
 
 from typing import List
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
 from django.core.management.base import BaseCommand, CommandError
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from libgravatar import md5_hash, sanitize_email
 
 from faker import Faker
 from faker.providers import internet
@@ -38,6 +43,8 @@ class Command(BaseCommand):
         parser.add_argument("--clubs", help="The amount of clubs to seed.")
         parser.add_argument("--count", help="The amount of club memberships per user to seed.")
         parser.add_argument("--tournaments", help="The amount of tournaments to seed.")
+        parser.add_argument("--bulk", action="store_true", help="Seed with bulk inserts and a single password hash, for large load-test databases.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per INSERT in bulk mode.")
 
     def to_int(self, word) -> int:
         try:
@@ -50,11 +57,14 @@ class Command(BaseCommand):
         c_count = max(1, 10 if options["clubs"] == None else self.to_int(options["clubs"]))
         a_count = max(-1, -1 if options["count"] == None else self.to_int(options["count"])) # -1 for random
         t_count = max(1, 10 if options["tournaments"] == None else self.to_int(options["tournaments"]))
-        users = self.seed_users(u_count)
-        clubs = self.seed_clubs(c_count)
-        self.seed_users_into_clubs(users, clubs, a_count)
-        self.seed_club_owners(users, clubs)
-        tournaments = self.seed_tournaments(clubs, t_count)
+        if options["bulk"]:
+            self.bulk_seed(u_count, c_count, a_count, t_count, max(1, options["batch_size"]))
+        else:
+            users = self.seed_users(u_count)
+            clubs = self.seed_clubs(c_count)
+            self.seed_users_into_clubs(users, clubs, a_count)
+            self.seed_club_owners(users, clubs)
+            tournaments = self.seed_tournaments(clubs, t_count)
 
         # Defaults
         j = self.seed_specific("Jebediah Kerman",  "jeb@example.org")
@@ -194,3 +204,101 @@ class Command(BaseCommand):
                     continue
         print(f"Seeded {len(tournaments)} tournaments.      ")
         return tournaments
+
+    #Seeding the same shape of data as above with bulk_create, hashing the password only once.
+    def bulk_seed(self, u_count, c_count, a_count, t_count, batch_size):
+        password = make_password(Command.PASSWORD)
+        # Faker is slow compared to bulk inserts, so texts are drawn from a precomputed pool
+        texts = [self.faker.text()[0:200] for i in range(min(1000, max(u_count, c_count)))]
+
+        def make_users():
+            for i in range(u_count):
+                email = f"{i}.{self.faker.email(safe=False)}"
+                yield User(
+                    name = self.faker.name(),
+                    email = email,
+                    email_hash = md5_hash(sanitize_email(email)),
+                    password = password,
+                    personal_statement = random.choice(texts),
+                    bio = random.choice(texts),
+                    chess_experience = random.choice(Command.CHESS_EXPERIENCE),
+                )
+        user_ids = self.bulk_insert(User, make_users(), u_count, batch_size, ignore_conflicts=True)
+
+        def make_clubs():
+            for i in range(c_count):
+                yield Club(
+                    name = f"{self.faker.name()}'s Chess Club #{i + 1}",
+                    location = self.faker.address()[0:180],
+                    description = random.choice(texts),
+                )
+        club_ids = self.bulk_insert(Club, make_clubs(), c_count, batch_size, ignore_conflicts=True)
+
+        owners = {}
+        def make_memberships():
+            for user_id in user_ids:
+                if a_count == -1:
+                    start = random.randint(0, len(club_ids)-1)
+                    end = random.randint(start+1, len(club_ids))
+                else:
+                    count = min(a_count, len(club_ids))
+                    start = random.randint(0, len(club_ids)-count)
+                    end = start + count
+                for club_id in club_ids[start:end]:
+                    # the first user weaved into a club becomes its owner
+                    level = random.randint(0, 3)-2
+                    if club_id not in owners:
+                        owners[club_id] = user_id
+                        level = ClubMembership.UserLevels.OWNER
+                    yield ClubMembership(foreign_user_id=user_id, foreign_club_id=club_id, membership=level)
+            for club_id in club_ids:
+                if club_id not in owners:
+                    owners[club_id] = random.choice(user_ids)
+                    yield ClubMembership(foreign_user_id=owners[club_id], foreign_club_id=club_id, membership=ClubMembership.UserLevels.OWNER)
+        self.bulk_insert(ClubMembership, make_memberships(), None, batch_size)
+
+        def make_tournaments():
+            for club_id in club_ids:
+                for i in range(t_count):
+                    yield Tournament(
+                        club_id = club_id,
+                        name = f"{self.faker.name()}'s Tournament #{i + 1}",
+                        description = random.choice(texts),
+                        signup_deadline = self.faker.date_time(tzinfo=pytz.UTC),
+                    )
+        tournament_ids = self.bulk_insert(Tournament, make_tournaments(), len(club_ids) * t_count, batch_size)
+
+        def make_organizers():
+            for tournament_id, club_id in Tournament.objects.filter(id__in=tournament_ids).values_list("id", "club_id").iterator():
+                yield TournamentOrganizer(
+                    tournament_id = tournament_id,
+                    organizer_id = owners[club_id],
+                    organizing_role = TournamentOrganizer.OrganizingRoles.ORGANIZER
+                )
+        self.bulk_insert(TournamentOrganizer, make_organizers(), len(tournament_ids), batch_size)
+
+        # bulk_create bypasses the signals maintaining the denormalized counters
+        call_command("recount", stdout=self.stdout)
+
+    #Inserts the generated objects in batches inside one transaction and returns the new ids in insertion order.
+    def bulk_insert(self, model, objects, total, batch_size, ignore_conflicts=False) -> List[int]:
+        name = model._meta.verbose_name_plural
+        started = time.perf_counter()
+        last_id = model.objects.order_by("-id").values_list("id", flat=True).first() or 0
+        count = 0
+        with transaction.atomic():
+            batch = []
+            for obj in objects:
+                batch.append(obj)
+                if len(batch) == batch_size:
+                    model.objects.bulk_create(batch, ignore_conflicts=ignore_conflicts)
+                    count += len(batch)
+                    batch = []
+                    print(f"Seeding {name}: {count}/{total if total is not None else '?'}", end='\r')
+            model.objects.bulk_create(batch, ignore_conflicts=ignore_conflicts)
+            count += len(batch)
+        # bulk_create does not return primary keys on every backend, so read back the new range
+        ids = list(model.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True))
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        print(f"Seeded {len(ids)} {name} in {elapsed:.1f}s ({len(ids) / elapsed:.0f} rows/s).      ")
+        return ids
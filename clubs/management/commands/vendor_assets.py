@@ -0,0 +1,45 @@
+#downloading the front-end libraries listed in clubs.assets.VENDOR_ASSETS into static/vendor
+import os
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from clubs.assets import VENDOR_ASSETS, check_integrity, integrity_of, is_vendored, static_dir
+
+
+class Command(BaseCommand):
+    help = "Downloads the pinned CDN libraries into static/vendor, checking each against its integrity hash, so that the pages no longer load anything from third parties. Run it once on a machine with network access and commit the files."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Download libraries that are already vendored again.")
+        parser.add_argument("--check", action="store_true", help="Only verify that every library is vendored and matches its hash, and fail if not.")
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            self.verify()
+            return
+        for name, asset in VENDOR_ASSETS.items():
+            if is_vendored(asset) and not options["force"]:
+                continue
+            with urlopen(asset.url, timeout=30) as response:
+                content = response.read()
+            if not check_integrity(asset, content):
+                raise CommandError(f"{asset.url} does not match {asset.integrity}; nothing was written for {name}.")
+            path = os.path.join(static_dir(), asset.path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as file:
+                file.write(content)
+            self.stdout.write(f"Vendored {name} as {asset.path} ({integrity_of(content)}).")
+
+    def verify(self):
+        problems = []
+        for name, asset in VENDOR_ASSETS.items():
+            if not is_vendored(asset):
+                problems.append(f"{name} is not vendored")
+                continue
+            with open(os.path.join(static_dir(), asset.path), "rb") as file:
+                if not check_integrity(asset, file.read()):
+                    problems.append(f"{asset.path} does not match {asset.integrity}")
+        if problems:
+            raise CommandError("; ".join(problems) + ". Run manage.py vendor_assets --force.")
+        self.stdout.write("All libraries are vendored.")
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.5 on 2026-10-18 17:54
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Club = apps.get_model('clubs', 'Club')
+    ClubMembership = apps.get_model('clubs', 'ClubMembership')
+    Tournament = apps.get_model('clubs', 'Tournament')
+    TournamentParticipant = apps.get_model('clubs', 'TournamentParticipant')
+
+    members = ClubMembership.objects.filter(foreign_club=OuterRef('pk')).order_by().values('foreign_club').annotate(count=Count('id')).values('count')
+    Club.objects.update(member_count=Coalesce(Subquery(members), 0))
+    participants = TournamentParticipant.objects.filter(tournament=OuterRef('pk')).order_by().values('tournament').annotate(count=Count('id')).values('count')
+    Tournament.objects.update(participant_count=Coalesce(Subquery(participants), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='club',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='participant_count',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
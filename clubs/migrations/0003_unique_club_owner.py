@@ -0,0 +1,29 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:03
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+OWNER = 2
+OFFICER = 1
+
+
+def demote_extra_owners(apps, schema_editor):
+    # the old check-then-save probe could race into several owners; keep the earliest membership
+    ClubMembership = apps.get_model('clubs', 'ClubMembership')
+    earlier_owner = ClubMembership.objects.filter(foreign_club=OuterRef('foreign_club'), membership=OWNER, id__lt=OuterRef('id'))
+    ClubMembership.objects.filter(Exists(earlier_owner), membership=OWNER).update(membership=OFFICER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0002_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(demote_extra_owners, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='clubmembership',
+            constraint=models.UniqueConstraint(condition=models.Q(('membership', 2)), fields=('foreign_club',), name='unique_owner'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0003_unique_club_owner'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clubmembership',
+            index=models.Index(fields=['foreign_club', '-membership', 'id'], name='membership_roster_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clubmembership',
+            index=models.Index(fields=['foreign_user', 'membership'], name='membership_user_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tournament',
+            index=models.Index(fields=['club', 'signup_deadline'], name='tournament_club_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tournamentorganizer',
+            index=models.Index(fields=['tournament', 'organizing_role'], name='organizer_role_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:09
+
+from django.db import migrations, models
+from libgravatar import md5_hash, sanitize_email
+
+
+def populate_email_hashes(apps, schema_editor):
+    User = apps.get_model('clubs', 'User')
+    batch = []
+    for user in User.objects.only('id', 'email').iterator(chunk_size=1000):
+        user.email_hash = md5_hash(sanitize_email(user.email))
+        batch.append(user)
+        if len(batch) == 1000:
+            User.objects.bulk_update(batch, ['email_hash'])
+            batch = []
+    User.objects.bulk_update(batch, ['email_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0004_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_hash',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.RunPython(populate_email_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.5 on 2026-10-18 18:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0006_club_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClubChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.IntegerField(choices=[(0, 'Member'), (1, 'Tournament')])),
+                ('subject_id', models.BigIntegerField()),
+                ('club', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, to='clubs.club')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='clubchange',
+            index=models.Index(fields=['club', 'id'], name='club_change_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clubchange',
+            index=models.Index(fields=['club', 'kind', 'subject_id', 'id'], name='club_change_subject_idx'),
+        ),
+    ]
@@ -1,14 +1,24 @@
 from django.core.exceptions import ValidationError
 
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
-from django.db import models
+from django.db import models, transaction
 
 from django.contrib.auth.models import BaseUserManager
 
 from django.contrib.auth.models import AbstractBaseUser
 from django.contrib.auth.models import PermissionsMixin #define users with privilleges
 
-from libgravatar import Gravatar
+from functools import lru_cache
+from libgravatar import Gravatar, md5_hash, sanitize_email
+
+
+@lru_cache(maxsize = 32)
+def gravatar_query(size):
+    '''Return the query string of a gravatar URL for the given size.
+    libgravatar validates and encodes the parameters once per size; only the hash varies per user.
+    '''
+    url = Gravatar('').get_image(size = size, default = 'mp')
+    return url[url.find('?'):] if '?' in url else ''
 
 
 # A User Manager class required for stable functionality of custom User class
@@ -79,6 +89,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_admin = models.BooleanField(default = False)
     date_joined = models.DateTimeField(auto_now = False, auto_now_add = True, blank = False, editable = False)
+    # md5 of the sanitized email as used by gravatar, refreshed on every save
+    email_hash = models.CharField(max_length = 32, blank = True, editable = False)
 
     # Extra configs for a custom User model inheriting from AbstractBaseUser
     objects = UserManager()
@@ -91,26 +103,51 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.email
 
+    def save(self, *args, **kwargs):
+        self.email_hash = md5_hash(sanitize_email(self.email))
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'email' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'email_hash'}
+        super().save(*args, **kwargs)
+
     def gravatar(self, size=120):
         """Return a URL to the user's gravatar."""
-        gravatar_object = Gravatar(self.email)
-        gravatar_url = gravatar_object.get_image(size=size, default='mp')
-        return gravatar_url
+        email_hash = self.email_hash or md5_hash(sanitize_email(self.email))
+        return f'https://www.gravatar.com/avatar/{email_hash}{gravatar_query(size)}'
 
 #Club-related models
 class Club(models.Model):
     name = models.CharField(unique = True, max_length = 100, blank = False)
     location = models.CharField(unique = False, max_length = 180, blank = False)
     description = models.CharField(max_length = 200, blank = False)
+    # Denormalized number of ClubMembership rows, maintained by clubs.signals
+    member_count = models.PositiveIntegerField(default = 0, editable = False)
+    # Bumped by clubs.signals whenever anything shown by the club's JSON APIs changes; used for ETags and cache keys
+    version = models.PositiveBigIntegerField(default = 0, editable = False)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # never write back a stale member_count or version; clubs.signals maintains them with UPDATEs
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name not in ('member_count', 'version')]
+        super().save(*args, **kwargs)
+
 
 class ClubMembership(models.Model):
     class Meta:
         constraints = [
-            models.UniqueConstraint(fields = ['foreign_user', 'foreign_club'], name = 'unique_member')
+            models.UniqueConstraint(fields = ['foreign_user', 'foreign_club'], name = 'unique_member'),
+            # partial unique index: at most one OWNER (membership = 2) per club
+            models.UniqueConstraint(fields = ['foreign_club'], condition = models.Q(membership = 2), name = 'unique_owner'),
+        ]
+        indexes = [
+            # club rosters by level, in the (membership desc, id) keyset order used by the members API
+            models.Index(fields = ['foreign_club', '-membership', 'id'], name = 'membership_roster_idx'),
+            # a user's memberships by level (home page, applications)
+            models.Index(fields = ['foreign_user', 'membership'], name = 'membership_user_level_idx'),
         ]
 
     class UserLevels(models.IntegerChoices):
@@ -124,13 +161,19 @@ class ClubMembership(models.Model):
     foreign_club = models.ForeignKey(Club, blank = False, null = False, on_delete = models.CASCADE)
     membership = models.IntegerField(choices = UserLevels.choices, blank = False, default = UserLevels.PENDING)
 
+    def save(self, *args, **kwargs):
+        # keep the row and the club's member_count update in one transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def full_clean(self):
         super().full_clean()
+        # the unique_owner constraint enforces this in the database; this probe only gives a friendlier error
         if self.membership == ClubMembership.UserLevels.OWNER:
-            if len(ClubMembership.objects.filter(
+            if ClubMembership.objects.filter(
                 foreign_club = self.foreign_club,
                 membership = ClubMembership.UserLevels.OWNER
-            ).exclude(foreign_user = self.foreign_user)) > 0:
+            ).exclude(foreign_user = self.foreign_user).exists():
                 raise ValidationError(message = 'A club can only have 1 owner')
 
 
@@ -145,22 +188,49 @@ class Tournament(models.Model):
         constraints = [
             models.UniqueConstraint(fields = ['club', 'name'], name = 'unique_tournament_in_club'),
         ]
+        indexes = [
+            models.Index(fields = ['club', 'signup_deadline'], name = 'tournament_club_deadline_idx'),
+        ]
 
     club = models.ForeignKey(Club, blank = False, null = False, on_delete = models.CASCADE)
     name = models.CharField(unique = False, max_length = 100, blank = False)
     description = models.CharField(unique = False, max_length = 520, blank = False)
     signup_deadline = models.DateTimeField(blank = False)
     capacity = models.PositiveSmallIntegerField(blank = False, default = 2, validators = [MinValueValidator(2), MaxValueValidator(96)])
+    # Denormalized number of TournamentParticipant rows, maintained by clubs.signals
+    participant_count = models.PositiveSmallIntegerField(default = 0, editable = False)
 
     def __str__(self):
         return f'"{self.name}" tournament at "{str(self.club)}"'
 
+    def save(self, *args, **kwargs):
+        # never write back a stale participant_count; TournamentParticipant.save and clubs.signals maintain it with UPDATEs
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name != 'participant_count']
+        super().save(*args, **kwargs)
+
+    def eligible_coorganizers(self):
+        """Return the officers and owner of the club who neither organize nor play in this tournament."""
+        return User.objects.filter(
+            models.Exists(ClubMembership.objects.filter(
+                foreign_club_id = self.club_id,
+                foreign_user = models.OuterRef('pk'),
+                membership__gte = ClubMembership.UserLevels.OFFICER
+            )),
+            ~models.Exists(TournamentParticipant.objects.filter(tournament = self, participant = models.OuterRef('pk'))),
+            ~models.Exists(TournamentOrganizer.objects.filter(tournament = self, organizer = models.OuterRef('pk')))
+        ).order_by('id')
+
 
 class TournamentOrganizer(models.Model):
     class Meta:
         constraints = [
             models.UniqueConstraint(fields = ['tournament', 'organizer'], name = 'unique_organizer'),
         ]
+        indexes = [
+            models.Index(fields = ['tournament', 'organizing_role'], name = 'organizer_role_idx'),
+        ]
 
     class OrganizingRoles(models.IntegerChoices):
         COORGANIZER = 0
@@ -180,3 +250,39 @@ class TournamentParticipant(models.Model):
 
     tournament = models.ForeignKey(Tournament, blank = False, null = False, on_delete = models.CASCADE)
     participant = models.ForeignKey(User, blank = False, null = False, on_delete = models.CASCADE)
+
+    def save(self, *args, **kwargs):
+        # A new participant claims a place before the row is inserted. The capacity check is part of
+        # the UPDATE itself, so concurrent signups serialize on the tournament row, and one that would
+        # overfill it fails without inserting anything.
+        with transaction.atomic():
+            if self._state.adding:
+                claimed = Tournament.objects.filter(
+                    pk = self.tournament_id,
+                    participant_count__lt = models.F('capacity')
+                ).update(participant_count = models.F('participant_count') + 1)
+                if not claimed:
+                    raise ValidationError(message = 'The tournament is already at capacity')
+            super().save(*args, **kwargs)
+
+
+# Append-only log of what changed in a club, read by the delta sync API.
+# Only the newest entry per subject matters to readers, so `manage.py compact_changes` drops older ones.
+class ClubChange(models.Model):
+    class Meta:
+        indexes = [
+            # the delta API reads a club's changes after a given id
+            models.Index(fields = ['club', 'id'], name = 'club_change_idx'),
+            # compaction keeps only the newest entry per subject
+            models.Index(fields = ['club', 'kind', 'subject_id', 'id'], name = 'club_change_subject_idx'),
+        ]
+
+    class Kinds(models.IntegerChoices):
+        MEMBER = 0
+        TOURNAMENT = 1
+
+    # no database constraint, so that entries logged while a club is being deleted do not block it
+    club = models.ForeignKey(Club, blank = False, null = False, on_delete = models.DO_NOTHING, db_constraint = False)
+    kind = models.IntegerField(choices = Kinds.choices, blank = False)
+    # the changed user (MEMBER) or tournament (TOURNAMENT); the current state is read when the change is served
+    subject_id = models.BigIntegerField(blank = False)
@@ -0,0 +1,100 @@
+"""Signal receivers keeping the denormalized counters, version stamps, change log and cache of clubs in sync."""
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_club
+from .events import publish
+from .models import User, Club, ClubChange, ClubMembership, Tournament, TournamentOrganizer, TournamentParticipant
+
+
+# Every entry is inserted in the same transaction as an UPDATE of its club's row, after it. The row
+# lock then serializes the writers of a club, so its entries are numbered in the order they commit.
+# Without it, on Postgres a later id could commit first: a client given changes_since = 11 would
+# never see entry 10 committing after it, as /club/changes only returns ids above the client's.
+def log_change(club_id, kind, subject_id):
+    ClubChange.objects.create(club_id = club_id, kind = kind, subject_id = subject_id)
+    notify(club_id)
+
+
+def notify(club_id):
+    invalidate_club(club_id)
+    # open event streams are told once the change is visible to the /club/changes request they will make
+    transaction.on_commit(lambda: publish(club_id, {'club': club_id}))
+
+
+# ClubMembership.save wraps these receivers in the same transaction as the insert;
+# deletions (including cascades) are already atomic, so the counters never drift
+# from the rows they count.
+@receiver(post_save, sender = ClubMembership)
+def membership_saved(sender, instance, created, **kwargs):
+    # rank changes alter the roster too, so every save bumps the version
+    changes = {'version': F('version') + 1}
+    if created:
+        changes['member_count'] = F('member_count') + 1
+    Club.objects.filter(pk = instance.foreign_club_id).update(**changes)
+    log_change(instance.foreign_club_id, ClubChange.Kinds.MEMBER, instance.foreign_user_id)
+
+
+@receiver(post_delete, sender = ClubMembership)
+def membership_deleted(sender, instance, **kwargs):
+    Club.objects.filter(pk = instance.foreign_club_id).update(
+        member_count = Greatest(F('member_count') - 1, 0),
+        version = F('version') + 1
+    )
+    log_change(instance.foreign_club_id, ClubChange.Kinds.MEMBER, instance.foreign_user_id)
+
+
+# TournamentParticipant.save claims a place when a participant is added; a removal frees it here,
+# including when the participant or the tournament's club is deleted.
+@receiver(post_delete, sender = TournamentParticipant)
+def decrement_participant_count(sender, instance, **kwargs):
+    Tournament.objects.filter(pk = instance.tournament_id, participant_count__gt = 0).update(participant_count = F('participant_count') - 1)
+
+
+def record_change(club_ids, kind, subject_id):
+    # post_save and post_delete run outside any transaction of their own; see log_change
+    with transaction.atomic():
+        Club.objects.filter(pk__in = club_ids).update(version = F('version') + 1)
+        ClubChange.objects.bulk_create([ClubChange(club_id = club_id, kind = kind, subject_id = subject_id) for club_id in club_ids])
+        for club_id in club_ids:
+            notify(club_id)
+
+
+# Everything else the club JSON APIs return: tournaments, their organizers and participants,
+# and the profile fields of the club's members.
+@receiver(post_save, sender = Tournament)
+@receiver(post_delete, sender = Tournament)
+def tournament_changed(sender, instance, **kwargs):
+    record_change([instance.club_id], ClubChange.Kinds.TOURNAMENT, instance.pk)
+
+
+@receiver(post_save, sender = TournamentOrganizer)
+@receiver(post_delete, sender = TournamentOrganizer)
+@receiver(post_save, sender = TournamentParticipant)
+@receiver(post_delete, sender = TournamentParticipant)
+def tournament_member_changed(sender, instance, **kwargs):
+    if sender.tournament.is_cached(instance):
+        club_ids = [instance.tournament.club_id]
+    else:
+        club_ids = list(Tournament.objects.filter(pk = instance.tournament_id).values_list('club_id', flat = True))
+    record_change(club_ids, ClubChange.Kinds.TOURNAMENT, instance.tournament_id)
+
+
+@receiver(post_save, sender = Club)
+@receiver(post_delete, sender = Club)
+def club_changed(sender, instance, **kwargs):
+    # name, location and description are part of the cached rosters, profiles and template fragments
+    Club.objects.filter(pk = instance.pk).update(version = F('version') + 1)
+    invalidate_club(instance.pk)
+
+
+@receiver(post_save, sender = User)
+def user_changed(sender, instance, created, update_fields, **kwargs):
+    # logging in only saves last_login, which none of the APIs show
+    if created or (update_fields is not None and update_fields <= {'last_login', 'password'}):
+        return
+    club_ids = list(ClubMembership.objects.filter(foreign_user = instance).values_list('foreign_club_id', flat = True))
+    record_change(club_ids, ClubChange.Kinds.MEMBER, instance.pk)
@@ -0,0 +1,26 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from clubs.assets import VENDOR_ASSETS, is_vendored
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_asset(name):
+    """Render the <link> or <script> tag of a vendored library, or of its CDN copy when it is not vendored yet."""
+    asset = VENDOR_ASSETS[name]
+    if is_vendored(asset):
+        url, crossorigin = static(asset.path), None
+    else:
+        url, crossorigin = asset.url, 'anonymous'
+    attributes = mark_safe('')
+    if asset.integrity:
+        attributes += format_html(' integrity="{}"', asset.integrity)
+    if crossorigin:
+        attributes += format_html(' crossorigin="{}"', crossorigin)
+    if name.endswith('.css'):
+        return format_html('<link href="{}" rel="stylesheet"{}>', url, attributes)
+    return format_html('<script src="{}"{}></script>', url, attributes)
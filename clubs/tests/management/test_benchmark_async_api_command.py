@@ -0,0 +1,12 @@
+from django.test import TestCase
+from django.urls import reverse
+from clubs.management.commands.benchmark_async_api import Command
+
+class BenchmarkAsyncAPICommandTestCase(TestCase):
+
+    def test_routes_exist(self):
+        for name in Command.ROUTES:
+            reverse(name)
+
+    def test_shares_requests_between_clients(self):
+        self.assertEqual(Command().share(10, 4), [3, 3, 2, 2])
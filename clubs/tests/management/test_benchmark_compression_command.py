@@ -0,0 +1,31 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import urlencode
+from clubs.cache import club_cache
+from clubs.management.commands.benchmark_compression import Command
+from clubs.models import User, Club, ClubMembership
+
+class BenchmarkCompressionCommandTestCase(TestCase):
+
+    def setUp(self):
+        club_cache().clear()
+        club = Club.objects.create(name="test", location="london", description="test")
+        for i in range(20):
+            user = User.objects.create_user(name=str(i), email=str(i)+"@test.org", personal_statement="Testing", password="Password123", bio="Testing " * 20)
+            level = ClubMembership.UserLevels.OWNER if i == 0 else ClubMembership.UserLevels.MEMBER
+            ClubMembership.objects.create(foreign_user=user, foreign_club=club, membership=level)
+        self.client.login(email="0@test.org", password="Password123")
+
+    def test_routes_exist(self):
+        for name in Command.ROUTES:
+            reverse(name)
+
+    def test_measures_each_encoding(self):
+        url = reverse("club") + "?" + urlencode({"name": "test"})
+        sizes = {}
+        for encoding in Command.ENCODINGS:
+            for cached in (False, True):
+                sizes[encoding], cpu = Command().measure(self.client, url, encoding, 2, cached)
+                self.assertGreater(cpu, 0)
+        self.assertLess(sizes["br"], sizes["identity"])
+        self.assertLess(sizes["gzip"], sizes["identity"])
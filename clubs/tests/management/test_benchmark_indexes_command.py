@@ -0,0 +1,33 @@
+import pytz
+from datetime import datetime
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from clubs.models import User, Club, ClubMembership, Tournament
+
+class BenchmarkIndexesCommandTestCase(TestCase):
+
+    def test_requires_seeded_database(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_indexes', stdout=StringIO())
+
+    def test_reports_plans_and_keeps_indexes(self):
+        user = User.objects.create_user(
+            email = 'sensei@cobrakai.dojo',
+            name = 'Jonny Lawrence',
+            personal_statement = 'I\'m gonna kick some ass',
+            chess_experience = 'B',
+            password = 'NoM1yag1Do!',
+        )
+        club = Club.objects.create(name="test",location="london", description="test")
+        ClubMembership.objects.create(foreign_user=user, foreign_club=club, membership=ClubMembership.UserLevels.OWNER)
+        Tournament.objects.create(club=club, name='Johnnys Tournament', signup_deadline=datetime.now(tz=pytz.UTC), description='test')
+        out = StringIO()
+        call_command('benchmark_indexes', '--repeat', '1', stdout=out)
+        self.assertIn('club roster page', out.getvalue())
+        self.assertIn('before:', out.getvalue())
+        with connection.cursor() as cursor:
+            indexes = connection.introspection.get_constraints(cursor, ClubMembership._meta.db_table)
+        self.assertIn('membership_roster_idx', indexes)
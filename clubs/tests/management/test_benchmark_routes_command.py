@@ -0,0 +1,31 @@
+import json
+from django.test import TestCase
+from clubs.management.commands.benchmark_routes import Command, check_routes, compare
+
+class BenchmarkRoutesCommandTestCase(TestCase):
+
+    def test_every_route_has_an_entry(self):
+        check_routes()
+
+    def test_checked_in_baseline_covers_every_route(self):
+        with open(Command.DEFAULT_BASELINE) as f:
+            baseline = json.load(f)
+        for routes in baseline.values():
+            self.assertEqual(set(routes), set(Command.ROUTES))
+
+    def test_measures_every_route(self):
+        results = Command().run_scale(50, 1)
+        self.assertEqual(set(results), set(Command.ROUTES))
+        self.assertGreater(results["club"]["queries"], 0)
+        self.assertGreater(results["club"]["bytes"], 0)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"1000": {"club": {"queries": 5, "p50_ms": 5.0, "p95_ms": 6.0, "bytes": 1000}}}
+        same = {"1000": {"club": {"queries": 5, "p50_ms": 5.5, "p95_ms": 6.5, "bytes": 1000}}}
+        self.assertEqual(compare(same, baseline, 0.5), [])
+        worse = {"1000": {"club": {"queries": 6, "p50_ms": 20.0, "p95_ms": 30.0, "bytes": 3000}}}
+        self.assertEqual(len(compare(worse, baseline, 0.5)), 3)
+
+    def test_compare_ignores_routes_without_baseline(self):
+        results = {"1000": {"new_route": {"queries": 50, "p50_ms": 5.0, "p95_ms": 6.0, "bytes": 1000}}}
+        self.assertEqual(compare(results, {}, 0.5), [])
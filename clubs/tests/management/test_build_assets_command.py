@@ -0,0 +1,29 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+
+class BuildAssetsCommandTestCase(SimpleTestCase):
+
+    def test_committed_bundles_are_up_to_date(self):
+        out = StringIO()
+        call_command("build_assets", "--check", stdout=out)
+        self.assertIn("All bundles are up to date.", out.getvalue())
+
+    def test_check_fails_after_a_page_script_changes(self):
+        static = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static)
+        shutil.copytree(os.path.join(settings.BASE_DIR, "static", "js"), os.path.join(static, "js"))
+        with open(os.path.join(static, "js", "src", "clubs.js"), "a") as file:
+            file.write("submitApplication(null);\n")
+        with override_settings(STATICFILES_DIRS=[static]):
+            with self.assertRaisesMessage(CommandError, "js/clubs.js"):
+                call_command("build_assets", "--check", stdout=StringIO())
+            call_command("build_assets", stdout=StringIO())
+            call_command("build_assets", "--check", stdout=StringIO())
+        with open(os.path.join(static, "js", "clubs.js")) as file:
+            self.assertTrue(file.read().endswith("submitApplication(null);\n"))
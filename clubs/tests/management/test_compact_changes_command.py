@@ -0,0 +1,52 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from clubs.models import User, Club, ClubChange, ClubMembership
+
+class CompactChangesCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.club = Club.objects.create(name="test",location="london", description="test")
+        self.users = []
+        for i in range(2):
+            self.users.append(User.objects.create_user(
+                name=str(i),
+                email=str(i)+"@test.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="Testing"
+            ))
+            ClubMembership.objects.create(foreign_user=self.users[i], foreign_club=self.club)
+        membership = ClubMembership.objects.get(foreign_user=self.users[0])
+        membership.membership = ClubMembership.UserLevels.MEMBER
+        membership.save()
+
+    def test_keeps_newest_entry_per_subject(self):
+        newest = ClubChange.objects.filter(club=self.club, subject_id=self.users[0].id).latest("id")
+        out = StringIO()
+        call_command("compact_changes", stdout=out)
+        self.assertIn("Deleted 1 superseded", out.getvalue())
+        self.assertEqual(
+            sorted(ClubChange.objects.values_list("subject_id", flat=True)),
+            sorted(user.id for user in self.users)
+        )
+        self.assertTrue(ClubChange.objects.filter(pk=newest.pk).exists())
+
+    def test_dry_run(self):
+        out = StringIO()
+        call_command("compact_changes", "--dry-run", stdout=out)
+        self.assertIn("Found 1 superseded", out.getvalue())
+        self.assertIn("Found 0 change log entries of deleted clubs", out.getvalue())
+        self.assertEqual(ClubChange.objects.count(), 3)
+
+    def test_deletes_entries_of_deleted_clubs(self):
+        other = Club.objects.create(name="other",location="london", description="other")
+        ClubMembership.objects.create(foreign_user=self.users[0], foreign_club=other)
+        other_id = other.pk
+        other.delete()
+        self.assertTrue(ClubChange.objects.filter(club_id=other_id).exists())
+        out = StringIO()
+        call_command("compact_changes", stdout=out)
+        self.assertFalse(ClubChange.objects.filter(club_id=other_id).exists())
+        self.assertEqual(ClubChange.objects.filter(club=self.club).count(), 2)
+        self.assertIn("of deleted clubs", out.getvalue())
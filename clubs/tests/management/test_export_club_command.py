@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import pytz
+from datetime import datetime, timedelta
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from clubs.models import User, Club, ClubMembership, Tournament, TournamentParticipant
+
+class ExportClubCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.club = Club.objects.create(name="test", location="london", description="test")
+        for i in range(3):
+            user = User.objects.create_user(
+                name=str(i),
+                email=str(i)+"@test.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="Testing"
+            )
+            ClubMembership.objects.create(foreign_user=user, foreign_club=self.club, membership=ClubMembership.UserLevels.MEMBER)
+        self.tournament = Tournament.objects.create(
+            club=self.club,
+            name="first",
+            description="testing",
+            signup_deadline=datetime.now(tz=pytz.UTC) + timedelta(days=1))
+        TournamentParticipant.objects.create(tournament=self.tournament, participant=user)
+
+    def test_members_to_stdout(self):
+        out = io.StringIO()
+        call_command("export_club", "test", stdout=out)
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][2], "0@test.org")
+
+    def test_participants_to_file(self):
+        path = os.path.join(tempfile.mkdtemp(), "participants.jsonl")
+        err = io.StringIO()
+        call_command("export_club", "test", "--tournament", "first", "--format", "jsonl", "--output", path, stderr=err)
+        with open(path) as file:
+            lines = file.read().splitlines()
+        os.remove(path)
+        self.assertEqual([json.loads(line)["email"] for line in lines], ["2@test.org"])
+        self.assertIn("Wrote", err.getvalue())
+
+    def test_unknown_club_or_tournament(self):
+        with self.assertRaises(CommandError):
+            call_command("export_club", "missing", stdout=io.StringIO())
+        with self.assertRaises(CommandError):
+            call_command("export_club", "test", "--tournament", "missing", stdout=io.StringIO())
@@ -0,0 +1,52 @@
+import pytz
+from datetime import datetime
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from clubs.models import User, Club, ClubMembership, Tournament, TournamentParticipant
+
+class RecountCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email = 'sensei@cobrakai.dojo',
+            name = 'Jonny Lawrence',
+            personal_statement = 'I\'m gonna kick some ass',
+            chess_experience = 'B',
+            password = 'NoM1yag1Do!',
+            bio = 'STRIKE FIRST - STRIKE HARD - NO MERCY',
+        )
+        self.club = Club.objects.create(name="test",location="london", description="test")
+        ClubMembership.objects.create(foreign_user=self.user, foreign_club=self.club, membership=ClubMembership.UserLevels.OWNER)
+        self.tournament = Tournament.objects.create(
+            club = self.club,
+            name = 'Johnnys Tournament',
+            signup_deadline = datetime.now(tz=pytz.UTC),
+            description = 'This is a test tournament',
+        )
+        TournamentParticipant.objects.create(tournament=self.tournament, participant=self.user)
+        Club.objects.update(member_count=7)
+        Tournament.objects.update(participant_count=0)
+
+    def _call(self, *args):
+        out = StringIO()
+        call_command('recount', *args, stdout=out)
+        return out.getvalue()
+
+    def test_recount_repairs_counters(self):
+        output = self._call()
+        self.assertIn('Repaired 1 club and 1 tournament counters.', output)
+        self.club.refresh_from_db()
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.club.member_count, 1)
+        self.assertEqual(self.tournament.participant_count, 1)
+
+    def test_recount_dry_run_leaves_counters(self):
+        output = self._call('--dry-run')
+        self.assertIn('Found 1 club and 1 tournament counters.', output)
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.member_count, 7)
+
+    def test_recount_of_correct_counters_is_noop(self):
+        self._call()
+        self.assertIn('Repaired 0 club and 0 tournament counters.', self._call())
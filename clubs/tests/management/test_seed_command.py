@@ -0,0 +1,35 @@
+import contextlib
+from io import StringIO
+from django.contrib.auth import authenticate
+from django.core.management import call_command
+from django.test import TestCase
+from clubs.models import User, Club, ClubMembership, Tournament, TournamentOrganizer
+
+class BulkSeedCommandTestCase(TestCase):
+
+    def setUp(self):
+        out = StringIO()
+        with contextlib.redirect_stdout(out):
+            call_command('seed', '--bulk', '--users', '30', '--clubs', '4', '--tournaments', '2', '--batch-size', '7', stdout=out)
+        self.output = out.getvalue()
+
+    def test_seeds_requested_rows(self):
+        # 3 extra users and clubs come from the default Kerbal accounts
+        self.assertEqual(User.objects.count(), 33)
+        self.assertEqual(Club.objects.count(), 8)
+        self.assertEqual(Tournament.objects.count(), 8)
+        self.assertEqual(TournamentOrganizer.objects.count(), 8)
+        self.assertIn('rows/s', self.output)
+
+    def test_every_club_has_one_owner(self):
+        for club in Club.objects.all():
+            self.assertEqual(ClubMembership.objects.filter(foreign_club=club, membership=ClubMembership.UserLevels.OWNER).count(), 1)
+
+    def test_counters_are_consistent(self):
+        for club in Club.objects.all():
+            self.assertEqual(club.member_count, ClubMembership.objects.filter(foreign_club=club).count())
+
+    def test_seeded_users_can_log_in(self):
+        user = User.objects.order_by('id').first()
+        self.assertEqual(authenticate(email=user.email, password='Password123'), user)
+        self.assertTrue(user.email_hash)
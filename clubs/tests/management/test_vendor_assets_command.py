@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+from clubs.assets import VendorAsset, integrity_of
+
+CONTENT = b"/* a library */"
+
+class VendorAssetsCommandTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.static = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static)
+        settings_override = override_settings(STATICFILES_DIRS=[self.static])
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _vendor(self, assets, *args):
+        out = StringIO()
+        with mock.patch("clubs.management.commands.vendor_assets.VENDOR_ASSETS", assets), \
+             mock.patch("clubs.management.commands.vendor_assets.urlopen", side_effect=lambda url, timeout: BytesIO(CONTENT)) as urlopen:
+            call_command("vendor_assets", *args, stdout=out)
+        return urlopen, out.getvalue()
+
+    def test_downloads_and_checks_assets(self):
+        assets = {
+            "library.js": VendorAsset("vendor/library/library.min.js", "https://cdn.example.org/library.min.js", integrity_of(CONTENT)),
+            "library.css": VendorAsset("vendor/library/library.css", "https://cdn.example.org/library.css"),
+        }
+        urlopen, out = self._vendor(assets)
+        self.assertEqual(urlopen.call_count, 2)
+        self.assertIn("Vendored library.js", out)
+        with open(os.path.join(self.static, "vendor", "library", "library.min.js"), "rb") as file:
+            self.assertEqual(file.read(), CONTENT)
+        # vendored files are only downloaded again with --force
+        urlopen, out = self._vendor(assets)
+        self.assertEqual(urlopen.call_count, 0)
+        urlopen, out = self._vendor(assets, "--force")
+        self.assertEqual(urlopen.call_count, 2)
+
+    def test_rejects_content_that_does_not_match_its_hash(self):
+        assets = {
+            "library.js": VendorAsset("vendor/library/library.min.js", "https://cdn.example.org/library.min.js", integrity_of(b"something else")),
+        }
+        with self.assertRaisesMessage(CommandError, "does not match"):
+            self._vendor(assets)
+        self.assertFalse(os.path.exists(os.path.join(self.static, "vendor", "library", "library.min.js")))
+
+    def test_check_verifies_vendored_copies(self):
+        assets = {
+            "library.js": VendorAsset("vendor/library/library.min.js", "https://cdn.example.org/library.min.js", integrity_of(CONTENT)),
+        }
+        with mock.patch("clubs.management.commands.vendor_assets.VENDOR_ASSETS", assets):
+            with self.assertRaisesMessage(CommandError, "library.js is not vendored"):
+                call_command("vendor_assets", "--check", stdout=StringIO())
+            self._vendor(assets)
+            out = StringIO()
+            call_command("vendor_assets", "--check", stdout=out)
+            self.assertIn("All libraries are vendored.", out.getvalue())
+            with open(os.path.join(self.static, "vendor", "library", "library.min.js"), "ab") as file:
+                file.write(b"changed")
+            with self.assertRaisesMessage(CommandError, "does not match"):
+                call_command("vendor_assets", "--check", stdout=StringIO())
+
+
+class VendoredLibrariesTestCase(SimpleTestCase):
+
+    def test_committed_libraries_match_their_hashes(self):
+        out = StringIO()
+        call_command("vendor_assets", "--check", stdout=out)
+        self.assertIn("All libraries are vendored.", out.getvalue())
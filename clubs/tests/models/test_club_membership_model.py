@@ -1,4 +1,5 @@
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError
 from django.test import TestCase
 from clubs.models import User, Club, ClubMembership
 
@@ -134,3 +135,42 @@ class ClubMembershipModelTestCase(TestCase):
         self._create_extra_membership(1, 0, ClubMembership.UserLevels.OFFICER)
         self.club_memberships[1].membership = ClubMembership.UserLevels.OWNER
         self._assert_membership_is_invalid(1)
+
+
+    def test_member_count_is_incremented_on_create(self):
+        self._create_second_user()
+        self._create_extra_membership(1, 0, ClubMembership.UserLevels.PENDING)
+        self.clubs[0].refresh_from_db()
+        self.assertEqual(self.clubs[0].member_count, 2)
+
+    def test_member_count_is_unchanged_on_update(self):
+        self.club_memberships[0].membership = ClubMembership.UserLevels.MEMBER
+        self.club_memberships[0].save()
+        self.clubs[0].refresh_from_db()
+        self.assertEqual(self.clubs[0].member_count, 1)
+
+    def test_member_count_is_decremented_on_delete(self):
+        self.club_memberships[0].delete()
+        self.clubs[0].refresh_from_db()
+        self.assertEqual(self.clubs[0].member_count, 0)
+
+    def test_member_count_is_decremented_when_foreign_user_is_deleted(self):
+        self._create_second_user()
+        self._create_extra_membership(1, 0, ClubMembership.UserLevels.MEMBER)
+        self.users[1].delete()
+        self.clubs[0].refresh_from_db()
+        self.assertEqual(self.clubs[0].member_count, 1)
+
+    def test_database_rejects_second_owner(self):
+        self._create_second_user()
+        with self.assertRaises(IntegrityError):
+            ClubMembership.objects.create(
+                foreign_user = self.users[1],
+                foreign_club = self.clubs[0],
+                membership = ClubMembership.UserLevels.OWNER
+            )
+
+    def test_clubs_can_each_have_an_owner(self):
+        self._create_second_club()
+        self._create_extra_membership(0, 1, ClubMembership.UserLevels.OWNER)
+        self._assert_membership_is_valid(1)
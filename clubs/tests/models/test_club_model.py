@@ -74,3 +74,13 @@ class ClubModelTestCase(TestCase):
     def test_name_cannot_be_over_200_characters_long(self):
         self.club1.description = 'x' * 201
         self._assert_club_is_invalid()
+
+# Counters
+    def test_save_keeps_counters_of_other_writes(self):
+        Club.objects.filter(pk = self.club1.pk).update(member_count = 3, version = 10)
+        self.club1.description = 'changed'
+        self.club1.save()
+        club = Club.objects.get(pk = self.club1.pk)
+        self.assertEqual(club.description, 'changed')
+        self.assertEqual(club.member_count, 3)
+        self.assertEqual(club.version, 11)
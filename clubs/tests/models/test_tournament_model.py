@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 from django.test import TestCase
 from clubs.models import Tournament
 from clubs.models import Club
+from clubs.models import User, ClubMembership, TournamentOrganizer, TournamentParticipant
 from datetime import datetime
 
 class TournamentModelTestCase(TestCase):
@@ -78,3 +79,71 @@ class TournamentModelTestCase(TestCase):
     def test_capacity_deadline_cannot_be_blank(self):
         self.tournament.capacity = ''
         self._assert_tournament_is_invalid()
+
+    def test_participant_count_follows_participants(self):
+        user = User.objects.create_user(
+            email = 'sensei@cobrakai.dojo',
+            name = 'Jonny Lawrence',
+            personal_statement = 'I\'m gonna kick some ass',
+            chess_experience = 'B',
+            password = 'NoM1yag1Do!',
+        )
+        participation = TournamentParticipant.objects.create(tournament = self.tournament, participant = user)
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.participant_count, 1)
+        participation.delete()
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.participant_count, 0)
+
+    def test_full_tournament_rejects_participants(self):
+        Tournament.objects.filter(pk = self.tournament.pk).update(participant_count = self.tournament.capacity)
+        user = User.objects.create_user(
+            email = 'sensei@cobrakai.dojo',
+            name = 'Jonny Lawrence',
+            personal_statement = 'I\'m gonna kick some ass',
+            chess_experience = 'B',
+            password = 'NoM1yag1Do!',
+        )
+        with self.assertRaises(ValidationError):
+            TournamentParticipant.objects.create(tournament = self.tournament, participant = user)
+        self.assertFalse(TournamentParticipant.objects.filter(tournament = self.tournament).exists())
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.participant_count, self.tournament.capacity)
+
+    def test_saving_a_stale_tournament_keeps_participant_count(self):
+        user = User.objects.create_user(
+            email = 'sensei@cobrakai.dojo',
+            name = 'Jonny Lawrence',
+            personal_statement = 'I\'m gonna kick some ass',
+            chess_experience = 'B',
+            password = 'NoM1yag1Do!',
+        )
+        stale = Tournament.objects.get(pk = self.tournament.pk)
+        TournamentParticipant.objects.create(tournament = self.tournament, participant = user)
+        stale.description = 'changed'
+        stale.save()
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.description, 'changed')
+        self.assertEqual(self.tournament.participant_count, 1)
+
+    def test_eligible_coorganizers(self):
+        users = []
+        for i in range(6):
+            users.append(User.objects.create_user(
+                email = str(i) + '@test.org',
+                name = str(i),
+                personal_statement = 'Testing',
+                chess_experience = 'B',
+                password = 'Password123',
+            ))
+        levels = [
+            ClubMembership.UserLevels.OWNER, ClubMembership.UserLevels.OFFICER, ClubMembership.UserLevels.OFFICER,
+            ClubMembership.UserLevels.OFFICER, ClubMembership.UserLevels.MEMBER,
+        ]
+        for user, level in zip(users, levels):
+            ClubMembership.objects.create(foreign_user = user, foreign_club = self.club, membership = level)
+        TournamentOrganizer.objects.create(tournament = self.tournament, organizer = users[0], organizing_role = TournamentOrganizer.OrganizingRoles.ORGANIZER)
+        TournamentParticipant.objects.create(tournament = self.tournament, participant = users[2])
+        # an organizer who is no longer an officer must not break the computation
+        TournamentOrganizer.objects.create(tournament = self.tournament, organizer = users[5])
+        self.assertEqual(list(self.tournament.eligible_coorganizers()), [users[1], users[3]])
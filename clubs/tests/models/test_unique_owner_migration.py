@@ -0,0 +1,34 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+class UniqueOwnerMigrationTestCase(TransactionTestCase):
+    """0003_unique_club_owner on a database where the old race left a club with several owners."""
+
+    before = [("clubs", "0002_denormalized_counters")]
+    after = [("clubs", "0003_unique_club_owner")]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        latest = executor.loader.graph.leaf_nodes("clubs")
+        self.addCleanup(lambda: MigrationExecutor(connection).migrate(latest))
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        User = apps.get_model("clubs", "User")
+        Club = apps.get_model("clubs", "Club")
+        ClubMembership = apps.get_model("clubs", "ClubMembership")
+        users = [User.objects.create(name=str(i), email=str(i)+"@test.org", chess_experience="B") for i in range(4)]
+        clubs = [Club.objects.create(name=name, location="london", description="test") for name in ("shared", "single")]
+        self.memberships = [
+            ClubMembership.objects.create(foreign_user=users[0], foreign_club=clubs[0], membership=2),
+            ClubMembership.objects.create(foreign_user=users[1], foreign_club=clubs[0], membership=2),
+            ClubMembership.objects.create(foreign_user=users[2], foreign_club=clubs[0], membership=0),
+            ClubMembership.objects.create(foreign_user=users[3], foreign_club=clubs[1], membership=2),
+        ]
+
+    def test_keeps_the_earliest_owner(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        ClubMembership = executor.loader.project_state(self.after).apps.get_model("clubs", "ClubMembership")
+        levels = [ClubMembership.objects.get(pk=membership.pk).membership for membership in self.memberships]
+        self.assertEqual(levels, [2, 1, 0, 2])
@@ -1,6 +1,7 @@
 """ Unit tests for the User model """
 from django.core.exceptions import ValidationError
 from django.test import TestCase
+from libgravatar import Gravatar
 from clubs.models import User
 from clubs.models import Club
 
@@ -134,3 +135,16 @@ class UserModelTestCase(TestCase):
     def test_chess_experience_cannot_be_over_1_character_long(self):
         self.user1.chess_experience = 'BI'
         self._assert_user_is_invalid()
+
+    def test_gravatar_matches_libgravatar(self):
+        for size in [120, 80, 50]:
+            expected = Gravatar(self.user1.email).get_image(size=size, default='mp')
+            self.assertEqual(self.user1.gravatar(size), expected)
+
+    def test_email_hash_is_refreshed_when_email_changes(self):
+        old_gravatar = self.user1.gravatar()
+        self.user1.email = 'Johnny@CobraKai.dojo'
+        self.user1.save(update_fields=['email'])
+        self.user1.refresh_from_db()
+        self.assertNotEqual(self.user1.gravatar(), old_gravatar)
+        self.assertEqual(self.user1.gravatar(), Gravatar('johnny@cobrakai.dojo').get_image(size=120, default='mp'))
@@ -0,0 +1,98 @@
+import brotli
+import gzip
+import json
+from unittest import mock
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from clubs.cache import club_cache
+from clubs.models import User, Club, ClubMembership
+from system import middleware
+from system.middleware import CompressionMiddleware, accepted_encoding
+
+class AcceptedEncodingTestCase(SimpleTestCase):
+
+    def test_prefers_brotli(self):
+        self.assertEqual(accepted_encoding("gzip, deflate, br"), "br")
+        self.assertEqual(accepted_encoding("gzip;q=1.0, br;q=0.5"), "br")
+
+    def test_respects_refusals(self):
+        self.assertEqual(accepted_encoding("gzip, br;q=0"), "gzip")
+        self.assertEqual(accepted_encoding("*;q=0"), None)
+        self.assertEqual(accepted_encoding("*"), "br")
+        self.assertEqual(accepted_encoding(""), None)
+        self.assertEqual(accepted_encoding("identity"), None)
+
+    @override_settings(COMPRESSION_ENCODINGS=["gzip"])
+    def test_only_configured_encodings(self):
+        self.assertEqual(accepted_encoding("br, gzip"), "gzip")
+
+    def test_streaming_responses(self):
+        rows = [json.dumps({"row": i, "text": "x" * 50}).encode() + b"\n" for i in range(200)]
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = CompressionMiddleware(lambda request: StreamingHttpResponse(iter(rows), content_type="application/json"))(request)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), b"".join(rows))
+
+    def test_other_content_types_are_left_alone(self):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = CompressionMiddleware(lambda request: HttpResponse("x" * 5000, content_type="text/html"))(request)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+
+class CompressionTestCase(TestCase):
+
+    def setUp(self):
+        club_cache().clear()
+        self.club = Club.objects.create(name="test", location="london", description="test")
+        for i in range(20):
+            user = User.objects.create_user(
+                name=str(i),
+                email=str(i)+"@test.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="A long and rather repetitive biography. " * 5
+            )
+            level = ClubMembership.UserLevels.OWNER if i == 0 else ClubMembership.UserLevels.MEMBER
+            ClubMembership.objects.create(foreign_user=user, foreign_club=self.club, membership=level)
+        self.client.login(email="0@test.org", password="Password123")
+
+    def _get(self, encoding, **headers):
+        return self.client.get(reverse("club"), {"name": "test"}, HTTP_ACCEPT_ENCODING=encoding, **headers)
+
+    def test_negotiates_encoding(self):
+        identity = self._get("")
+        self.assertFalse(identity.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", identity["Vary"])
+        compressed = self._get("gzip, br")
+        self.assertEqual(compressed["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(compressed.content), identity.content)
+        self.assertEqual(int(compressed["Content-Length"]), len(compressed.content))
+        compressed = self._get("gzip")
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(compressed.content), identity.content)
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get(reverse("applications"), HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertNotIn("Accept-Encoding", response.get("Vary", ""))
+
+    def test_compressed_responses_revalidate_with_weak_etag(self):
+        response = self._get("br")
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        revalidated = self._get("br", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated["ETag"], response["ETag"])
+
+    def test_compressed_body_is_cached_under_etag(self):
+        with mock.patch("system.middleware.compress", wraps=middleware.compress) as compress:
+            first = self._get("br")
+            second = self._get("br")
+            self.assertEqual(first.content, second.content)
+            self.assertEqual(compress.call_count, 1)
+            # a change retires the ETag, and with it the compressed body
+            ClubMembership.objects.filter(foreign_user__email="19@test.org").delete()
+            third = self._get("br")
+            self.assertEqual(compress.call_count, 2)
+        self.assertEqual(len(json.loads(brotli.decompress(third.content))["members"]), 18)
@@ -0,0 +1,78 @@
+import json
+import tempfile
+from django.conf import settings
+from django.db import connections
+from django.test import TransactionTestCase
+from django.urls import reverse
+from clubs.models import User, Club, ClubMembership
+from system.routers import read_from_replica
+
+class ReadReplicaTestCase(TransactionTestCase):
+    """Two SQLite files stand in for the primary and a replica that has stopped replicating."""
+
+    def setUp(self):
+        self.club = Club.objects.create(name="test",location="london", description="before")
+        self.user = User.objects.create_user(
+            name="0",
+            email="0@test.org",
+            personal_statement="Testing",
+            password="Password123",
+            bio="Testing")
+        ClubMembership.objects.create(foreign_user=self.user, foreign_club=self.club, membership=ClubMembership.UserLevels.OWNER)
+
+        self.directory = tempfile.TemporaryDirectory()
+        connections.databases[settings.REPLICA_DATABASE] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": self.directory.name + "/replica.sqlite3",
+        }
+        connections["default"].ensure_connection()
+        connections[settings.REPLICA_DATABASE].ensure_connection()
+        connections["default"].connection.backup(connections[settings.REPLICA_DATABASE].connection)
+
+        # writes the replica has not received yet
+        Club.objects.filter(pk=self.club.pk).update(description="after")
+        Club.objects.create(name="unreplicated", location="london", description="test")
+        self.client.login(email="0@test.org", password="Password123")
+
+    def tearDown(self):
+        connections[settings.REPLICA_DATABASE].close()
+        del connections[settings.REPLICA_DATABASE]
+        del connections.databases[settings.REPLICA_DATABASE]
+        self.directory.cleanup()
+
+    def _description(self):
+        response = self.client.get(reverse("club"), {"name": "test"})
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)["description"]
+
+    def test_marked_views_read_from_replica(self):
+        self.assertEqual(self._description(), "before")
+        response = self.client.get(reverse("clubs"))
+        self.assertContains(response, "test")
+        self.assertNotContains(response, "unreplicated")
+
+    def test_unmarked_views_read_from_primary(self):
+        response = self.client.get(reverse("club_changes"), {"name": "test", "since": 0})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["members"][0]["id"], self.user.id)
+        self.assertEqual(Club.objects.get(pk=self.club.pk).description, "after")
+
+    def test_reads_from_primary_after_a_write(self):
+        response = self.client.post(reverse("toggle_tournament"), {"club": "test", "tournament": "none"})
+        self.assertIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+        self.assertEqual(response.cookies[settings.REPLICA_STICKY_COOKIE]["max-age"], settings.REPLICA_STICKY_SECONDS)
+        self.assertEqual(self._description(), "after")
+
+    def test_writes_go_to_primary(self):
+        with read_from_replica():
+            club = Club.objects.get(pk=self.club.pk)
+            self.assertEqual(club._state.db, settings.REPLICA_DATABASE)
+            club.description = "written"
+            club.save()
+            ClubMembership.objects.filter(foreign_club=club).update(membership=ClubMembership.UserLevels.OWNER)
+        self.assertEqual(Club.objects.get(pk=self.club.pk).description, "written")
+        self.assertEqual(Club.objects.using(settings.REPLICA_DATABASE).get(pk=self.club.pk).description, "before")
+
+    def test_sessions_read_from_primary(self):
+        # the session was created after the replica's snapshot
+        self.assertEqual(self.client.get(reverse("club"), {"name": "test"}).status_code, 200)
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import Client, SimpleTestCase, override_settings
+from clubs.assets import VENDOR_ASSETS, VendorAsset
+
+def render_vendor_asset(name):
+    return Template("{% load assets %}{% vendor_asset name %}").render(Context({"name": name}))
+
+class VendorAssetTagTestCase(SimpleTestCase):
+
+    def test_links_the_cdn_until_vendored(self):
+        static = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static)
+        with override_settings(STATICFILES_DIRS=[static]):
+            html = render_vendor_asset("bootstrap.css")
+        asset = VENDOR_ASSETS["bootstrap.css"]
+        self.assertEqual(html, f'<link href="{asset.url}" rel="stylesheet" integrity="{asset.integrity}" crossorigin="anonymous">')
+
+    def test_links_the_vendored_copy(self):
+        asset = VENDOR_ASSETS["popper.js"]
+        self.assertEqual(render_vendor_asset("popper.js"), f'<script src="/static/{asset.path}" integrity="{asset.integrity}"></script>')
+
+    def test_unpinned_assets_have_no_integrity(self):
+        assets = {"library.css": VendorAsset("vendor/library/library.css", "https://cdn.example.org/library.css")}
+        with mock.patch("clubs.templatetags.assets.VENDOR_ASSETS", assets):
+            html = render_vendor_asset("library.css")
+        self.assertEqual(html, '<link href="https://cdn.example.org/library.css" rel="stylesheet" crossorigin="anonymous">')
+
+    def test_every_library_is_vendored(self):
+        for name in VENDOR_ASSETS:
+            self.assertIn("/static/vendor/", render_vendor_asset(name))
+
+
+class StaticPipelineTestCase(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(
+            STATIC_ROOT=cls.static_root,
+            STATICFILES_STORAGE="whitenoise.storage.CompressedManifestStaticFilesStorage",
+            MIDDLEWARE=["whitenoise.middleware.WhiteNoiseMiddleware"] + settings.MIDDLEWARE,
+        )
+        cls.settings_override.enable()
+        call_command("collectstatic", interactive=False, verbosity=0, stdout=StringIO())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.static_root)
+        super().tearDownClass()
+
+    def test_files_are_hashed_and_precompressed(self):
+        url = staticfiles_storage.url("js/home.js")
+        self.assertRegex(url, r"^/static/js/home\.[0-9a-f]{12}\.js$")
+        name = url[len("/static/"):]
+        for suffix in ("", ".gz", ".br"):
+            self.assertTrue(os.path.exists(os.path.join(self.static_root, name + suffix)))
+
+    def test_stylesheet_refers_to_hashed_images(self):
+        with open(staticfiles_storage.path(staticfiles_storage.stored_name("style.css"))) as file:
+            css = file.read()
+        self.assertIn(staticfiles_storage.stored_name("images/chess-banner.png").split("/")[-1], css)
+
+    def test_hashed_files_are_served_compressed_and_immutable(self):
+        response = Client().get(staticfiles_storage.url("js/home.js"), HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("immutable", response["Cache-Control"])
+        response.close()
+
+    def test_pages_load_the_hashed_bundles(self):
+        html = Template("{% load static %}{% static 'js/clubs.js' %}").render(Context())
+        self.assertEqual(html, staticfiles_storage.url("js/clubs.js"))
+        self.assertNotEqual(html, "/static/js/clubs.js")
@@ -1,4 +1,6 @@
 import json
+from unittest import mock
+from django.db import transaction
 from django.test import TestCase
 from django.urls import reverse
 from clubs.models import User, Club, ClubMembership
@@ -108,4 +110,20 @@ class ChangeRankAPI(TestCase):
         officer = ClubMembership.objects.filter(foreign_user__email="2@test.org")[0]
         me = ClubMembership.objects.filter(foreign_user__email="0@test.org")[0]
         self.assertTrue(officer.membership==ClubMembership.UserLevels.OWNER)
-        self.assertTrue(me.membership==ClubMembership.UserLevels.OFFICER)
\ No newline at end of file
+        self.assertTrue(me.membership==ClubMembership.UserLevels.OFFICER)
+
+    def test_stale_transfer_ownership(self):
+        form_input = {"email": "0@test.org", "password": "Password123"}
+        response = self.client.post(reverse("log_in"), form_input)
+        atomic = transaction.atomic
+        def first_click_commits(*args, **kwargs):
+            # the first click of a double-clicked transfer commits after this request checked the ranks
+            if not ClubMembership.objects.filter(foreign_user__email="2@test.org", membership=ClubMembership.UserLevels.OWNER).exists():
+                ClubMembership.objects.filter(foreign_user__email="0@test.org").update(membership=ClubMembership.UserLevels.OFFICER)
+                ClubMembership.objects.filter(foreign_user__email="2@test.org").update(membership=ClubMembership.UserLevels.OWNER)
+            return atomic(*args, **kwargs)
+        with mock.patch("django.db.transaction.atomic", first_click_commits):
+            response = self.client.post(self.url, {"name": "test", "email": "3@test.org", "promoting": "1"})
+        self.assertTrue(response.status_code==409)
+        self.assertTrue(ClubMembership.objects.get(foreign_user__email="2@test.org").membership==ClubMembership.UserLevels.OWNER)
+        self.assertTrue(ClubMembership.objects.get(foreign_user__email="3@test.org").membership==ClubMembership.UserLevels.OFFICER)
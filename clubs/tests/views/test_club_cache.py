@@ -0,0 +1,183 @@
+import json
+import os
+import pytz
+import runpy
+import tempfile
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import mock
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from clubs.cache import cache_stats, club_cache, reset_cache_stats
+from clubs.models import User, Club, ClubMembership, Tournament, TournamentOrganizer, TournamentParticipant
+from system import settings as project_settings
+
+@override_settings(CLUB_CACHE_STATS=True)
+class ClubCacheTestCase(TestCase):
+
+    def setUp(self):
+        club_cache().clear()
+        self.club = Club.objects.create(name="test",location="london", description="test")
+        self.users = []
+        for i in range(4):
+            self.users.append(User.objects.create_user(
+                name=str(i),
+                email=str(i)+"@test.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="Testing"
+            ))
+        levels = [ClubMembership.UserLevels.OWNER, ClubMembership.UserLevels.OFFICER, ClubMembership.UserLevels.MEMBER, ClubMembership.UserLevels.MEMBER]
+        for user, level in zip(self.users, levels):
+            ClubMembership.objects.create(foreign_user=user, foreign_club=self.club, membership=level)
+        self.tournament = Tournament.objects.create(
+            club=self.club,
+            name="tournament",
+            description="testing",
+            signup_deadline=datetime.now(tz=pytz.UTC) + timedelta(days=1))
+        TournamentOrganizer.objects.create(
+            tournament=self.tournament,
+            organizer=self.users[0],
+            organizing_role=TournamentOrganizer.OrganizingRoles.ORGANIZER)
+        self.client.login(email="2@test.org", password="Password123")
+        reset_cache_stats()
+
+    def _get(self, name, **params):
+        response = self.client.get(reverse(name), {"name": "test", **params})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_roster_hit_skips_roster_query(self):
+        with CaptureQueriesContext(connection) as miss:
+            first = self._get("club")
+        with CaptureQueriesContext(connection) as hit:
+            second = self._get("club")
+        self.assertEqual(first.content, second.content)
+        self.assertLess(len(hit), len(miss))
+        self.assertEqual(cache_stats()["roster"], {"hits": 1, "misses": 1})
+
+    def test_roster_invalidated_by_membership_change(self):
+        self._get("club")
+        ClubMembership.objects.filter(foreign_user=self.users[3]).get().delete()
+        data = json.loads(self._get("club").content)
+        self.assertEqual([user["id"] for user in data["members"]], [self.users[2].id])
+        self.assertEqual(cache_stats()["roster"], {"hits": 0, "misses": 2})
+
+    def test_roster_invalidated_by_profile_change(self):
+        self._get("club")
+        self.users[1].bio = "changed"
+        self.users[1].save()
+        data = json.loads(self._get("club").content)
+        self.assertEqual(data["officers"][0]["bio"], "changed")
+
+    def test_roster_follows_write_of_another_worker(self):
+        self._get("club")
+        # another worker's write bumps Club.version but not this worker's cache generation
+        newcomer = User.objects.create_user(
+            name="newcomer",
+            email="newcomer@test.org",
+            personal_statement="Testing",
+            password="Password123",
+            bio="Testing"
+        )
+        with mock.patch("clubs.cache.bump_generation"):
+            ClubMembership.objects.create(foreign_user=newcomer, foreign_club=self.club, membership=ClubMembership.UserLevels.MEMBER)
+        data = json.loads(self._get("club").content)
+        self.assertIn(newcomer.id, [user["id"] for user in data["members"]])
+        self.assertEqual(cache_stats()["roster"], {"hits": 0, "misses": 2})
+
+    def test_roster_cached_per_level(self):
+        self._get("club")
+        self.client.login(email="1@test.org", password="Password123")
+        data = json.loads(self._get("club").content)
+        self.assertIn("email", data["officers"][0])
+        self.assertEqual(cache_stats()["roster"], {"hits": 0, "misses": 2})
+
+    def test_tournaments_invalidated_by_participants_and_organizers(self):
+        self._get("club_tournaments")
+        TournamentParticipant.objects.create(tournament=self.tournament, participant=self.users[3])
+        self.assertEqual(json.loads(self._get("club_tournaments").content)[0]["participants"], 1)
+        TournamentOrganizer.objects.create(tournament=self.tournament, organizer=self.users[1])
+        self._get("club_tournaments")
+        self.assertEqual(cache_stats()["tournaments"], {"hits": 0, "misses": 3})
+
+    def test_cached_tournaments_keep_user_flags(self):
+        TournamentParticipant.objects.create(tournament=self.tournament, participant=self.users[2])
+        mine = json.loads(self._get("club_tournaments").content)[0]
+        self.assertTrue(mine["participating"])
+        self.assertFalse(mine["is_coorganizer"])
+        self.client.login(email="0@test.org", password="Password123")
+        theirs = json.loads(self._get("club_tournaments").content)[0]
+        self.assertFalse(theirs["participating"])
+        self.assertTrue(theirs["is_coorganizer"])
+        self.assertEqual(cache_stats()["tournaments"], {"hits": 1, "misses": 1})
+
+    def test_profile_cached(self):
+        first = self._get("club_profile")
+        second = self._get("club_profile")
+        self.assertEqual(first.content, second.content)
+        self.assertContains(second, self.users[0].email_hash)
+        self.assertEqual(cache_stats()["profile"], {"hits": 1, "misses": 1})
+
+    def test_stats_command(self):
+        self._get("club")
+        self._get("club")
+        out = StringIO()
+        call_command("club_cache_stats", "--reset", stdout=out)
+        self.assertIn("roster                1          1     50.0%", out.getvalue())
+        self.assertEqual(cache_stats()["roster"], {"hits": 0, "misses": 0})
+
+
+    @override_settings(CLUB_CACHE_STATS=False)
+    def test_stats_are_opt_in(self):
+        self._get("club")
+        self._get("club")
+        self.assertEqual(cache_stats()["roster"], {"hits": 0, "misses": 0})
+
+
+class FileBasedClubCacheTestCase(ClubCacheTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        settings = override_settings(CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "clubs": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": self.directory.name},
+        })
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(self.directory.cleanup)
+        super().setUp()
+
+
+class SharedCacheLocationTestCase(SimpleTestCase):
+
+    def test_default_location_is_outside_the_source_tree(self):
+        environment = {"CLUB_CACHE_BACKEND": "django.core.cache.backends.filebased.FileBasedCache"}
+        with mock.patch.dict(os.environ, environment):
+            os.environ.pop("CLUB_CACHE_LOCATION", None)
+            caches = runpy.run_path(project_settings.__file__)["CACHES"]
+        for alias in ("clubs", "template_fragments"):
+            self.assertTrue(os.path.isabs(caches[alias]["LOCATION"]))
+            self.assertFalse(caches[alias]["LOCATION"].startswith(str(project_settings.BASE_DIR)))
+
+    def test_caches_get_their_own_directories(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        environment = {
+            "CLUB_CACHE_BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "CLUB_CACHE_LOCATION": directory.name,
+        }
+        with mock.patch.dict(os.environ, environment):
+            caches = runpy.run_path(project_settings.__file__)["CACHES"]
+        clubs = FileBasedCache(caches["clubs"]["LOCATION"], caches["clubs"])
+        fragments = FileBasedCache(caches["template_fragments"]["LOCATION"], caches["template_fragments"])
+        self.assertNotEqual(clubs._dir, fragments._dir)
+        clubs.set("roster", 1)
+        fragments.set("table", 2)
+        fragments.clear()
+        self.assertEqual(clubs.get("roster"), 1)
+        self.assertIsNone(fragments.get("table"))
@@ -0,0 +1,119 @@
+import json
+import pytz
+from datetime import datetime, timedelta
+from unittest import mock
+from django.db import DatabaseError
+from django.test import TestCase
+from django.urls import reverse
+from clubs.models import User, Club, ClubChange, ClubMembership, Tournament, TournamentOrganizer, TournamentParticipant
+
+class ClubChangesAPI(TestCase):
+
+    def setUp(self):
+        self.club = Club.objects.create(name="test",location="london", description="test")
+        self.users = []
+        for i in range(4):
+            self.users.append(User.objects.create_user(
+                name=str(i),
+                email=str(i)+"@test.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="Testing"
+            ))
+        ClubMembership.objects.create(foreign_user=self.users[0], foreign_club=self.club, membership=ClubMembership.UserLevels.OWNER)
+        ClubMembership.objects.create(foreign_user=self.users[1], foreign_club=self.club, membership=ClubMembership.UserLevels.MEMBER)
+        self.tournament = Tournament.objects.create(
+            club=self.club,
+            name="tournament",
+            description="testing",
+            signup_deadline=datetime.now(tz=pytz.UTC) + timedelta(days=1))
+        TournamentOrganizer.objects.create(
+            tournament=self.tournament,
+            organizer=self.users[0],
+            organizing_role=TournamentOrganizer.OrganizingRoles.ORGANIZER)
+        self.url = reverse("club_changes")
+
+    def _since(self, email="0@test.org"):
+        self.client.login(email=email, password="Password123")
+        return json.loads(self.client.get(reverse("club_dashboard"), {"name": "test"}).content)["club"]["changes_since"]
+
+    def _changes(self, since):
+        response = self.client.get(self.url, {"name": "test", "since": since})
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_invalid_requests(self):
+        self.client.login(email="0@test.org", password="Password123")
+        self.assertEqual(self.client.get(self.url, {"name": "test", "since": "abc"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"name": "test", "since": "99999999999999999999"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"name": "test", "since": -1}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"name": "pingo storm", "since": 0}).status_code, 404)
+        self.client.login(email="3@test.org", password="Password123")
+        self.assertEqual(self.client.get(self.url, {"name": "test", "since": 0}).status_code, 403)
+
+    def test_no_changes(self):
+        since = self._since()
+        data = self._changes(since)
+        self.assertEqual(data["changes_since"], since)
+        self.assertEqual(data["members"], [])
+        self.assertEqual(data["tournaments"], [])
+
+    def test_promotion(self):
+        since = self._since()
+        membership = ClubMembership.objects.get(foreign_user=self.users[1])
+        membership.membership = ClubMembership.UserLevels.OFFICER
+        membership.save()
+        data = self._changes(since)
+        self.assertEqual([(user["id"], user["user_level"]) for user in data["members"]], [(self.users[1].id, "Officer")])
+        self.assertGreater(data["changes_since"], since)
+        self.assertEqual(self._changes(data["changes_since"])["members"], [])
+
+    def test_leaving(self):
+        since = self._since()
+        ClubMembership.objects.get(foreign_user=self.users[1]).delete()
+        data = self._changes(since)
+        self.assertEqual(data["members"], [])
+        self.assertEqual(data["removed_members"], [self.users[1].id])
+
+    def test_applications_are_only_shown_to_staff(self):
+        owner_since = self._since()
+        member_since = self._since("1@test.org")
+        ClubMembership.objects.create(foreign_user=self.users[2], foreign_club=self.club)
+        data = self._changes(member_since)
+        self.assertEqual(data["members"], [])
+        self.assertEqual(data["removed_members"], [self.users[2].id])
+        self.client.login(email="0@test.org", password="Password123")
+        data = self._changes(owner_since)
+        self.assertEqual([user["email"] for user in data["members"]], ["2@test.org"])
+
+    def test_participation(self):
+        since = self._since("1@test.org")
+        TournamentParticipant.objects.create(tournament=self.tournament, participant=self.users[1])
+        data = self._changes(since)
+        self.assertEqual(len(data["tournaments"]), 1)
+        self.assertEqual(data["tournaments"][0]["id"], self.tournament.id)
+        self.assertTrue(data["tournaments"][0]["participating"])
+        self.assertEqual(data["tournaments"][0]["participants"], 1)
+
+    def test_deleted_tournament(self):
+        since = self._since()
+        tournament_id = self.tournament.id
+        self.tournament.delete()
+        data = self._changes(since)
+        self.assertEqual(data["tournaments"], [])
+        self.assertEqual(data["removed_tournaments"], [tournament_id])
+
+    def test_profile_change(self):
+        since = self._since()
+        self.users[1].name = "renamed"
+        self.users[1].save()
+        data = self._changes(since)
+        self.assertEqual([user["name"] for user in data["members"]], ["renamed"])
+
+    def test_version_and_log_entry_commit_together(self):
+        version = Club.objects.get(pk=self.club.pk).version
+        with mock.patch.object(ClubChange.objects, "bulk_create", side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.tournament.name = "renamed"
+                self.tournament.save()
+        self.assertEqual(Club.objects.get(pk=self.club.pk).version, version)
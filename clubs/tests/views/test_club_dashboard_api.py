@@ -0,0 +1,73 @@
+import json
+import pytz
+from datetime import datetime, timedelta
+from django.test import TestCase
+from django.urls import reverse
+from clubs.models import User, Club, ClubMembership, Tournament, TournamentOrganizer
+
+class ClubDashboardAPI(TestCase):
+
+    def setUp(self):
+        self.club = Club.objects.create(name="test",location="london", description="test")
+        self.other_club = Club.objects.create(name="other",location="london", description="other")
+        self.users = []
+        for i in range(4):
+            self.users.append(User.objects.create_user(
+                name=str(i),
+                email=str(i)+"@test.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="Testing"
+            ))
+        ClubMembership.objects.create(foreign_user=self.users[0], foreign_club=self.club, membership=ClubMembership.UserLevels.OWNER)
+        ClubMembership.objects.create(foreign_user=self.users[1], foreign_club=self.club, membership=ClubMembership.UserLevels.MEMBER)
+        ClubMembership.objects.create(foreign_user=self.users[2], foreign_club=self.club, membership=ClubMembership.UserLevels.PENDING)
+        ClubMembership.objects.create(foreign_user=self.users[1], foreign_club=self.other_club, membership=ClubMembership.UserLevels.PENDING)
+        tournament = Tournament.objects.create(
+            club=self.club,
+            name="tournament",
+            description="testing",
+            signup_deadline=datetime.now(tz=pytz.UTC) + timedelta(days=1))
+        TournamentOrganizer.objects.create(
+            tournament=tournament,
+            organizer=self.users[0],
+            organizing_role=TournamentOrganizer.OrganizingRoles.ORGANIZER)
+        self.url = reverse("club_dashboard")
+
+    def test_invalid_club(self):
+        self.client.login(email="1@test.org", password="Password123")
+        response = self.client.get(self.url, {"name": "pingo storm"})
+        self.assertTrue(response.status_code==404)
+
+    def test_as_not_in_club(self):
+        self.client.login(email="3@test.org", password="Password123")
+        response = self.client.get(self.url, {"name": "test"})
+        self.assertTrue(response.status_code==403)
+
+    def test_as_member(self):
+        self.client.login(email="1@test.org", password="Password123")
+        response = self.client.get(self.url, {"name": "test"})
+        data = json.loads(response.content)
+        self.assertEqual(data["club"]["owner"]["name"], "0")
+        self.assertEqual([user["name"] for user in data["club"]["members"]], ["1"])
+        self.assertFalse(data["club"]["is_staff"])
+        self.assertIsNone(data["pending"])
+        self.assertEqual(data["applications"], {"pending": ["other"], "rejected": []})
+        self.assertEqual([tour["name"] for tour in data["tournaments"]], ["tournament"])
+        self.assertEqual(data["tournaments"][0]["organizer"], "0")
+
+    def test_as_owner(self):
+        self.client.login(email="0@test.org", password="Password123")
+        response = self.client.get(self.url, {"name": "test"})
+        data = json.loads(response.content)
+        self.assertTrue(data["club"]["is_owner"])
+        self.assertEqual([user["email"] for user in data["pending"]], ["2@test.org"])
+        self.assertTrue(data["tournaments"][0]["is_coorganizer"])
+
+    def test_matches_individual_endpoints(self):
+        self.client.login(email="0@test.org", password="Password123")
+        data = json.loads(self.client.get(self.url, {"name": "test"}).content)
+        self.assertEqual(data["club"], json.loads(self.client.get(reverse("club"), {"name": "test"}).content))
+        self.assertEqual(data["pending"], json.loads(self.client.get(reverse("pending_applications"), {"name": "test"}).content))
+        self.assertEqual(data["applications"], json.loads(self.client.get(reverse("applications")).content))
+        self.assertEqual(data["tournaments"], json.loads(self.client.get(reverse("club_tournaments"), {"name": "test"}).content))
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+from unittest import mock
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.test import Client, TransactionTestCase, override_settings
+from clubs.events import get_broker
+from clubs.models import User, Club, ClubMembership
+from system.asgi import application
+
+class ClubEventsStreamTestCase(TransactionTestCase):
+    """The ASGI event stream, with the in-process broker and with the change log broker standing in for a multi-worker setup."""
+
+    def setUp(self):
+        self.club = Club.objects.create(name="test",location="london", description="test")
+        self.users = []
+        for i in range(3):
+            self.users.append(User.objects.create_user(
+                name=str(i),
+                email=str(i)+"@test.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="Testing"
+            ))
+        ClubMembership.objects.create(foreign_user=self.users[0], foreign_club=self.club, membership=ClubMembership.UserLevels.OWNER)
+        ClubMembership.objects.create(foreign_user=self.users[1], foreign_club=self.club, membership=ClubMembership.UserLevels.PENDING)
+        self.sessions = []
+        for user in self.users[:2]:
+            client = Client()
+            client.force_login(user)
+            self.sessions.append(client.cookies[settings.SESSION_COOKIE_NAME].value)
+
+    def _communicator(self, session=None, name="test", origin=None):
+        headers = []
+        if session is not None:
+            headers.append((b"cookie", f"{settings.SESSION_COOKIE_NAME}={session}".encode()))
+        if origin is not None:
+            headers.append((b"origin", origin.encode()))
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": settings.CLUB_EVENTS_PATH,
+            "query_string": f"name={name}".encode(),
+            "headers": headers,
+        }
+        return ApplicationCommunicator(application, scope)
+
+    async def _open(self, communicator):
+        await communicator.send_input({"type": "http.request", "body": b""})
+        start = await communicator.receive_output(timeout=5)
+        if start["status"] == 200:
+            await communicator.receive_output(timeout=5)
+            # let the stream subscribe before anything is published
+            await asyncio.sleep(0.1)
+        return start
+
+    async def _close(self, communicator):
+        await communicator.send_input({"type": "http.disconnect"})
+        await communicator.wait(timeout=5)
+
+    async def test_requires_login(self):
+        start = await self._open(self._communicator())
+        self.assertEqual(start["status"], 403)
+
+    async def test_requires_accepted_membership(self):
+        start = await self._open(self._communicator(self.sessions[1]))
+        self.assertEqual(start["status"], 403)
+
+    async def _assert_pushes_changes(self):
+        communicator = self._communicator(self.sessions[0])
+        start = await self._open(communicator)
+        self.assertEqual(start["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream"), start["headers"])
+        await sync_to_async(ClubMembership.objects.create)(foreign_user=self.users[2], foreign_club=self.club)
+        message = await communicator.receive_output(timeout=5)
+        self.assertTrue(message["body"].startswith(b"event: change\n"))
+        await self._close(communicator)
+        self.assertEqual(get_broker().subscribers, {})
+
+    async def test_pushes_changes(self):
+        await self._assert_pushes_changes()
+
+    @override_settings(CLUB_EVENTS_BROKER="clubs.events.ChangeLogBroker", CLUB_EVENTS_BROKER_OPTIONS={"interval": 0.05})
+    async def test_change_log_broker_pushes_changes(self):
+        threads = set()
+        latest_change = get_broker().latest_change
+        def recording_latest_change(club_id):
+            threads.add(threading.current_thread().name)
+            return latest_change(club_id)
+        with mock.patch.object(get_broker(), "latest_change", recording_latest_change):
+            await self._assert_pushes_changes()
+        self.assertEqual(get_broker().pollers, {})
+        # polled on the broker's own thread, not the one shared by the worker's sync code
+        self.assertEqual({name.split("_")[0] for name in threads}, {"club-events-poll"})
+
+    @override_settings(CLUB_EVENTS_KEEPALIVE=0.05)
+    async def test_keepalive(self):
+        communicator = self._communicator(self.sessions[0])
+        await self._open(communicator)
+        message = await communicator.receive_output(timeout=5)
+        self.assertEqual(message["body"], b": keepalive\n\n")
+        await self._close(communicator)
+
+    @override_settings(CLUB_EVENTS_ALLOWED_ORIGINS=["https://chess.example"])
+    async def test_allows_configured_origins(self):
+        communicator = self._communicator(self.sessions[0], origin="https://chess.example")
+        start = await self._open(communicator)
+        self.assertIn((b"access-control-allow-origin", b"https://chess.example"), start["headers"])
+        self.assertIn((b"access-control-allow-credentials", b"true"), start["headers"])
+        await self._close(communicator)
+        communicator = self._communicator(self.sessions[0], origin="https://elsewhere.example")
+        start = await self._open(communicator)
+        self.assertNotIn(b"access-control-allow-origin", dict(start["headers"]))
+        await self._close(communicator)
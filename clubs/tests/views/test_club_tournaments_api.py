@@ -0,0 +1,89 @@
+import json
+import pytz
+from datetime import datetime, timedelta
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from clubs.models import User, Club, ClubMembership, Tournament, TournamentOrganizer, TournamentParticipant
+
+class ClubTournamentsAPI(TestCase):
+
+    def setUp(self):
+        self.club = Club.objects.create(name="test",location="london", description="test")
+        self.member = User.objects.create_user(
+                name="member",
+                email="member@user.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="Testing")
+        self.organizer = User.objects.create_user(
+                name="organizer",
+                email="organizer@user.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="Testing")
+        ClubMembership.objects.create(
+            foreign_user=self.organizer,
+            foreign_club=self.club,
+            membership=ClubMembership.UserLevels.OWNER)
+        ClubMembership.objects.create(
+            foreign_user=self.member,
+            foreign_club=self.club,
+            membership=ClubMembership.UserLevels.OFFICER)
+        self.url = reverse("club_tournaments")
+
+    def _create_tournaments(self, n):
+        start = Tournament.objects.count()
+        tournaments = []
+        for i in range(start, start + n):
+            tournament = Tournament.objects.create(
+                club=self.club,
+                name="tournament " + str(i),
+                description="testing",
+                signup_deadline=datetime.now(tz=pytz.UTC) + timedelta(days=1))
+            TournamentOrganizer.objects.create(
+                tournament=tournament,
+                organizer=self.organizer,
+                organizing_role=TournamentOrganizer.OrganizingRoles.ORGANIZER)
+            tournaments.append(tournament)
+        return tournaments
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {"name": self.club.name})
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_tournaments_are_listed_newest_first(self):
+        first, second = self._create_tournaments(2)
+        TournamentParticipant.objects.create(tournament=first, participant=self.member)
+        TournamentOrganizer.objects.create(
+            tournament=second,
+            organizer=self.member,
+            organizing_role=TournamentOrganizer.OrganizingRoles.COORGANIZER)
+        self.client.login(email=self.member.email, password="Password123")
+        response = self.client.get(self.url, {"name": self.club.name})
+        data = json.loads(response.content)
+        self.assertEqual([t["name"] for t in data], [second.name, first.name])
+        self.assertEqual(data[0]["organizer"], self.organizer.name)
+        self.assertEqual(data[0]["participants"], 0)
+        self.assertFalse(data[0]["participating"])
+        self.assertTrue(data[0]["is_coorganizer"])
+        self.assertEqual(data[1]["participants"], 1)
+        self.assertTrue(data[1]["participating"])
+        self.assertFalse(data[1]["is_coorganizer"])
+        self.assertEqual(data[1]["limit"], first.capacity)
+
+    def test_query_count_is_constant(self):
+        self.client.login(email=self.member.email, password="Password123")
+        self._create_tournaments(1)
+        expected = self._count_queries()
+        for tournament in self._create_tournaments(20):
+            TournamentParticipant.objects.create(tournament=tournament, participant=self.member)
+        self.assertEqual(self._count_queries(), expected)
+
+    def test_missing_club_name(self):
+        self.client.login(email=self.member.email, password="Password123")
+        response = self.client.get(self.url)
+        self.assertTrue(response.status_code==400)
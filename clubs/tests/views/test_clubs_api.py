@@ -1,6 +1,9 @@
 import json
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from clubs.helpers import encode_cursor
 from clubs.models import User, Club, ClubMembership
 from clubs.tests.helpers import LogInTester
 
@@ -119,3 +122,80 @@ class ClubAPI(TestCase):
         self.assertTrue(data["is_owner"])
         self.assertEqual(self.club.description, data["description"])
         self.assertEqual(self.club.location, data["location"])
+
+    def test_pages_cover_roster_once_in_order(self):
+        form_input = {"email": "1@test.org", "password": "Password123"}
+        response = self.client.post(reverse("log_in"), form_input)
+        pages = []
+        params = {"name": "test", "limit": 3}
+        while True:
+            response = self.client.get(self.url, params)
+            self.assertTrue(response.status_code==200)
+            data = json.loads(response.content)
+            pages.append(data)
+            if not data["next"]:
+                break
+            params["cursor"] = data["next"]
+        self.assertEqual(len(pages), 4)
+        self.assertEqual(pages[0]["owner"]["email"], "0@test.org")
+        self.assertIsNone(pages[1]["owner"])
+        emails = []
+        for page in pages:
+            if page["owner"]:
+                emails.append(page["owner"]["email"])
+            emails += [user["email"] for user in page["officers"] + page["members"]]
+            self.assertTrue(len(page["officers"] + page["members"]) <= 3)
+        self.assertEqual(emails, [user.email for user in self.users])
+
+    def test_invalid_cursor(self):
+        form_input = {"email": "1@test.org", "password": "Password123"}
+        response = self.client.post(reverse("log_in"), form_input)
+        response = self.client.get(self.url, {"name": "test", "cursor": "not a cursor"})
+        self.assertTrue(response.status_code==400)
+
+    def test_out_of_range_cursor(self):
+        form_input = {"email": "1@test.org", "password": "Password123"}
+        response = self.client.post(reverse("log_in"), form_input)
+        response = self.client.get(self.url, {"name": "test", "cursor": encode_cursor(99999999999999999999, 1)})
+        self.assertTrue(response.status_code==400)
+
+    def test_invalid_limit(self):
+        form_input = {"email": "1@test.org", "password": "Password123"}
+        response = self.client.post(reverse("log_in"), form_input)
+        response = self.client.get(self.url, {"name": "test", "limit": 0})
+        self.assertTrue(response.status_code==400)
+        response = self.client.get(self.url, {"name": "test", "limit": "many"})
+        self.assertTrue(response.status_code==400)
+
+    def test_compact_format_matches_full_format(self):
+        form_input = {"email": "1@test.org", "password": "Password123"}
+        response = self.client.post(reverse("log_in"), form_input)
+        full = json.loads(self.client.get(self.url, {"name": "test"}).content)
+        compact = json.loads(self.client.get(self.url, {"name": "test", "format": "compact"}).content)
+        self.assertEqual(compact["fields"], ["id", "name", "experience", "bio", "gravatar", "user_level", "email"])
+        self.assertEqual(dict(zip(compact["fields"], compact["owner"])), full["owner"])
+        for level in ("officers", "members"):
+            self.assertEqual([dict(zip(compact["fields"], user)) for user in compact[level]], full[level])
+        self.assertEqual(compact["next"], full["next"])
+
+    def test_compact_format_hides_email_from_members(self):
+        form_input = {"email": "9@test.org", "password": "Password123"}
+        response = self.client.post(reverse("log_in"), form_input)
+        data = json.loads(self.client.get(self.url, {"name": "test", "format": "compact"}).content)
+        self.assertNotIn("email", data["fields"])
+        self.assertEqual(len(data["owner"]), len(data["fields"]))
+
+    def test_roster_is_one_query(self):
+        form_input = {"email": "1@test.org", "password": "Password123"}
+        response = self.client.post(reverse("log_in"), form_input)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {"name": "test"})
+        roster_queries = [query["sql"] for query in context.captured_queries if "clubs_user" in query["sql"] and "clubs_clubmembership" in query["sql"]]
+        self.assertEqual(len(roster_queries), 1)
+        self.assertNotIn("personal_statement", roster_queries[0])
+
+    def test_invalid_format(self):
+        form_input = {"email": "1@test.org", "password": "Password123"}
+        response = self.client.post(reverse("log_in"), form_input)
+        response = self.client.get(self.url, {"name": "test", "format": "xml"})
+        self.assertTrue(response.status_code==400)
@@ -0,0 +1,71 @@
+"""Tests of the clubs directory view."""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from clubs.models import User, Club, ClubMembership
+from clubs.tests.helpers import reverse_with_next
+
+class ClubsViewTestCase(TestCase):
+    """Tests of the clubs directory view."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email = 'sensei@cobrakai.dojo',
+            name = 'Jonny Lawrence',
+            personal_statement = 'I\'m gonna kick some ass',
+            chess_experience = 'B',
+            password = 'NoM1yag1Do!',
+            bio = 'STRIKE FIRST - STRIKE HARD - NO MERCY',
+        )
+        self.owner = User.objects.create_user(
+            email = 'sensei@miyagi.do',
+            name = 'Daniel LaRusso',
+            personal_statement = 'Kids must know how to protect themselves',
+            chess_experience = 'B',
+            password = 'M1yag!Kata',
+            bio = 'If the opponent insists on war, take away their ability to wage it.',
+        )
+        self.url = reverse('clubs')
+
+    def _create_clubs(self, n):
+        start = Club.objects.count()
+        for i in range(start, start + n):
+            club = Club.objects.create(name = f'Club {i}', location = 'LA, California', description = 'Testing')
+            ClubMembership.objects.create(foreign_user = self.owner, foreign_club = club, membership = ClubMembership.UserLevels.OWNER)
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_clubs_url(self):
+        self.assertEqual(self.url, '/clubs/')
+
+    def test_get_clubs_redirects_when_not_logged_in(self):
+        redirect_url = reverse_with_next('log_in', self.url)
+        response = self.client.get(self.url)
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    def test_get_clubs_lists_owner_members_and_status(self):
+        self._create_clubs(2)
+        club = Club.objects.get(name = 'Club 0')
+        ClubMembership.objects.create(foreign_user = self.user, foreign_club = club, membership = ClubMembership.UserLevels.PENDING)
+        self.client.login(email = self.user.email, password = 'NoM1yag1Do!')
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, 'clubs.html')
+        clubs = {club.name: club for club in response.context['clubs']}
+        self.assertEqual(clubs['Club 0'].owner_name, self.owner.name)
+        self.assertEqual(clubs['Club 0'].member_count, 2)
+        self.assertEqual(clubs['Club 0'].status, ClubMembership.UserLevels.PENDING)
+        self.assertEqual(clubs['Club 1'].member_count, 1)
+        self.assertEqual(clubs['Club 1'].status, ClubMembership.UserLevels.REJECTED - 1)
+        self.assertContains(response, self.owner.name)
+
+    def test_get_clubs_query_count_is_constant(self):
+        self.client.login(email = self.user.email, password = 'NoM1yag1Do!')
+        self._create_clubs(1)
+        expected = self._count_queries()
+        self._create_clubs(20)
+        self.assertEqual(self._count_queries(), expected)
@@ -0,0 +1,109 @@
+import pytz
+from datetime import datetime, timedelta
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from clubs.models import User, Club, ClubMembership, Tournament, TournamentParticipant
+
+class ConditionalGetTestCase(TestCase):
+
+    def setUp(self):
+        self.club = Club.objects.create(name="test",location="london", description="test")
+        self.users = []
+        for i in range(3):
+            self.users.append(User.objects.create_user(
+                name=str(i),
+                email=str(i)+"@test.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="Testing"
+            ))
+        ClubMembership.objects.create(foreign_user=self.users[0], foreign_club=self.club, membership=ClubMembership.UserLevels.OWNER)
+        ClubMembership.objects.create(foreign_user=self.users[1], foreign_club=self.club, membership=ClubMembership.UserLevels.MEMBER)
+        self.tournament = Tournament.objects.create(
+            club=self.club,
+            name="tournament",
+            description="testing",
+            signup_deadline=datetime.now(tz=pytz.UTC) + timedelta(days=1))
+        self.client.login(email="0@test.org", password="Password123")
+        self.urls = [
+            (reverse("club"), {"name": "test"}),
+            (reverse("club_dashboard"), {"name": "test"}),
+            (reverse("pending_applications"), {"name": "test"}),
+            (reverse("club_tournaments"), {"name": "test"}),
+            (reverse("applications"), {}),
+        ]
+
+    def _revalidate(self):
+        statuses = []
+        for url, params in self.urls:
+            etag = self.client.get(url, params)["ETag"]
+            statuses.append(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code)
+        return statuses
+
+    def test_unchanged_responses_are_not_modified(self):
+        self.assertEqual(self._revalidate(), [304] * len(self.urls))
+
+    def test_stale_etag_gets_full_response(self):
+        for url, params in self.urls:
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH='"stale"')
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.has_header("ETag"))
+
+    def test_not_modified_skips_roster_queries(self):
+        etag = self.client.get(reverse("club"), {"name": "test"})["ETag"]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("club"), {"name": "test"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # session, user, club with the caller's level
+        self.assertEqual(len(context.captured_queries), 3)
+
+    def test_etag_differs_per_user(self):
+        etag = self.client.get(reverse("club"), {"name": "test"})["ETag"]
+        self.client.login(email="1@test.org", password="Password123")
+        self.assertEqual(self.client.get(reverse("club"), {"name": "test"}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def _assert_changes_etag(self, change):
+        etags = [self.client.get(url, params)["ETag"] for url, params in self.urls[:2]]
+        change()
+        for (url, params), etag in zip(self.urls[:2], etags):
+            self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_new_application_changes_etag(self):
+        self._assert_changes_etag(lambda: ClubMembership.objects.create(foreign_user=self.users[2], foreign_club=self.club))
+
+    def test_rank_change_changes_etag(self):
+        def promote():
+            membership = ClubMembership.objects.get(foreign_user=self.users[1])
+            membership.membership = ClubMembership.UserLevels.OFFICER
+            membership.save()
+        self._assert_changes_etag(promote)
+
+    def test_leaving_changes_etag(self):
+        self._assert_changes_etag(lambda: ClubMembership.objects.get(foreign_user=self.users[1]).delete())
+
+    def test_participant_changes_etag(self):
+        self._assert_changes_etag(lambda: TournamentParticipant.objects.create(tournament=self.tournament, participant=self.users[1]))
+
+    def test_profile_change_changes_etag(self):
+        def rename():
+            self.users[1].name = "renamed"
+            self.users[1].save()
+        self._assert_changes_etag(rename)
+
+    def test_moving_to_a_club_at_the_same_version_changes_etag(self):
+        other = Club.objects.create(name="other", location="london", description="test")
+        membership = ClubMembership.objects.create(foreign_user=self.users[2], foreign_club=self.club)
+        Club.objects.filter(pk=self.club.pk).update(version=5)
+        self.client.login(email="2@test.org", password="Password123")
+        etag = self.client.get(reverse("applications"))["ETag"]
+        membership.delete()
+        ClubMembership.objects.create(foreign_user=self.users[2], foreign_club=other)
+        Club.objects.filter(pk=other.pk).update(version=5)
+        self.assertEqual(self.client.get(reverse("applications"), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_log_in_keeps_version(self):
+        version = Club.objects.get(pk=self.club.pk).version
+        self.client.login(email="1@test.org", password="Password123")
+        self.assertEqual(Club.objects.get(pk=self.club.pk).version, version)
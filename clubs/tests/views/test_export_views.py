@@ -0,0 +1,178 @@
+import csv
+import io
+import json
+import pytz
+import threading
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from datetime import datetime, timedelta
+from django.db import connections
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from clubs.models import User, Club, ClubMembership, Tournament, TournamentOrganizer, TournamentParticipant
+from system.asgi import application
+
+class ExportViewsTestCase(TestCase):
+
+    def setUp(self):
+        self.club = Club.objects.create(name="test club", location="london", description="test")
+        self.users = []
+        for i in range(5):
+            self.users.append(User.objects.create_user(
+                name=str(i),
+                email=str(i)+"@test.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="Testing"
+            ))
+        levels = [
+            ClubMembership.UserLevels.OWNER,
+            ClubMembership.UserLevels.OFFICER,
+            ClubMembership.UserLevels.MEMBER,
+            ClubMembership.UserLevels.PENDING,
+        ]
+        for user, level in zip(self.users, levels):
+            ClubMembership.objects.create(foreign_user=user, foreign_club=self.club, membership=level)
+        self.tournament = Tournament.objects.create(
+            club=self.club,
+            name="first",
+            description="testing",
+            signup_deadline=datetime.now(tz=pytz.UTC) + timedelta(days=1))
+        TournamentOrganizer.objects.create(
+            tournament=self.tournament,
+            organizer=self.users[4],
+            organizing_role=TournamentOrganizer.OrganizingRoles.ORGANIZER)
+        TournamentParticipant.objects.create(tournament=self.tournament, participant=self.users[2])
+
+    def _export(self, user, **params):
+        self.client.force_login(user)
+        return self.client.get(reverse("export_club_members"), {"name": "test club", **params})
+
+    def _rows(self, response):
+        return list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+    def test_members_csv(self):
+        response = self._export(self.users[0])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="test-club-members.csv"')
+        self.assertEqual(response["Cache-Control"], "private, no-store")
+        rows = self._rows(response)
+        self.assertEqual(rows[0], ["id", "name", "email", "experience", "level", "bio"])
+        # pending applicants are not members yet
+        self.assertEqual([row[2] for row in rows[1:]], ["0@test.org", "1@test.org", "2@test.org"])
+        self.assertEqual([row[4] for row in rows[1:]], ["Owner", "Officer", "Member"])
+
+    def test_members_jsonl(self):
+        response = self._export(self.users[1], format="jsonl")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson; charset=utf-8")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        first = json.loads(lines[0])
+        self.assertEqual(first["id"], self.users[0].id)
+        self.assertEqual(first["email"], "0@test.org")
+        self.assertEqual(first["level"], "Owner")
+
+    def test_members_and_outsiders_cannot_export(self):
+        self.assertEqual(self._export(self.users[2]).status_code, 403)
+        self.assertEqual(self._export(self.users[3]).status_code, 403)
+        self.assertEqual(self._export(self.users[4]).status_code, 403)
+
+    def test_requires_login(self):
+        response = self.client.get(reverse("export_club_members"), {"name": "test club"})
+        self.assertEqual(response.status_code, 302)
+
+    def test_bad_requests(self):
+        self.assertEqual(self._export(self.users[0], format="xlsx").status_code, 400)
+        self.assertEqual(self._export(self.users[0], name="missing").status_code, 404)
+        self.client.force_login(self.users[0])
+        self.assertEqual(self.client.post(reverse("export_club_members"), {"name": "test club"}).status_code, 400)
+
+    def test_formulas_are_escaped_in_csv(self):
+        self.users[1].name = "=HYPERLINK(\"http://evil\")"
+        self.users[1].save()
+        rows = self._rows(self._export(self.users[0]))
+        self.assertEqual(rows[2][1], "'=HYPERLINK(\"http://evil\")")
+
+    @override_settings(EXPORT_BUFFER_SIZE=64, EXPORT_CHUNK_SIZE=1)
+    def test_streams_in_chunks(self):
+        response = self._export(self.users[0])
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(len(list(csv.reader(io.StringIO(b"".join(chunks).decode())))), 4)
+
+    def test_participants_for_organizers_and_staff(self):
+        url = reverse("export_tournament_participants")
+        params = {"club": "test club", "tournament": "first"}
+        for user in (self.users[0], self.users[1], self.users[4]):
+            self.client.force_login(user)
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Disposition"], 'attachment; filename="test-club-first-participants.csv"')
+            rows = self._rows(response)
+            self.assertEqual(rows[0], ["id", "name", "email", "experience", "bio"])
+            self.assertEqual([row[2] for row in rows[1:]], ["2@test.org"])
+        self.client.force_login(self.users[2])
+        self.assertEqual(self.client.get(url, params).status_code, 403)
+        self.assertEqual(self.client.get(url, {**params, "tournament": "missing"}).status_code, 404)
+
+class ExportConcurrencyTestCase(TransactionTestCase):
+    """A large export streamed by one WSGI request thread while other requests come in."""
+
+    def setUp(self):
+        self.club = Club.objects.create(name="test", location="london", description="test")
+        User.objects.bulk_create([
+            User(name=str(i), email=str(i)+"@test.org", personal_statement="Testing", bio="Testing", chess_experience="B")
+            for i in range(500)
+        ])
+        self.owner = User.objects.get(email="0@test.org")
+        self.member = User.objects.get(email="1@test.org")
+        ClubMembership.objects.create(foreign_user=self.owner, foreign_club=self.club, membership=ClubMembership.UserLevels.OWNER)
+        ClubMembership.objects.bulk_create([
+            ClubMembership(foreign_user_id=user.pk, foreign_club=self.club, membership=ClubMembership.UserLevels.MEMBER)
+            for user in User.objects.exclude(pk=self.owner.pk)
+        ])
+
+    @override_settings(EXPORT_BUFFER_SIZE=256, EXPORT_CHUNK_SIZE=10)
+    def test_other_requests_are_answered_during_an_export(self):
+        started, answered = threading.Event(), threading.Event()
+        lines = []
+        exporter, client = Client(), Client()
+        exporter.force_login(self.owner)
+        client.force_login(self.member)
+
+        def export():
+            try:
+                chunks = iter(exporter.get(reverse("export_club_members"), {"name": "test"}).streaming_content)
+                body = next(chunks)
+                started.set()
+                # the export stays open, half read, until the other request has been answered
+                answered.wait(timeout=10)
+                body += b"".join(chunks)
+                lines.extend(body.decode().splitlines())
+            finally:
+                started.set()
+                connections.close_all()
+
+        thread = threading.Thread(target=export)
+        thread.start()
+        self.assertTrue(started.wait(timeout=10))
+        response = client.get(reverse("club"), {"name": "test"})
+        answered.set()
+        thread.join(timeout=10)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(lines), 501)
+
+    def test_not_served_by_asgi(self):
+        scope = {"type": "http", "method": "GET", "path": reverse("export_club_members"), "query_string": b"name=test", "headers": []}
+
+        async def request():
+            communicator = ApplicationCommunicator(application, scope)
+            await communicator.send_input({"type": "http.request", "body": b""})
+            start = await communicator.receive_output(timeout=5)
+            await communicator.wait(timeout=5)
+            return start
+
+        self.assertEqual(async_to_sync(request)()["status"], 404)
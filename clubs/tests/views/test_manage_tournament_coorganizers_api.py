@@ -0,0 +1,71 @@
+import json
+import pytz
+from datetime import datetime, timedelta
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from clubs.models import User, Club, ClubMembership, Tournament, TournamentOrganizer, TournamentParticipant
+
+class ManageTournamentCoorganizersAPITestCase(TestCase):
+
+    def setUp(self):
+        self.club = Club.objects.create(name="test",location="london", description="test")
+        self.tournament = Tournament.objects.create(
+            club=self.club,
+            name="tournament",
+            description="testing",
+            signup_deadline=datetime.now(tz=pytz.UTC) + timedelta(days=1))
+        self.users = []
+        for i in range(4):
+            self._add_officer(i)
+        ClubMembership.objects.filter(foreign_user=self.users[0]).update(membership=ClubMembership.UserLevels.OWNER)
+        TournamentOrganizer.objects.create(
+            tournament=self.tournament,
+            organizer=self.users[0],
+            organizing_role=TournamentOrganizer.OrganizingRoles.ORGANIZER)
+        TournamentParticipant.objects.create(tournament=self.tournament, participant=self.users[1])
+        self.client.login(email="0@test.org", password="Password123")
+        self.url = reverse("manage_tournament_coorganizers")
+        self.params = {"club": "test", "tournament": "tournament"}
+
+    def _add_officer(self, i):
+        self.users.append(User.objects.create_user(
+            name=str(i),
+            email=str(i)+"@test.org",
+            personal_statement="Testing",
+            password="Password123",
+            bio="Testing"
+        ))
+        ClubMembership.objects.create(foreign_user=self.users[-1], foreign_club=self.club, membership=ClubMembership.UserLevels.OFFICER)
+
+    def test_lists_eligible_officers(self):
+        response = self.client.get(self.url, self.params)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data["available_officers"], [
+            {"id": self.users[2].id, "email": "2@test.org"},
+            {"id": self.users[3].id, "email": "3@test.org"},
+        ])
+        self.assertEqual(data["organizers"], [{"name": "0", "role": "Organizer", "email": "0@test.org"}])
+
+    def test_queries_do_not_grow_with_officers(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url, self.params)
+        for i in range(4, 20):
+            self._add_officer(i)
+        with CaptureQueriesContext(connection) as more_officers:
+            response = self.client.get(self.url, self.params)
+        self.assertEqual(len(json.loads(response.content)["available_officers"]), 18)
+        self.assertEqual(len(more_officers), len(context))
+
+    def test_manage_page_queries_do_not_grow_with_officers(self):
+        url = reverse("manage_tournament")
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url, self.params)
+        for i in range(4, 20):
+            self._add_officer(i)
+        with CaptureQueriesContext(connection) as more_officers:
+            response = self.client.get(url, self.params)
+        self.assertEqual(len(response.context["form"].fields["organizer"].queryset), 18)
+        self.assertEqual(len(more_officers), len(context))
@@ -0,0 +1,41 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from clubs.models import User, Club, ClubMembership
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SLOW_REQUEST_MS=0)
+class ProfilingMiddlewareTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            name="0",
+            email="0@test.org",
+            personal_statement="Testing",
+            password="Password123",
+            bio="Testing")
+        for i in range(3):
+            club = Club.objects.create(name=str(i), location="london", description="test")
+            ClubMembership.objects.create(foreign_user=self.user, foreign_club=club, membership=ClubMembership.UserLevels.OWNER)
+        self.client.login(email="0@test.org", password="Password123")
+
+    def test_server_timing_header(self):
+        with self.assertLogs("system.profiling"):
+            response = self.client.get(reverse("create_tournament"))
+        timings = [entry.split(";")[0] for entry in response["Server-Timing"].split(", ")]
+        self.assertEqual(timings, ["sql", "tpl", "view", "total"])
+        self.assertNotIn('desc="0 queries"', response["Server-Timing"])
+
+    def test_slow_request_log_lists_duplicated_queries(self):
+        with self.assertLogs("system.profiling") as logs:
+            self.client.get(reverse("home"))
+        self.assertIn("GET /home", logs.output[0])
+        self.assertIn("3x SELECT", logs.output[0])
+
+    @override_settings(PROFILING_SLOW_REQUEST_MS=60000)
+    def test_fast_request_not_logged(self):
+        with self.assertNoLogs("system.profiling"):
+            self.client.get(reverse("create_tournament"))
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled(self):
+        response = self.client.get(reverse("create_tournament"))
+        self.assertFalse(response.has_header("Server-Timing"))
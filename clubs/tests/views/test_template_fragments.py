@@ -0,0 +1,78 @@
+import pytz
+from datetime import datetime, timedelta
+from unittest import mock
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from clubs.cache import club_cache
+from clubs.models import User, Club, ClubMembership, Tournament
+
+class TemplateFragmentsTestCase(TestCase):
+
+    def setUp(self):
+        club_cache().clear()
+        caches["template_fragments"].clear()
+        self.club = Club.objects.create(name="test", location="london", description="before")
+        self.user = User.objects.create_user(
+            name="owner",
+            email="owner@test.org",
+            personal_statement="Testing",
+            password="Password123",
+            bio="Testing"
+        )
+        ClubMembership.objects.create(foreign_user=self.user, foreign_club=self.club, membership=ClubMembership.UserLevels.OWNER)
+        self.tournament = Tournament.objects.create(
+            club=self.club,
+            name="first",
+            description="testing",
+            signup_deadline=datetime.now(tz=pytz.UTC) + timedelta(days=1))
+        self.client.login(email="owner@test.org", password="Password123")
+
+    def test_tournaments_table_is_cached(self):
+        first = self.client.get(reverse("tournament"))
+        # an update that skips the signals leaves the cached table in place
+        Tournament.objects.filter(pk=self.tournament.pk).update(name="renamed")
+        second = self.client.get(reverse("tournament"))
+        self.assertEqual(first.content, second.content)
+        self.assertContains(second, "first")
+
+    def test_tournaments_are_only_read_on_a_miss(self):
+        self.client.get(reverse("tournament"))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("tournament"))
+        self.assertContains(response, "first")
+        self.assertFalse([query for query in queries if "clubs_tournament" in query["sql"]])
+
+    def test_tournaments_table_follows_tournament_changes(self):
+        self.client.get(reverse("tournament"))
+        self.tournament.name = "renamed"
+        self.tournament.save()
+        Tournament.objects.create(
+            club=Club.objects.create(name="other", location="london", description="other"),
+            name="second",
+            description="testing",
+            signup_deadline=datetime.now(tz=pytz.UTC) + timedelta(days=1))
+        response = self.client.get(reverse("tournament"))
+        self.assertContains(response, "renamed")
+        self.assertContains(response, "second")
+        self.assertNotContains(response, "first")
+
+    def test_club_profile_follows_club_changes(self):
+        self.assertContains(self.client.get(reverse("club_profile"), {"name": "test"}), "before")
+        self.club.description = "after"
+        self.club.save()
+        response = self.client.get(reverse("club_profile"), {"name": "test"})
+        self.assertContains(response, "after")
+        self.assertNotContains(response, "before")
+
+    def test_fragments_follow_writes_of_another_worker(self):
+        self.client.get(reverse("tournament"))
+        self.client.get(reverse("club_profile"), {"name": "test"})
+        # another worker's write bumps Club.version but not this worker's cache generation
+        with mock.patch("clubs.cache.bump_generation"):
+            self.tournament.name = "renamed"
+            self.tournament.save()
+        self.assertContains(self.client.get(reverse("tournament")), "renamed")
+        self.assertContains(self.client.get(reverse("club_profile"), {"name": "test"}), "renamed")
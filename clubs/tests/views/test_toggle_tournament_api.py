@@ -1,7 +1,9 @@
 import json
 import pytz
 from datetime import datetime, timedelta
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from clubs.models import User, Club, ClubMembership, Tournament, TournamentOrganizer, TournamentParticipant
 
@@ -64,11 +66,51 @@ class ToggleParticipationAPI(TestCase):
     def test_as_not_organizer(self):
         response = self.client.post(reverse("log_in"), {"email": self.valid_user.email, "password": "Password123"})
         response = self.client.post(self.url, {"tournament": self.tournament.name, "club": self.club.name})
-        self.assertTrue(response.content.decode() == '1')
+        data = json.loads(response.content)
+        self.assertTrue(data["participating"])
+        self.assertEqual(data["participants"], 1)
+        self.assertEqual(data["limit"], self.tournament.capacity)
         response = self.client.post(self.url, {"tournament": self.tournament.name, "club": self.club.name})
-        self.assertTrue(response.content.decode() == '0')
+        data = json.loads(response.content)
+        self.assertFalse(data["participating"])
+        self.assertEqual(data["participants"], 0)
 
     def test_as_organizer(self):
         response = self.client.post(reverse("log_in"), {"email": self.organizer.email, "password": "Password123"})
         response = self.client.post(self.url, {"tournament": self.tournament.name, "club": self.club.name})
-        self.assertTrue(response.status_code==403)
\ No newline at end of file
+        self.assertTrue(response.status_code==403)
+
+    def test_cannot_join_full_tournament(self):
+        self._fill_tournament()
+        response = self.client.post(reverse("log_in"), {"email": self.valid_user.email, "password": "Password123"})
+        response = self.client.post(self.url, {"tournament": self.tournament.name, "club": self.club.name})
+        self.assertTrue(response.status_code==403)
+        self.assertFalse(TournamentParticipant.objects.filter(tournament=self.tournament, participant=self.valid_user).exists())
+
+    def test_can_withdraw_from_full_tournament(self):
+        self._fill_tournament(self.valid_user)
+        response = self.client.post(reverse("log_in"), {"email": self.valid_user.email, "password": "Password123"})
+        response = self.client.post(self.url, {"tournament": self.tournament.name, "club": self.club.name})
+        data = json.loads(response.content)
+        self.assertFalse(data["participating"])
+        self.assertEqual(data["participants"], self.tournament.capacity - 1)
+
+    def test_toggle_query_count(self):
+        self.client.login(email=self.valid_user.email, password="Password123")
+        with CaptureQueriesContext(connection) as context:
+            self.client.post(self.url, {"tournament": self.tournament.name, "club": self.club.name})
+        statements = [query["sql"] for query in context.captured_queries if "SAVEPOINT" not in query["sql"]]
+        # session, user, tournament with permissions, insert, counter update, club version, change log, new count
+        self.assertEqual(len(statements), 8)
+
+    def _fill_tournament(self, user=None):
+        users = [] if user is None else [user]
+        while len(users) < self.tournament.capacity:
+            users.append(User.objects.create_user(
+                name="filler",
+                email=f"filler{len(users)}@user.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="Testing"))
+        for participant in users:
+            TournamentParticipant.objects.create(tournament=self.tournament, participant=participant)
@@ -0,0 +1,58 @@
+import pytz
+import threading
+from datetime import datetime, timedelta
+from django.db import connection
+from django.test import Client, TransactionTestCase
+from django.urls import reverse
+from clubs.models import User, Club, ClubMembership, Tournament, TournamentParticipant
+
+class ToggleParticipationConcurrency(TransactionTestCase):
+    """Signup-rush stress test: many members joining the same tournament at once."""
+
+    THREADS = 24
+    CAPACITY = 5
+
+    def setUp(self):
+        self.club = Club.objects.create(name="test",location="london", description="test")
+        self.tournament = Tournament.objects.create(
+            club=self.club,
+            name="tournament",
+            description="testing",
+            signup_deadline=datetime.now(tz=pytz.UTC) + timedelta(days=1),
+            capacity=self.CAPACITY)
+        self.clients = []
+        for i in range(self.THREADS):
+            user = User.objects.create_user(
+                name=str(i),
+                email=str(i)+"@test.org",
+                personal_statement="Testing",
+                password="Password123",
+                bio="Testing")
+            ClubMembership.objects.create(foreign_user=user, foreign_club=self.club, membership=ClubMembership.UserLevels.MEMBER)
+            client = Client()
+            client.force_login(user)
+            self.clients.append(client)
+        self.url = reverse("toggle_tournament")
+
+    def _join(self, client, barrier, results):
+        barrier.wait()
+        try:
+            response = client.post(self.url, {"tournament": self.tournament.name, "club": self.club.name})
+            results.append(response.status_code)
+        finally:
+            connection.close()
+
+    def test_capacity_is_never_exceeded(self):
+        barrier = threading.Barrier(self.THREADS)
+        results = []
+        threads = [threading.Thread(target=self._join, args=(client, barrier, results)) for client in self.clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(200), self.CAPACITY)
+        self.assertEqual(results.count(403), self.THREADS - self.CAPACITY)
+        self.tournament.refresh_from_db()
+        self.assertEqual(TournamentParticipant.objects.filter(tournament=self.tournament).count(), self.CAPACITY)
+        self.assertEqual(self.tournament.participant_count, self.CAPACITY)
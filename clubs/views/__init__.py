@@ -3,4 +3,5 @@ from .application_views import *
 from .authentication_views import *
 from .clubs_views import *
 from .dashboard_views import *
+from .export_views import *
 from .tournaments_views import *
\ No newline at end of file
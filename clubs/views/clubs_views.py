@@ -4,13 +4,16 @@ from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.http import HttpResponseForbidden, HttpResponse
 from django.shortcuts import redirect, render
 from django.utils.decorators import method_decorator
 from django.views import View
 from clubs.forms import LogInForm, SignUpForm, EditProfileForm, PasswordForm, CreateClubForm, CreateTournamentForm
-from clubs.models import User, ClubMembership, Club, Application, Tournament, TournamentParticipant
-from clubs.helpers import login_prohibited
+from clubs.models import User, ClubMembership, Club, Application, Tournament
+from clubs.cache import cached
+from clubs.helpers import login_prohibited, replica_reads
 from django.contrib.auth.forms import UserChangeForm
 from django.urls import reverse
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -18,24 +21,19 @@ from django.views.generic.edit import FormView, UpdateView
 
 #View that displays all clubs of the system
 #Uses the login_required decorator so only authorised users can access this view.
+@replica_reads
 @login_required
 def clubs_view(request):
-    clubs = []
-    for club in Club.objects.all():
-        members = ClubMembership.objects.filter(foreign_club=club)
-        status = members.filter(foreign_user=request.user)
-        if status.exists():
-            status = status[0].membership
-        else:
-            status = ClubMembership.UserLevels.REJECTED - 1
-        print(members.count())
-        print(club.name)
-        clubs.append({
-            "name": club.name,
-            "owner": members.filter(membership=ClubMembership.UserLevels.OWNER).first().foreign_user,
-            "members": members.count(),
-            "status": status
-        })
+    memberships = ClubMembership.objects.filter(foreign_club=OuterRef("pk"))
+    clubs = Club.objects.annotate(
+        owner_name=Subquery(
+            memberships.filter(membership=ClubMembership.UserLevels.OWNER).values("foreign_user__name")[:1]
+        ),
+        status=Coalesce(
+            Subquery(memberships.filter(foreign_user=request.user).values("membership")[:1]),
+            Value(ClubMembership.UserLevels.REJECTED - 1)
+        )
+    ).order_by("id")
     return render(request, "clubs.html", {"clubs": clubs})
 
 #View where user can create club. Checks the validty of and returns the CreateClubForm form
@@ -73,6 +71,22 @@ def post_join_club(request):
         return HttpResponse("1", content_type="text/plain")
     return HttpResponse(status=400)
 
+def package_club_profile(club) -> dict:
+    owner = ClubMembership.objects.filter(
+        foreign_club=club, membership=ClubMembership.UserLevels.OWNER
+    ).select_related("foreign_user").first()
+    tournaments = []
+    for name, description, participant_count in Tournament.objects.filter(club=club).values_list("name", "description", "participant_count"):
+        tournaments.append({
+            "name": name,
+            "description": description,
+            "members": participant_count
+        })
+    return {
+        "owner": {"name": owner.foreign_user.name, "gravatar": owner.foreign_user.gravatar()} if owner else None,
+        "tournaments": tournaments
+    }
+
 #View where users can see club profiles. 
 #Uses the login_required decorator so only authorised users can access this view.
 @login_required
@@ -81,23 +95,13 @@ def club_profile(request):
         club_name = None if "name" not in request.GET else request.GET["name"]
         if not club_name:
             return redirect("home")
-        club = Club.objects.filter(name=club_name)
-        if not club.exists():
+        club = Club.objects.filter(name=club_name).first()
+        if club is None:
             return HttpResponse(status=404)
-        club = club.first()
-        tournaments = []
-        for tour in Tournament.objects.filter(club=club):
-            tournaments.append({
-                "name": tour.name,
-                "description": tour.description,
-                "members": TournamentParticipant.objects.filter(tournament=tour).count()
-            })
-        memberships = ClubMembership.objects.filter(foreign_club=club)
         data = {
             "club": club,
-            "owner": memberships.filter(membership=ClubMembership.UserLevels.OWNER).first().foreign_user,
-            "members": memberships.count(),
-            "tournaments": tournaments
+            "members": club.member_count,
+            **cached("profile", club, (), lambda: package_club_profile(club))
         }
         return render(request, "club_profile.html", data)
     return HttpResponse(status=400)
@@ -1,92 +1,324 @@
 import json
 import pytz
 from datetime import datetime
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, IntegerField, Max, OuterRef, Q, Subquery, Value
 from django.http import HttpResponseForbidden, HttpResponse
 from django.shortcuts import redirect, render
-from clubs.models import User, ClubMembership, Club, Application, Tournament, TournamentOrganizer, TournamentParticipant
+from clubs.models import User, ClubMembership, Club, ClubChange, Application, Tournament, TournamentOrganizer, TournamentParticipant
+from clubs.cache import cached
+from clubs.helpers import MAX_DB_INTEGER, decode_cursor, encode_cursor, etag_matches, json_response, not_modified, replica_reads, version_etag
 
 
-def package_members(club_memberships, show_email=False) -> dict:
+# Field order of a member in the compact roster format
+MEMBER_FIELDS = ("id", "name", "experience", "bio", "gravatar", "user_level")
+STAFF_MEMBER_FIELDS = MEMBER_FIELDS + ("email",)
+
+
+def with_members(club_memberships):
+    # Joins each membership to its user, loading only the columns package_members reads
+    return club_memberships.select_related("foreign_user").only(
+        "foreign_user_id", "membership",
+        "foreign_user__name", "foreign_user__chess_experience", "foreign_user__bio",
+        "foreign_user__email", "foreign_user__email_hash"
+    )
+
+
+def package_members(club_memberships, show_email=False, compact=False) -> list:
     package = []
     for cm in club_memberships:
-        package.append({
-            "name": cm.foreign_user.name,
-            "experience": cm.foreign_user.get_chess_experience_display(),
-            "bio": cm.foreign_user.bio,
-            "gravatar": cm.foreign_user.gravatar(),
-            "user_level": cm.get_membership_display()
-        })
+        user = cm.foreign_user
+        member = [cm.foreign_user_id, user.name, user.get_chess_experience_display(), user.bio, user.gravatar(), cm.get_membership_display()]
         if show_email:
-            package[-1]["email"] = cm.foreign_user.email
+            member.append(user.email)
+        package.append(member if compact else dict(zip(STAFF_MEMBER_FIELDS, member)))
     return package
 
+def package_club(club, my_level, limit, after=None, compact=False) -> dict:
+    is_staff = my_level > ClubMembership.UserLevels.MEMBER
+
+    # Keyset pagination over (membership desc, id) so the owner comes first and pages never shift
+    club_memberships = with_members(ClubMembership.objects.filter(
+        foreign_club=club,
+        membership__gte=ClubMembership.UserLevels.MEMBER
+    )).order_by("-membership", "id")
+    if after:
+        club_memberships = club_memberships.filter(
+            Q(membership__lt=after[0]) | Q(membership=after[0], id__gt=after[1])
+        )
+    page = list(club_memberships[:limit + 1])
+    next_cursor = encode_cursor(page[limit - 1].membership, page[limit - 1].id) if len(page) > limit else None
+    page = page[:limit]
+
+    # The page is ordered by level, so one pass splits it into owner, officers and members
+    levels = {level: [] for level in (ClubMembership.UserLevels.OWNER, ClubMembership.UserLevels.OFFICER, ClubMembership.UserLevels.MEMBER)}
+    for cm in page:
+        levels[cm.membership].append(cm)
+    owner = package_members(levels[ClubMembership.UserLevels.OWNER], is_staff, compact)
+    response = {
+        "owner": owner[0] if owner else None,
+        "officers": package_members(levels[ClubMembership.UserLevels.OFFICER], is_staff, compact),
+        "members": package_members(levels[ClubMembership.UserLevels.MEMBER], is_staff, compact),
+        "next": next_cursor,
+        "is_staff": is_staff,
+        "is_owner": my_level == ClubMembership.UserLevels.OWNER,
+        "description": club.description,
+        "location": club.location
+    }
+    if compact:
+        response["fields"] = STAFF_MEMBER_FIELDS if is_staff else MEMBER_FIELDS
+    return response
+
+
+def club_with_membership(club_name, user):
+    # One indexed lookup resolving the club, its version and the caller's level (None for non-members)
+    return Club.objects.filter(name=club_name).annotate(
+        my_level=Subquery(
+            ClubMembership.objects.filter(foreign_club=OuterRef("pk"), foreign_user=user).values("membership")[:1]
+        )
+    ).first()
+
+
+def applications_stamp(user) -> tuple:
+    # Any change to the user's memberships changes a club, a club version or a level in this list;
+    # aggregates of it collide, e.g. leaving one club and joining another at the same version
+    return tuple(ClubMembership.objects.filter(foreign_user=user).order_by("foreign_club_id").values_list(
+        "foreign_club_id", "foreign_club__version", "membership"
+    ))
+
+
+def latest_change(club) -> int:
+    # id of the newest change log entry of the club, the starting point for /club/changes
+    return ClubChange.objects.filter(club=club).aggregate(latest=Max("id"))["latest"] or 0
+
+
+def package_pending_members(club) -> list:
+    pending_memberships = with_members(ClubMembership.objects.filter(
+        foreign_club=club,
+        membership=ClubMembership.UserLevels.PENDING
+    ))
+    return package_members(pending_memberships, True)
+
+
+def package_applications(user) -> dict:
+    response = {"pending": [], "rejected": []}
+    applications = ClubMembership.objects.filter(
+        foreign_user=user,
+        membership__in=[ClubMembership.UserLevels.PENDING, ClubMembership.UserLevels.REJECTED]
+    ).values_list("membership", "foreign_club__name")
+    for membership, club_name in applications:
+        response["pending" if membership == ClubMembership.UserLevels.PENDING else "rejected"].append(club_name)
+    return response
+
+
+def summarize_tournament(tour, participating, is_coorganizer) -> dict:
+    return {
+        "id": tour.id,
+        "name": tour.name,
+        "description": tour.description,
+        "signup_deadline": tour.signup_deadline.strftime("%m/%d/%Y %H:%M"),
+        "organizer": tour.organizer_name,
+        "participants": tour.participant_count,
+        "participating": participating,
+        "limit": tour.capacity,
+        "is_coorganizer": is_coorganizer,
+    }
+
+
+def with_organizer_name(tournaments):
+    organizers = TournamentOrganizer.objects.filter(
+        tournament=OuterRef("pk"), organizing_role=TournamentOrganizer.OrganizingRoles.ORGANIZER
+    )
+    return tournaments.annotate(organizer_name=Subquery(organizers.values("organizer__name")[:1])).order_by("-id")
+
+
+def package_tournaments(tournaments, user) -> list:
+    participants = TournamentParticipant.objects.filter(tournament=OuterRef("pk"))
+    organizers = TournamentOrganizer.objects.filter(tournament=OuterRef("pk"))
+    tournaments = with_organizer_name(tournaments).annotate(
+        participating=Exists(participants.filter(participant=user)),
+        is_coorganizer=Exists(organizers.filter(organizer=user))
+    )
+    return [summarize_tournament(tour, tour.participating, tour.is_coorganizer) for tour in tournaments]
+
+
+def package_club_tournaments(club, user) -> list:
+    # Same as package_tournaments for all of a club's tournaments: the part every user sees is
+    # cached, and the user's own participations and organizer roles are read with one query
+    summaries = cached("tournaments", club, (), lambda: [
+        summarize_tournament(tour, False, False) for tour in with_organizer_name(Tournament.objects.filter(club=club))
+    ])
+    roles = TournamentParticipant.objects.filter(tournament__club=club, participant=user).values_list(
+        "tournament_id", Value(0, output_field=IntegerField())
+    ).union(TournamentOrganizer.objects.filter(tournament__club=club, organizer=user).values_list(
+        "tournament_id", Value(1, output_field=IntegerField())
+    ), all=True)
+    participating, coorganizing = set(), set()
+    for tournament_id, is_organizer in roles:
+        (coorganizing if is_organizer else participating).add(tournament_id)
+    for summary in summaries:
+        summary["participating"] = summary["id"] in participating
+        summary["is_coorganizer"] = summary["id"] in coorganizing
+    return summaries
+
+
+def cached_roster(club, my_level, limit, after=None, compact=False) -> dict:
+    return cached("roster", club, (my_level, limit, after, compact), lambda: package_club(club, my_level, limit, after, compact))
+
 #Home View where user can see clubs they have a membership with.
 #Uses the login_required decorator so only authorised users can access this view.
 @login_required
 def home(request):
     current_user = request.user
     memberships = ClubMembership.objects.filter(foreign_user=current_user, membership__gte=0)
-    return render(request, "home.html", {"club_memberships": memberships})
+    return render(request, "home.html", {"club_memberships": memberships, "club_events_url": settings.CLUB_EVENTS_URL})
 
 #View where user can see accepted members of a club.
+#format=compact sends each member as a list in the order given by "fields" instead of an object.
 #Uses the login_required decorator so only authorised users can access this view.
+@replica_reads
 @login_required
 def get_club(request):
     if request.method == "GET":
         club_name = None if "name" not in request.GET else request.GET["name"]
         if club_name:
-            club_memberships = ClubMembership.objects.filter(foreign_club__name=club_name)
-            if not club_memberships.exists():
+            try:
+                limit = int(request.GET.get("limit", settings.CLUB_MEMBERS_PAGE_SIZE))
+                after = decode_cursor(request.GET["cursor"]) if "cursor" in request.GET else None
+            except ValueError:
+                return HttpResponse(status=400)
+            if limit < 1 or (after is not None and len(after) != 2):
+                return HttpResponse(status=400)
+            if request.GET.get("format", "full") not in ("full", "compact"):
+                return HttpResponse(status=400)
+            compact = request.GET.get("format") == "compact"
+            limit = min(limit, settings.CLUB_MEMBERS_MAX_PAGE_SIZE)
+
+            club = club_with_membership(club_name, request.user)
+            if club is None:
                 return HttpResponse(status=404)
-            my_membership = club_memberships.filter(foreign_user=request.user)
-            if not my_membership.exists():
+            if club.my_level is None:
+                return HttpResponse(status=403)
+            etag = version_etag("club", club.pk, club.version, request.user.pk, limit, after, compact)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            changes_since = latest_change(club)
+            response = cached_roster(club, club.my_level, limit, after, compact)
+            response["changes_since"] = changes_since
+            return json_response(response, etag)
+    return HttpResponse(status=400)
+
+#View returning everything the home page needs when switching clubs: the first roster page,
+#pending applications (staff only), the user's own applications and the club's tournaments.
+#Uses the login_required decorator so only authorised users can access this view.
+@replica_reads
+@login_required
+def get_club_dashboard(request):
+    if request.method == "GET":
+        club_name = None if "name" not in request.GET else request.GET["name"]
+        if club_name:
+            club = club_with_membership(club_name, request.user)
+            if club is None:
+                return HttpResponse(status=404)
+            if club.my_level is None:
+                return HttpResponse(status=403)
+            etag = version_etag("dashboard", club.pk, club.version, request.user.pk, *applications_stamp(request.user))
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            is_staff = club.my_level > ClubMembership.UserLevels.MEMBER
+            changes_since = latest_change(club)
+            response = {
+                "club": cached_roster(club, club.my_level, settings.CLUB_MEMBERS_PAGE_SIZE),
+                "pending": package_pending_members(club) if is_staff else None,
+                "applications": package_applications(request.user),
+                "tournaments": package_club_tournaments(club, request.user)
+            }
+            response["club"]["changes_since"] = changes_since
+            return json_response(response, etag)
+    return HttpResponse(status=400)
+
+#View returning what changed in a club since the client's last sync: the current state of every
+#member and tournament that changed, and the ids of those that are gone.
+#Uses the login_required decorator so only authorised users can access this view.
+@login_required
+def get_club_changes(request):
+    if request.method == "GET":
+        club_name = None if "name" not in request.GET else request.GET["name"]
+        if club_name:
+            try:
+                since = int(request.GET.get("since", ""))
+            except ValueError:
+                return HttpResponse(status=400)
+            if not 0 <= since <= MAX_DB_INTEGER:
+                return HttpResponse(status=400)
+            club = club_with_membership(club_name, request.user)
+            if club is None:
+                return HttpResponse(status=404)
+            if club.my_level is None:
                 return HttpResponse(status=403)
-            is_staff = my_membership.first().membership > ClubMembership.UserLevels.MEMBER
-            club = Club.objects.get(name=club_name)
+            is_staff = club.my_level > ClubMembership.UserLevels.MEMBER
+
+            changed = {ClubChange.Kinds.MEMBER: set(), ClubChange.Kinds.TOURNAMENT: set()}
+            changes_since = since
+            for change_id, kind, subject_id in ClubChange.objects.filter(club=club, id__gt=since).values_list("id", "kind", "subject_id"):
+                changed[kind].add(subject_id)
+                changes_since = max(changes_since, change_id)
+
+            # Non-staff only see accepted members; anyone else who changed is gone from their roster
+            visible_level = ClubMembership.UserLevels.PENDING if is_staff else ClubMembership.UserLevels.MEMBER
+            memberships = with_members(ClubMembership.objects.filter(
+                foreign_club=club,
+                foreign_user_id__in=changed[ClubChange.Kinds.MEMBER],
+                membership__gte=visible_level
+            ))
+            members = package_members(memberships, is_staff)
+            tournaments = package_tournaments(
+                Tournament.objects.filter(club=club, id__in=changed[ClubChange.Kinds.TOURNAMENT]), request.user
+            )
             response = {
-                "owner": package_members(club_memberships.filter(membership=ClubMembership.UserLevels.OWNER), is_staff)[0],
-                "officers": package_members(club_memberships.filter(membership=ClubMembership.UserLevels.OFFICER), is_staff),
-                "members": package_members(club_memberships.filter(membership=ClubMembership.UserLevels.MEMBER), is_staff),
-                "is_staff": is_staff,
-                "is_owner": my_membership.first().membership == ClubMembership.UserLevels.OWNER,
-                "description": club.description,
-                "location": club.location
+                "changes_since": changes_since,
+                "members": members,
+                "removed_members": sorted(changed[ClubChange.Kinds.MEMBER] - {member["id"] for member in members}),
+                "tournaments": tournaments,
+                "removed_tournaments": sorted(changed[ClubChange.Kinds.TOURNAMENT] - {tour["id"] for tour in tournaments}),
             }
             return HttpResponse(json.dumps(response), content_type="application/json")
     return HttpResponse(status=400)
 
 #View where user can see pending members of a club.
 #Uses the login_required decorator so only authorised users can access this view.
+@replica_reads
 @login_required
 def get_club_pending_members(request):
     if request.method == "GET":
         club_name = None if "name" not in request.GET else request.GET["name"]
         if club_name:
-            my_membership = ClubMembership.objects.filter(foreign_club__name=club_name, foreign_user=request.user)
-            if not my_membership.exists():
+            club = club_with_membership(club_name, request.user)
+            if club is None or club.my_level is None:
                 return HttpResponse(status=403)
-            if my_membership.first().membership <= ClubMembership.UserLevels.MEMBER:
+            if club.my_level <= ClubMembership.UserLevels.MEMBER:
                 return HttpResponse(status=403)
-            pending_memberships = ClubMembership.objects.filter(foreign_club__name=club_name, membership=ClubMembership.UserLevels.PENDING)
-            response = package_members(pending_memberships, True)
-            return HttpResponse(json.dumps(response), content_type="application/json")
+            etag = version_etag("pending", club.pk, club.version)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            response = package_pending_members(club)
+            return json_response(response, etag)
     return HttpResponse(status=400)
 
 #View where user can see the status of their application to a club.
 #Uses the login_required decorator so only authorised users can access this view.
+@replica_reads
 @login_required
 def get_applications(request):
     if request.method == "GET":
-        memberships = ClubMembership.objects.filter(foreign_user=request.user)
-        pending = memberships.filter(membership=ClubMembership.UserLevels.PENDING)
-        rejected = memberships.filter(membership=ClubMembership.UserLevels.REJECTED)
-        response = {"pending": [], "rejected": []}
-        for app in pending:
-            response["pending"].append(app.foreign_club.name)
-        for app in rejected:
-            response["rejected"].append(app.foreign_club.name)
-        return HttpResponse(json.dumps(response), content_type="application/json")
+        etag = version_etag("applications", request.user.pk, *applications_stamp(request.user))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response = package_applications(request.user)
+        return json_response(response, etag)
 
 #View where owners can promote and demote members of their club.
 #Uses the login_required decorator so only authorised users can access this view.
@@ -120,7 +352,8 @@ def post_change_rank(request):
             if not membership.exists():
                 return HttpResponse(status=404)
             membership = membership.first()
-            new_rank = membership.membership + promotion_direction
+            rank = membership.membership
+            new_rank = rank + promotion_direction
 
             # Check if the target is pending, a member or an officer
             if membership.membership < ClubMembership.UserLevels.PENDING or membership.membership > ClubMembership.UserLevels.OFFICER:
@@ -136,39 +369,43 @@ def post_change_rank(request):
                 if my_membership.membership == ClubMembership.UserLevels.OFFICER:
                     return HttpResponse(status=403)
 
-                # Demote the current owner
-                if new_rank == ClubMembership.UserLevels.OWNER:
-                    my_membership.membership -= 1
-                    my_membership.save()
-
-            membership.save()
+            try:
+                with transaction.atomic():
+                    # Re-read both ranks with the rows locked (in pk order, so two requests never deadlock);
+                    # if a concurrent request such as a double-clicked transfer changed one, this one is stale
+                    current = ClubMembership.objects.select_for_update().order_by("pk").in_bulk([my_membership.pk, membership.pk])
+                    if my_membership.pk not in current or current[my_membership.pk].membership != my_membership.membership:
+                        return HttpResponse(status=409)
+                    if membership.pk not in current or current[membership.pk].membership != rank:
+                        return HttpResponse(status=409)
+                    # Demote the current owner first so the club never has two owners (unique_owner)
+                    if new_rank == ClubMembership.UserLevels.OWNER:
+                        my_membership.membership -= 1
+                        my_membership.save(update_fields=["membership"])
+                    membership.save(update_fields=["membership"])
+            except IntegrityError:
+                # Another transfer made someone else the owner first
+                return HttpResponse(status=409)
             return HttpResponse("1", content_type="text/plain")
 
     return HttpResponse(status=400)
 
 #View where user can see the details of their application.
 #Uses the login_required decorator so only authorised users can access this view.
+@replica_reads
 @login_required
 def get_club_tournaments(request):
     if request.method == "GET":
         club_name = None if "name" not in request.GET else request.GET["name"]
         if club_name:
-            tournaments = Tournament.objects.filter(club__name=club_name)
-            response = []
-            for tour in tournaments:
-                participants = TournamentParticipant.objects.filter(tournament=tour)
-                response.append({
-                    "name": tour.name,
-                    "description": tour.description,
-                    "signup_deadline": tour.signup_deadline.strftime("%m/%d/%Y %H:%M"),
-                    "organizer": TournamentOrganizer.objects.get(tournament=tour, organizing_role=TournamentOrganizer.OrganizingRoles.ORGANIZER).organizer.name,
-                    "participants": participants.count(),
-                    "participating": participants.filter(participant=request.user).exists(),
-                    "limit": tour.capacity,
-                    "is_coorganizer": TournamentOrganizer.objects.filter(tournament = tour, organizer = request.user).exists(),
-                })
-            response.reverse()
-            return HttpResponse(json.dumps(response), content_type="application/json")
+            club = Club.objects.filter(name=club_name).only("id", "version").first()
+            if club is None:
+                return HttpResponse(json.dumps([]), content_type="application/json")
+            etag = version_etag("tournaments", club.pk, club.version, request.user.pk)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            response = package_club_tournaments(club, request.user)
+            return json_response(response, etag)
     return HttpResponse(status=400)
 
 
@@ -178,35 +415,42 @@ def post_toggle_tournament(request):
         tournament_name = None if "tournament" not in request.POST else request.POST["tournament"]
         club_name = None if "club" not in request.POST else request.POST["club"]
         if tournament_name and club_name:
-            tournament = Tournament.objects.filter(club__name=club_name, name=tournament_name)
-            if not tournament.exists():
+            # Resolve the tournament together with everything the caller's permissions depend on
+            tournament = Tournament.objects.filter(club__name=club_name, name=tournament_name).annotate(
+                membership=Subquery(
+                    ClubMembership.objects.filter(foreign_club=OuterRef("club"), foreign_user=request.user).values("membership")[:1]
+                ),
+                is_organizer=Exists(TournamentOrganizer.objects.filter(tournament=OuterRef("pk"), organizer=request.user)),
+                participating=Exists(TournamentParticipant.objects.filter(tournament=OuterRef("pk"), participant=request.user))
+            ).first()
+            if tournament is None:
                 return HttpResponse(status=400)
-            tournament = tournament.first()
-
-            membership = ClubMembership.objects.filter(foreign_club__name=club_name, foreign_user=request.user)
-            if not membership.exists():
+            if tournament.membership is None or tournament.membership < ClubMembership.UserLevels.MEMBER:
                 return HttpResponse(status=403)
-            membership = membership.first()
-            if membership.membership < ClubMembership.UserLevels.MEMBER:
-                return HttpResponse(status=403)
-
-            organizer = TournamentOrganizer.objects.filter(tournament=tournament, organizer=request.user)
-            if organizer.exists():
+            if tournament.is_organizer:
                 return HttpResponse(status=403)
-
             if datetime.now(tz=pytz.UTC) > tournament.signup_deadline:
                 return HttpResponse(status=403)
 
-            participants = TournamentParticipant.objects.filter(tournament=tournament)
-            if participants.count() >= tournament.capacity:
+            # The capacity check happens in the same UPDATE that bumps the counter (see TournamentParticipant.save),
+            # so concurrent signups serialize on the tournament row and can never overfill it
+            try:
+                with transaction.atomic():
+                    if tournament.participating:
+                        TournamentParticipant.objects.filter(tournament=tournament, participant=request.user).delete()
+                    else:
+                        TournamentParticipant.objects.create(tournament=tournament, participant=request.user)
+                    participants = Tournament.objects.values_list("participant_count", flat=True).get(pk=tournament.pk)
+            except ValidationError:
                 return HttpResponse(status=403)
-
-            participation = participants.filter(participant=request.user)
-            if participation.exists():
-                participation.first().delete()
-                return HttpResponse("0", content_type="text/plain")
-            else:
-                TournamentParticipant.objects.create(tournament=tournament, participant=request.user)
-                return HttpResponse("1", content_type="text/plain")
+            except IntegrityError:
+                # A concurrent request from the same user signed them up first
+                return HttpResponse(status=409)
+            response = {
+                "participating": not tournament.participating,
+                "participants": participants,
+                "limit": tournament.capacity
+            }
+            return HttpResponse(json.dumps(response), content_type="application/json")
 
     return HttpResponse(status=400)
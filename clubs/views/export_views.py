@@ -0,0 +1,30 @@
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse, StreamingHttpResponse
+from clubs.exports import club_members_export, tournament_participants_export
+from clubs.helpers import replica_reads
+
+def export_response(status, export):
+    if status != 200:
+        return HttpResponse(status=status)
+    response = StreamingHttpResponse(export.chunks, content_type=f"{export.content_type}; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{export.filename}"'
+    response["Cache-Control"] = "private, no-store"
+    return response
+
+#View streaming a club's members as CSV or JSON lines (?format=csv|jsonl) to its owner and officers.
+#Uses the login_required decorator so only authorised users can access this view.
+@replica_reads
+@login_required
+def export_club_members(request):
+    if request.method == "GET":
+        return export_response(*club_members_export(request.user, request.GET))
+    return HttpResponse(status=400)
+
+#View streaming a tournament's participants as CSV or JSON lines to its organizers and the club's staff.
+#Uses the login_required decorator so only authorised users can access this view.
+@replica_reads
+@login_required
+def export_tournament_participants(request):
+    if request.method == "GET":
+        return export_response(*tournament_participants_export(request.user, request.GET))
+    return HttpResponse(status=400)
@@ -9,26 +9,25 @@ from django.shortcuts import redirect, render
 from django.utils.decorators import method_decorator
 from django.views import View
 from clubs.forms import LogInForm, SignUpForm, EditProfileForm, PasswordForm, CreateClubForm, CreateTournamentForm, TournamentOrganizerForm
-from clubs.models import User, ClubMembership, Club, Application, Tournament, TournamentOrganizer, TournamentParticipant
-from clubs.helpers import login_prohibited
+from clubs.models import User, Club, Application, Tournament, TournamentOrganizer, TournamentParticipant
+from clubs.helpers import login_prohibited, replica_reads, version_etag
 from django.contrib.auth.forms import UserChangeForm
+from django.db.models import Count, Max, Sum
 from django.urls import reverse
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic.edit import FormView, UpdateView
 
 #View where user can see list of all tournaments being held.
 #Uses the login_required decorator so only authorised users can access this view.
+@replica_reads
 @login_required
 def tournaments_view(request):
-    tournaments = []
-    for tournament in Tournament.objects.all():
-        tournaments.append({
-            "name": tournament.name,
-            "club": tournament.club,
-            "description": tournament.description,
-            "signup_deadline" : tournament.signup_deadline,
-        })
-    return render(request, "tournaments.html", {"tournaments": tournaments})
+    # Club versions only grow and every change to a tournament bumps its club's, so their sum changes
+    # with every change; the count and the newest id cover clubs being deleted. One narrow aggregate
+    # keys the cached table in every worker, and the tournaments are only read when it misses.
+    stamp = tuple(Club.objects.aggregate(clubs=Count("id"), newest=Max("id"), versions=Sum("version")).values())
+    tournaments = Tournament.objects.select_related("club")
+    return render(request, "tournaments.html", {"tournaments": tournaments, "stamp": version_etag(*stamp)})
 
 #View where user can create a tournament. Checks the validy of and then returns the CreateTournamentForm.
 #Uses the login_required decorator so only authorised users can access this view.
@@ -81,8 +80,8 @@ class ManageTournamentView(LoginRequiredMixin, View):
                 redirect("home")
             tournament = tournament.first()
             if TournamentOrganizer.objects.filter(tournament = tournament, organizer = request.user).exists():
-                organizers = TournamentOrganizer.objects.filter(tournament = tournament)
-                participants = TournamentParticipant.objects.filter(tournament = tournament)
+                organizers = TournamentOrganizer.objects.filter(tournament = tournament).select_related('organizer')
+                participants = TournamentParticipant.objects.filter(tournament = tournament).select_related('participant')
                 form = TournamentOrganizerForm(tournament = tournament)
                 return render(
                     request,
@@ -107,7 +106,7 @@ class ManageTournamentCoorganizers(LoginRequiredMixin, View):
                 return HttpResponse(status = 400)
             tournament = tournament.first()
             if TournamentOrganizer.objects.filter(tournament = tournament, organizer = request.user).exists():
-                organizers = TournamentOrganizer.objects.filter(tournament = tournament)
+                organizers = TournamentOrganizer.objects.filter(tournament = tournament).select_related('organizer')
                 organizers_list = []
                 for o in organizers:
                     organizers_list.append({
@@ -116,35 +115,7 @@ class ManageTournamentCoorganizers(LoginRequiredMixin, View):
                         'email': str(o.organizer.email)
                     })
 
-                club_officers = ClubMembership.objects.filter(
-                    foreign_club = tournament.club,
-                    membership__gte = ClubMembership.UserLevels.OFFICER
-                )
-
-                # add the ids of retrieved moderators to a list
-                officers_list = []
-                for officer in club_officers:
-                    officers_list.append(officer.foreign_user.id)
-
-                # retrieve and remove all moderators that are already participating in the tournament
-                participating_officers = TournamentParticipant.objects.filter(
-                    tournament = tournament,
-                    participant_id__in = officers_list
-                )
-                for po in participating_officers:
-                    officers_list.remove(po.participant.id)
-
-                # retrieve and remove all moderators that are already coorganizing the tournament
-                organizing_officers = TournamentOrganizer.objects.filter(tournament = tournament)
-                for oo in organizing_officers:
-                    officers_list.remove(oo.organizer.id)
-
-                available_officers = []
-                for o in officers_list:
-                    available_officers.append({
-                        'id': o,
-                        'email': User.objects.get(id = o).email
-                    })
+                available_officers = list(tournament.eligible_coorganizers().values('id', 'email'))
 
                 response = {
                     'available_officers': available_officers,
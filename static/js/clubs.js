@@ -0,0 +1,38 @@
+/* built by manage.py build_assets from js/src/common.js, js/src/clubs.js */
+// Shared by every page bundle (see clubs/assets.py). A page passes its URLs and other values as
+// data-* attributes of its <script> tag: data-club-url="..." is read here as page.clubUrl.
+const page = document.currentScript.dataset;
+
+function getCookie(name) {
+  let cookieValue = null;
+  if (document.cookie && document.cookie !== '') {
+      const cookies = document.cookie.split(';');
+      for (let i = 0; i < cookies.length; i++) {
+          const cookie = cookies[i].trim();
+          // Does this cookie string begin with the name we want?
+          if (cookie.substring(0, name.length + 1) === (name + '=')) {
+              cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+              break;
+          }
+      }
+  }
+  return cookieValue;
+}
+
+function submitApplication(button) {
+  let request = new XMLHttpRequest();
+  request.onreadystatechange = function() {
+    if(this.readyState == 4 && this.status == 200) {
+      let success = this.response;
+      if(success == "1") {
+        button.classList.remove("btn-primary");
+        button.classList.add("btn-secondary");
+        button.innerHTML = "Pending";
+      }
+    }
+  }
+  request.open("POST", page.submitApplicationUrl + "?");
+  request.setRequestHeader("X-CSRFToken", getCookie("csrftoken"));
+  request.setRequestHeader("Content-type", "application/x-www-form-urlencoded");
+  request.send("name="+button.value);
+}
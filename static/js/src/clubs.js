@@ -0,0 +1,17 @@
+function submitApplication(button) {
+  let request = new XMLHttpRequest();
+  request.onreadystatechange = function() {
+    if(this.readyState == 4 && this.status == 200) {
+      let success = this.response;
+      if(success == "1") {
+        button.classList.remove("btn-primary");
+        button.classList.add("btn-secondary");
+        button.innerHTML = "Pending";
+      }
+    }
+  }
+  request.open("POST", page.submitApplicationUrl + "?");
+  request.setRequestHeader("X-CSRFToken", getCookie("csrftoken"));
+  request.setRequestHeader("Content-type", "application/x-www-form-urlencoded");
+  request.send("name="+button.value);
+}
@@ -0,0 +1,20 @@
+// Shared by every page bundle (see clubs/assets.py). A page passes its URLs and other values as
+// data-* attributes of its <script> tag: data-club-url="..." is read here as page.clubUrl.
+const page = document.currentScript.dataset;
+
+function getCookie(name) {
+  let cookieValue = null;
+  if (document.cookie && document.cookie !== '') {
+      const cookies = document.cookie.split(';');
+      for (let i = 0; i < cookies.length; i++) {
+          const cookie = cookies[i].trim();
+          // Does this cookie string begin with the name we want?
+          if (cookie.substring(0, name.length + 1) === (name + '=')) {
+              cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+              break;
+          }
+      }
+  }
+  return cookieValue;
+}
+
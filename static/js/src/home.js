@@ -0,0 +1,382 @@
+const current_user_id = parseInt(page.userId);
+
+function getClubName() {
+  let selection = document.getElementById("clubs-selection");
+  return encodeURI(selection.options[selection.selectedIndex].value);
+}
+
+function showClubs() {
+  if(!document.getElementById("member-pane-tab").classList.contains("active")) {
+    if(!document.getElementById("tournament-pane-tab").classList.contains("active")) {
+      $("#member-pane-tab").tab('show');
+    }
+  }
+}
+
+function renderUsers(user_container, users, is_staff) {
+  let name, experience, bio, gravatar, card_body;
+  let email = "";
+  let text = "";
+  for (var i = 0; i < users.length; i += 1) {
+    gravatar = "<img class='card-img-top' src='"+users[i]["gravatar"]+"'>";
+    name = "<h5 class='card-title'>"+users[i]["name"]+"</h5>";
+    name += "<h6 class='card-subtitle mb-2 text-muted'>"+users[i]["user_level"]+"</h6>";
+    experience = "<h6 class='card-subtitle mb-2 text-muted'>"+users[i]["experience"]+"</h6>";
+    bio = "<p class='card-text'>"+users[i]["bio"]+"</p>";
+    if(is_staff) {
+      email = "<h6 class='card-subtitle mb-2 text-muted'>"+users[i]["email"]+"</h6>";
+    }
+    text += "<div class='card'>"+gravatar+"<div class='card-body  d-flex flex-column'>"+name+email+experience+bio+"</div></div>";
+  }
+  user_container.innerHTML = text;
+}
+
+function renderTournaments(tournaments_container, tournaments) {
+  let text = "";
+  let deadline, date, month, day, year, hours, minutes, url;
+  for(var i = 0; i < tournaments.length; ++i) {
+    text += "<div class='card'><div class='card-header'>Organizer: " + tournaments[i]["organizer"] + "</div>";
+    text += "<div class='card-body'>" + "<h5 class='class-title'>" + tournaments[i]["name"] + "</h5>";
+    text += "<h6 class='card-subtitle mb-2 text-muted'>Participants: " + tournaments[i]["participants"] + '/' + tournaments[i]["limit"] + "</h6>";
+    text += "<p class='card-text'>" + tournaments[i]["description"] + "</p>";
+
+    date = tournaments[i]["signup_deadline"].split(' ');
+    [month, day, year] = date[0].split('/').map(x => parseInt(x));
+    [hours, minutes] = date[1].split(':').map(x => parseInt(x));
+    deadline = new Date(year, month-1, day, hours, minutes);
+
+    if(!tournaments[i]["is_coorganizer"] && new Date() > deadline) {
+      url = page.clubTournamentUrl + "?club="+ getClubName() + "&tournament=" + encodeURI(tournaments[i]["name"]);
+      text += "<a class='btn btn-primary' href=" + url + " target='_blank'>View Tournament</a>";
+    }
+    else if(!tournaments[i]["is_coorganizer"]) {
+      if(tournaments[i]["participating"]) {
+        text += "<button class='btn btn-danger' value="+encodeURI(tournaments[i]["name"])+" onclick='joinTournament(this.value)'>Withdraw</button>";
+      }
+      else if(parseInt(tournaments[i]["participants"])==parseInt(tournaments[i]["limit"])) {
+        text += "<button class='btn btn-secondary' disabled>Max Capacity</button>";
+      }
+      else {
+        text += "<button class='btn btn-success' value="+encodeURI(tournaments[i]["name"])+" onclick='joinTournament(this.value)'>Join Tournament</button>";
+      }
+    }
+    else{
+      url = page.manageTournamentUrl + "?club="+ getClubName() + "&tournament=" + encodeURI(tournaments[i]["name"]);
+      text += "<a class='btn btn-info' href=" + url + " target='_blank'>Manage Tournament</a>";
+    }
+    text += "</div><div class='card-footer text-muted'>Deadline: " + tournaments[i]["signup_deadline"] + "</div></div>";
+  }
+  tournaments_container.innerHTML = text;
+}
+
+function insertApplicationButtons(user_container, users) {
+  let button, url, card;
+  for (var i = 0; i < user_container.childElementCount; i += 1) {
+     url = page.clubApplicationUrl + "?" + "email=" + users[i]["email"] + "&name=" + getClubName();
+     button = "<button value=" + url + " class='btn btn-primary btn-block' target='_blank' onclick='window.open(this.value)'>View Application</button>";
+     card = user_container.childNodes[i];
+     card.childNodes[card.childElementCount-1].innerHTML += "<div class='mt-auto d-grid gap-2'>" + button + "</div>";
+  }
+}
+
+function insertRankButtons(user_container, users, inset, promote_text="", demote_text="") {
+  let email, card;
+  let button1 = "";
+  let button2 = "";
+  for (var i = 0; i < users.length; i += 1) {
+     email = "value=" + users[i]["email"];
+     if(promote_text) {
+      button1 = "<button " + email + " class='btn btn-success btn-block' target='_blank', onclick='changeRank(this.value, true)'>"+promote_text+"</button>";
+     }
+     if(demote_text) {
+      button2 = "<button " + email + " class='btn btn-danger btn-block' target='_blank', onclick='changeRank(this.value, false)'>"+demote_text+"</button>";
+    }
+     card = user_container.childNodes[inset+i];
+     card.childNodes[card.childElementCount-1].innerHTML += "<div class='mt-auto d-grid gap-2'>" + button1 + button2 + "</div>";
+  }
+}
+
+function renderApplications(applications) {
+  let pending_box = document.getElementById("pending-list");
+  let rejected_box = document.getElementById("rejected-list");
+  pending_box.innerHTML = "";
+  rejected_box.innerHTML = "";
+  for (var i = 0; i < applications["pending"].length; i++) {
+    pending_box.innerHTML += "<li>"+applications["pending"][i]+"</li>";
+  }
+  for (var i = 0; i < applications["rejected"].length; i++) {
+    rejected_box.innerHTML += "<li>"+applications["rejected"][i]+"</li>";
+  }
+  pending_box.innerHTML += "</ul>";
+  rejected_box.innerHTML += "</ul>";
+}
+
+function renderClubDescription(location, description) {
+  let container = document.getElementById("club-description");
+  container.innerHTML = "<h5>" + "Location: <br/>" + location + "</h5><p>" + "<strong>Description: </strong> <br/>" + description + "</p>";
+}
+
+function renderPending(pending) {
+  club_pending = pending;
+  renderUsers(document.getElementById("application-list"), pending, true);
+  insertApplicationButtons(document.getElementById("application-list"), pending);
+}
+
+function renderClub(club, pending=null, tournaments=null) {
+  if(club["is_staff"]) {
+    document.getElementById("application-pane-tab").style.display = "block";
+    document.getElementById("staff-pane-tab").style.display = "block";
+    if(pending) {
+      renderPending(pending);
+    } else {
+      getPending();
+    }
+  } else {
+    document.getElementById("application-pane-tab").style.display = "none";
+    document.getElementById("staff-pane-tab").style.display = "none";
+  }
+  if(tournaments) {
+    club_tournaments = tournaments;
+    renderTournaments(document.getElementById("tournament-list"), club_tournaments);
+  } else {
+    getTournaments();
+  }
+  renderClubDescription(club["location"], club["description"]);
+}
+
+function renderRoster(club) {
+  let member_list = document.getElementById("member-list");
+  renderUsers(member_list, [club["owner"]].concat(club["officers"], club["members"]).filter(user => user), club["is_staff"]);
+  if(club["is_owner"]) {
+    insertRankButtons(member_list, club["officers"], 1, "Transfer Ownership", "Demote");
+    insertRankButtons(member_list, club["members"], 1 + club["officers"].length, "Promote", "Kick");
+  }
+  else if(club["is_staff"]) {
+    insertRankButtons(member_list, club["members"], 1 + club["officers"].length, "", "Kick");
+  }
+}
+
+function getApplications() {
+  let request = new XMLHttpRequest();
+  request.onreadystatechange = function() {
+    if(this.readyState == 4 && this.status == 200) {
+      renderApplications(JSON.parse(this.response));
+    }
+  }
+  request.open("GET", page.applicationsUrl);
+  request.send();
+}
+
+function getPending() {
+  let request = new XMLHttpRequest();
+  request.onreadystatechange = function() {
+    if(this.readyState == 4 && this.status == 200) {
+      renderPending(JSON.parse(this.response));
+    }
+  }
+  request.open("GET", page.pendingApplicationsUrl+"?name="+getClubName());
+  request.send();
+}
+
+let club_tournaments = [];
+// The roster and pending applications on screen, kept current by applyChanges()
+let club_state = null;
+let club_pending = [];
+let club_changes_since = 0;
+
+function getTournaments() {
+  let request = new XMLHttpRequest();
+  request.onreadystatechange = function() {
+    if(this.readyState == 4 && this.status == 200) {
+      club_tournaments = JSON.parse(this.response);
+      renderTournaments(document.getElementById("tournament-list"), club_tournaments);
+    }
+  }
+  request.open("GET", page.clubTournamentsUrl+"?name="+getClubName());
+  request.send();
+}
+
+function getClub(cursor=null, club=null) {
+  let club_name = getClubName();
+  let request = new XMLHttpRequest();
+  request.onreadystatechange = function () {
+    if(this.readyState == 4 && this.status == 200) {
+      // Ignore pages that arrive after the user switched to another club
+      if(club_name != getClubName()) {
+        return;
+      }
+      let page = JSON.parse(this.response);
+      if(club == null) {
+        club = page;
+        club_state = club;
+        club_changes_since = page["changes_since"];
+        renderClub(club);
+      }
+      else {
+        club["owner"] = club["owner"] || page["owner"];
+        club["officers"] = club["officers"].concat(page["officers"]);
+        club["members"] = club["members"].concat(page["members"]);
+      }
+      renderRoster(club);
+      if(page["next"]) {
+        getClub(page["next"], club);
+      }
+    }
+  }
+  let url = page.clubUrl+"?name="+club_name;
+  if(cursor) {
+    url += "&cursor="+encodeURIComponent(cursor);
+  }
+  request.open("GET", url);
+  request.send();
+}
+
+function getDashboard() {
+  let club_name = getClubName();
+  // deltas only make sense against a loaded roster of this club
+  club_state = null;
+  let request = new XMLHttpRequest();
+  request.onreadystatechange = function () {
+    if(this.readyState == 4 && this.status == 200) {
+      if(club_name != getClubName()) {
+        return;
+      }
+      let dashboard = JSON.parse(this.response);
+      let club = dashboard["club"];
+      club_state = club;
+      club_changes_since = club["changes_since"];
+      renderApplications(dashboard["applications"]);
+      renderClub(club, dashboard["pending"], dashboard["tournaments"]);
+      renderRoster(club);
+      if(club["next"]) {
+        getClub(club["next"], club);
+      }
+    }
+  }
+  request.open("GET", page.clubDashboardUrl+"?name="+club_name);
+  request.send();
+  listenForChanges();
+}
+
+function getChanges() {
+  let club_name = getClubName();
+  let request = new XMLHttpRequest();
+  request.onreadystatechange = function () {
+    if(this.readyState == 4 && this.status == 200) {
+      if(club_name != getClubName()) {
+        return;
+      }
+      applyChanges(JSON.parse(this.response));
+    }
+  }
+  request.open("GET", page.clubChangesUrl+"?name="+club_name+"&since="+club_changes_since);
+  request.send();
+}
+
+// Server-sent events from system/asgi.py announce changes to the selected club; without the events
+// process the stream fails once and the page keeps working, it just stops updating on its own
+let club_events = null;
+
+function listenForChanges() {
+  if(club_events) {
+    club_events.close();
+  }
+  if(!window.EventSource) {
+    return;
+  }
+  // the events process may have a host of its own, which needs the session cookie
+  club_events = new EventSource(page.eventsUrl + "?name=" + encodeURIComponent(getClubName()), {withCredentials: true});
+  club_events.addEventListener("change", function() {
+    if(club_state) {
+      getChanges();
+    }
+  });
+}
+
+function withoutIds(items, ids) {
+  return items.filter(item => !ids.includes(item["id"]));
+}
+
+// Applies a /club/changes delta to the roster, pending applications and tournaments on screen
+function applyChanges(changes) {
+  let changed = changes["removed_members"].concat(changes["members"].map(user => user["id"]));
+  // Our own rank decides which buttons are shown, so reload everything when it changes
+  if(changed.includes(current_user_id)) {
+    getDashboard();
+    return;
+  }
+  club_changes_since = changes["changes_since"];
+
+  if(club_state["owner"] && changed.includes(club_state["owner"]["id"])) {
+    club_state["owner"] = null;
+  }
+  club_state["officers"] = withoutIds(club_state["officers"], changed);
+  club_state["members"] = withoutIds(club_state["members"], changed);
+  club_pending = withoutIds(club_pending, changed);
+  for(let user of changes["members"]) {
+    if(user["user_level"] == "Owner") {
+      club_state["owner"] = user;
+    }
+    else if(user["user_level"] == "Officer") {
+      club_state["officers"].push(user);
+    }
+    else if(user["user_level"] == "Member") {
+      club_state["members"].push(user);
+    }
+    else if(user["user_level"] == "Pending") {
+      club_pending.push(user);
+    }
+  }
+  renderRoster(club_state);
+  if(club_state["is_staff"]) {
+    renderPending(club_pending);
+  }
+
+  let changed_tournaments = changes["removed_tournaments"].concat(changes["tournaments"].map(tour => tour["id"]));
+  club_tournaments = withoutIds(club_tournaments, changed_tournaments).concat(changes["tournaments"]);
+  club_tournaments.sort((a, b) => b["id"] - a["id"]);
+  renderTournaments(document.getElementById("tournament-list"), club_tournaments);
+}
+
+function changeRank(email, is_promoting) {
+  let request = new XMLHttpRequest();
+  request.onreadystatechange = function() {
+    if(this.readyState == 4 && this.status == 200) {
+      let success = this.response;
+      if(success == "1") {
+        getChanges();
+      }
+    }
+  }
+  request.open("POST", page.changeRankUrl + "?");
+  request.setRequestHeader("X-CSRFToken", getCookie("csrftoken"));
+  request.setRequestHeader("Content-type", "application/x-www-form-urlencoded");
+  request.send("email=" + email + "&name=" + getClubName() +"&promoting=" + is_promoting);
+}
+
+function joinTournament(tournament_name) {
+  let request = new XMLHttpRequest();
+  request.onreadystatechange = function() {
+    if(this.readyState == 4 && this.status == 200) {
+      // Apply the new participation state locally instead of re-fetching every tournament
+      let result = JSON.parse(this.response);
+      for(var i = 0; i < club_tournaments.length; ++i) {
+        if(encodeURI(club_tournaments[i]["name"]) == tournament_name) {
+          club_tournaments[i]["participating"] = result["participating"];
+          club_tournaments[i]["participants"] = result["participants"];
+          club_tournaments[i]["limit"] = result["limit"];
+        }
+      }
+      renderTournaments(document.getElementById("tournament-list"), club_tournaments);
+    }
+    else if(this.readyState == 4 && this.status == 403) {
+      getChanges();
+    }
+  }
+  request.open("POST", page.toggleTournamentUrl);
+  request.setRequestHeader("X-CSRFToken", getCookie("csrftoken"));
+  request.setRequestHeader("Content-type", "application/x-www-form-urlencoded");
+  request.send("club="+getClubName()+"&tournament="+tournament_name);
+}
+
+getDashboard();
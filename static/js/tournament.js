@@ -0,0 +1,83 @@
+/* built by manage.py build_assets from js/src/common.js, js/src/tournament.js */
+// Shared by every page bundle (see clubs/assets.py). A page passes its URLs and other values as
+// data-* attributes of its <script> tag: data-club-url="..." is read here as page.clubUrl.
+const page = document.currentScript.dataset;
+
+function getCookie(name) {
+  let cookieValue = null;
+  if (document.cookie && document.cookie !== '') {
+      const cookies = document.cookie.split(';');
+      for (let i = 0; i < cookies.length; i++) {
+          const cookie = cookies[i].trim();
+          // Does this cookie string begin with the name we want?
+          if (cookie.substring(0, name.length + 1) === (name + '=')) {
+              cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+              break;
+          }
+      }
+  }
+  return cookieValue;
+}
+
+function renderCoorganizers(response){
+  let table_body = document.getElementById("organizers-table-body");
+  let text = "";
+  // let form_select = document.getElementById("coorganizer-form").querySelector("select");
+  for(var i = 0; i < response.organizers.length; ++i){
+    text += "<tr>";
+
+    text += "<th scope='row'>" + (i+1) + "</th>";
+
+    text += "<th>" + response.organizers[i]["name"] + "</th>";
+    text += "<th>" + response.organizers[i]["role"] + "</th>";
+    text += "<th>" + response.organizers[i]["email"] + "</th>";
+
+    text += "</tr>";
+  }
+
+  let coorg_select = document.getElementById("coorganizer-select");
+  coorg_select.innerHTML = "";
+
+  let emptyOption = document.createElement("option");
+  emptyOption.value = null;
+  emptyOption.innerHTML = "-------";
+  coorg_select.appendChild(emptyOption);
+  for(var i = 0; i < response.available_officers.length; ++i){
+    let officer = document.createElement("option");
+    officer.vaule = response.available_officers[i].id;
+    officer.innerHTML = response.available_officers[i].email;
+    coorg_select.appendChild(officer);
+  }
+
+  table_body.innerHTML = text;
+}
+
+function getCoorganizers(){
+  let request = new XMLHttpRequest();
+  request.onreadystatechange = function () {
+    if(this.readyState == 4 && this.status == 200) {
+      renderCoorganizers(JSON.parse(this.response));
+    }
+  }
+  request.open("GET", page.manageTournamentCoorganizersUrl+"?club="+encodeURI(page.club)+"&tournament="+encodeURI(page.tournament));
+  request.send();
+}
+
+function post_new_coorganizer(){
+  let request = new XMLHttpRequest();
+  request.onreadystatechange = function() {
+    if(this.readyState == 4 && this.status == 201) {
+      getCoorganizers();
+    }
+  }
+  let selection = document.getElementById("coorganizer-select");
+  let organizer = selection.options[selection.selectedIndex].value;
+  if(organizer) {
+    request.open("POST", page.manageTournamentCoorganizersUrl);
+    request.setRequestHeader("X-CSRFToken", getCookie("csrftoken"));
+    request.setRequestHeader("Content-type", "application/x-www-form-urlencoded");
+    request.send("club="+encodeURI(page.club)+"&tournament="+encodeURI(page.tournament)+"&organizer="+encodeURI(organizer));
+  }
+}
+
+getCoorganizers();
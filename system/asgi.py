@@ -9,8 +9,25 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'system.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# imported after setup, as it uses the models
+from clubs.events import club_events_app
+
+
+async def application(scope, receive, send):
+    """Serve the club event stream only. Pages, the APIs and the exports are served by system.wsgi
+    (see the Procfile): under ASGI, Django 3.2 runs sync views on a single thread per worker and
+    iterates streamed responses on the event loop, so a large export would stall every stream."""
+    if scope['type'] == 'http' and scope['path'] == settings.CLUB_EVENTS_PATH:
+        return await club_events_app(scope, receive, send)
+    if scope['type'] == 'http':
+        await send({'type': 'http.response.start', 'status': 404, 'headers': [(b'content-type', b'text/plain')]})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+    return await django_application(scope, receive, send)
@@ -0,0 +1,245 @@
+"""Per-request profiling, switched on with settings.PROFILING_ENABLED, read replica stickiness and
+response compression."""
+import contextlib
+import contextvars
+import gzip
+import hashlib
+import logging
+import time
+import zlib
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import Template
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from system.routers import replica_configured
+
+logger = logging.getLogger('system.profiling')
+
+# The profile of the request being handled by the current thread or task, if any
+current_profile = contextvars.ContextVar('current_profile', default = None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.view_started = None
+        self.view_time = 0.0
+        self.statements = Counter()
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.sql_count += 1
+            # sql is the parametrised statement, so the same query with different arguments counts as a duplicate
+            self.statements[sql] += 1
+
+    def duplicates(self, limit):
+        return [(sql, count) for sql, count in self.statements.most_common(limit) if count > 1]
+
+
+def _profiled_render(render):
+    def wrapper(self, *args, **kwargs):
+        profile = current_profile.get()
+        if profile is None:
+            return render(self, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            profile.template_time += time.perf_counter() - started
+    wrapper.profiled = True
+    return wrapper
+
+
+class ProfilingMiddleware:
+    """Add a Server-Timing header with SQL, template, view and total times, and log slow requests
+    together with their most repeated SQL statements (usually an N+1 loop)."""
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        # top-level renders go through the backend template; includes and extends are part of its time
+        if not getattr(Template.render, 'profiled', False):
+            Template.render = _profiled_render(Template.render)
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            with contextlib.ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.record_query))
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        total = time.perf_counter() - started
+        if profile.view_started is not None:
+            profile.view_time = time.perf_counter() - profile.view_started
+
+        response['Server-Timing'] = ', '.join([
+            f'sql;dur={profile.sql_time * 1000:.2f};desc="{profile.sql_count} queries"',
+            f'tpl;dur={profile.template_time * 1000:.2f}',
+            f'view;dur={profile.view_time * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ])
+        if total * 1000 >= settings.PROFILING_SLOW_REQUEST_MS:
+            self.log_slow_request(request, response, profile, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = current_profile.get()
+        if profile is not None:
+            profile.view_started = time.perf_counter()
+
+    def log_slow_request(self, request, response, profile, total):
+        lines = [
+            f'{request.method} {request.get_full_path()} {response.status_code} {total * 1000:.1f} ms: '
+            f'{profile.sql_count} queries in {profile.sql_time * 1000:.1f} ms, '
+            f'templates {profile.template_time * 1000:.1f} ms, view {profile.view_time * 1000:.1f} ms'
+        ]
+        for sql, count in profile.duplicates(settings.PROFILING_DUPLICATE_QUERIES):
+            lines.append(f'  {count}x {sql}')
+        logger.warning('\n'.join(lines))
+
+
+class ReplicaStickyMiddleware:
+    """Mark clients that sent a write so that they read from the primary for the next
+    REPLICA_STICKY_SECONDS, until the replica has caught up with their write."""
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE, '1',
+                max_age = settings.REPLICA_STICKY_SECONDS, httponly = True, samesite = 'Lax'
+            )
+        return response
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality = settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel = settings.COMPRESSION_GZIP_LEVEL, mtime = 0)
+
+
+def compress_stream(chunks, encoding):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality = settings.COMPRESSION_BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    # a gzip header and trailer around raw deflate data, flushed per chunk so that clients see progress
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepted_encoding(accept_encoding):
+    """Return the first of settings.COMPRESSION_ENCODINGS that an Accept-Encoding header allows, or None."""
+    accepted = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        name, _, value = params.strip().partition('=')
+        if name.strip() == 'q':
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for encoding in settings.COMPRESSION_ENCODINGS:
+        if encoding == 'br' and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+def weaken_etag(response):
+    # a compressed body is a different representation, which a strong ETag would deny
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+
+
+class CompressionMiddleware:
+    """Compress responses of settings.COMPRESSION_CONTENT_TYPES with brotli or gzip, as the client
+    accepts, once they reach COMPRESSION_MIN_SIZE bytes.
+
+    A response with an ETag is fully determined by it (see clubs.helpers.version_etag), so its
+    compressed body is kept in the COMPRESSION_CACHE alias under the ETag and repeat requests skip
+    the compressor. HTML is not compressed by default, since pages that reflect input next to the
+    CSRF token would be open to BREACH.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.status_code == 304:
+            # revalidates a body that was sent compressed, so it names the same weak ETag
+            if accepted_encoding(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+                weaken_etag(response)
+            return response
+        if response.status_code != 200 or response.has_header('Content-Encoding'):
+            return response
+        if response.get('Content-Type', '').split(';')[0].strip() not in settings.COMPRESSION_CONTENT_TYPES:
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = accepted_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            response.content = self.compressed_content(request, response, encoding)
+            response['Content-Length'] = str(len(response.content))
+        weaken_etag(response)
+        response['Content-Encoding'] = encoding
+        return response
+
+    def compressed_content(self, request, response, encoding):
+        etag = response.get('ETag')
+        if not etag:
+            return compress(response.content, encoding)
+        cache = caches[settings.COMPRESSION_CACHE]
+        key = 'compressed:' + hashlib.md5(f'{encoding}:{request.path}:{etag}'.encode()).hexdigest()
+        content = cache.get(key)
+        if content is None:
+            content = compress(response.content, encoding)
+            cache.set(key, content)
+        return content
@@ -0,0 +1,45 @@
+"""Reads from a replica for the views that opt in with clubs.helpers.replica_reads.
+
+Everything else, including every write and the sessions, uses the primary. Clients that have just
+written carry the cookie set by ReplicaStickyMiddleware and keep reading from the primary until
+it expires, so they see their own writes despite replication lag.
+"""
+import contextlib
+import contextvars
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# True while the current request may read from the replica
+replica_reads_enabled = contextvars.ContextVar('replica_reads_enabled', default = False)
+
+
+@contextlib.contextmanager
+def read_from_replica():
+    token = replica_reads_enabled.set(True)
+    try:
+        yield
+    finally:
+        replica_reads_enabled.reset(token)
+
+
+def replica_configured():
+    return settings.REPLICA_DATABASE in connections.databases
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if replica_reads_enabled.get() and model._meta.app_label in settings.REPLICA_APPS and replica_configured():
+            return settings.REPLICA_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        # explicitly, as Django would otherwise save an instance to the database it was read from
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replica holds the same rows as the primary
+        aliases = {DEFAULT_DB_ALIAS, settings.REPLICA_DATABASE}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -11,8 +11,10 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 from django.contrib.messages import constants as message_constants
+from system.database import database_config, events_broker, replica_config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -45,23 +47,35 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # first, so that its total time covers the rest of the stack
+    'system.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'system.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'system.middleware.ReplicaStickyMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'system.urls'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+#Parse each template once per process instead of on every render; set TEMPLATE_CACHE in production
+if not DEBUG or 'TEMPLATE_CACHE' in os.environ:
+    TEMPLATE_LOADERS = [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -79,11 +93,19 @@ WSGI_APPLICATION = 'system.wsgi.application'
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    # Selected with DATABASE_URL and DATABASE_PROFILE, see system/database.py
+    'default': database_config(os.environ, BASE_DIR),
 }
+if os.environ.get('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = replica_config(os.environ)
+
+#Views marked with clubs.helpers.replica_reads read the models of REPLICA_APPS from REPLICA_DATABASE
+DATABASE_ROUTERS = ['system.routers.ReplicaRouter']
+REPLICA_DATABASE = 'replica'
+REPLICA_APPS = ['clubs']
+#After a write, a client reads from the primary for this many seconds so that it sees its own writes
+REPLICA_STICKY_SECONDS = 10
+REPLICA_STICKY_COOKIE = 'read_primary'
 
 
 # Password validation
@@ -127,6 +149,12 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
+#Serve static files with whitenoise under content-hashed names, precompressed with gzip and brotli and
+#cached by browsers for good (see clubs/assets.py); set STATIC_MANIFEST in production, which needs
+#`manage.py collectstatic` to have run
+if not DEBUG or 'STATIC_MANIFEST' in os.environ:
+    MIDDLEWARE.insert(MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1, 'whitenoise.middleware.WhiteNoiseMiddleware')
+    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
@@ -144,6 +172,107 @@ LOGIN_URL = 'log_in'
 #URL where @login_prohibited redirects to
 REDIRECT_URL_WHEN_LOGGED_IN = 'home'
 
+#Default and maximum number of members returned per page by the club members API
+CLUB_MEMBERS_PAGE_SIZE = 50
+CLUB_MEMBERS_MAX_PAGE_SIZE = 500
+
+#The Procfile serves pages and APIs from WSGI workers (`web`) and only the club event stream from
+#ASGI workers (`events`): under ASGI Django runs all sync views of a worker on one thread, and at
+#--scale 2000 with 8 clients they answer 10-50% fewer requests per second than under WSGI (club 179
+#vs 221, club_dashboard 74 vs 81, applications 165 vs 330; manage.py benchmark_async_api). There
+#are no async views: Django 3.2's ORM is synchronous, so their queries ran one after another on
+#that same thread, and they measured slower than the sync views on every route.
+
+#Cached rosters, tournament summaries and club profiles, see clubs/cache.py. The default is local to
+#each process; CLUB_CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache with
+#CLUB_CACHE_LOCATION=<directory> shares the cache between the workers of a host. Each cache gets its
+#own subdirectory, so that culling or clearing one never drops the other's entries. Without
+#CLUB_CACHE_LOCATION they go to the system's temporary directory, never into the source tree.
+CLUB_CACHE_LOCATION = os.environ.get('CLUB_CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'chess-club-cache'))
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'clubs': {
+        'BACKEND': os.environ.get('CLUB_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.path.join(CLUB_CACHE_LOCATION, 'clubs'),
+        'TIMEOUT': 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    #{% cache %} fragments of the tournaments and club profile pages, keyed on the versions of their clubs
+    'template_fragments': {
+        'BACKEND': os.environ.get('CLUB_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.path.join(CLUB_CACHE_LOCATION, 'template_fragments'),
+        'KEY_PREFIX': 'fragments',
+        'OPTIONS': {
+            'MAX_ENTRIES': 50000,
+        },
+    },
+}
+CLUB_CACHE = 'clubs'
+
+#Response compression (system.middleware.CompressionMiddleware), in order of preference. Compressed
+#bodies of responses with an ETag are kept in COMPRESSION_CACHE.
+COMPRESSION_ENCODINGS = ['br', 'gzip']
+COMPRESSION_CONTENT_TYPES = ['application/json', 'text/csv', 'application/x-ndjson']
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_CACHE = 'clubs'
+
+#Streaming roster and participant exports (clubs/exports.py): rows fetched per query round trip,
+#and characters buffered before each chunk is sent
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_BUFFER_SIZE = 64 * 1024
+#Count cache hits and misses, reported by `manage.py club_cache_stats`. Opt-in, as every lookup then
+#makes an extra cache round trip; the counts are approximate on FileBasedCache (clubs/cache.py)
+CLUB_CACHE_STATS = 'CLUB_CACHE_STATS' in os.environ
+
+#Server-sent club events (served by system/asgi.py only). LocalBroker fans out within one process;
+#DATABASE_PROFILE=production selects clubs.events.ChangeLogBroker, which watches the ClubChange table
+#and so reaches the streams of every worker (system/database.py).
+#CLUB_EVENTS_URL is where pages open the stream: CLUB_EVENTS_PATH on the same host by default, or the
+#URL of the `events` process when it has a host of its own. Such a host reads the session cookie, so
+#set SESSION_COOKIE_DOMAIN to the domain the two share, and list the pages' origins (scheme://host)
+#in CLUB_EVENTS_ALLOWED_ORIGINS.
+CLUB_EVENTS_PATH = '/club/events'
+CLUB_EVENTS_URL = os.environ.get('CLUB_EVENTS_URL', CLUB_EVENTS_PATH)
+CLUB_EVENTS_ALLOWED_ORIGINS = [origin for origin in os.environ.get('CLUB_EVENTS_ALLOWED_ORIGINS', '').split(',') if origin]
+SESSION_COOKIE_DOMAIN = os.environ.get('SESSION_COOKIE_DOMAIN')
+CLUB_EVENTS_BROKER = events_broker(os.environ)
+CLUB_EVENTS_BROKER_OPTIONS = {}
+#Seconds between keepalive comments on an idle stream
+CLUB_EVENTS_KEEPALIVE = 15
+
+#Per-request profiling: Server-Timing headers and a log of requests slower than PROFILING_SLOW_REQUEST_MS
+PROFILING_ENABLED = 'PROFILING' in os.environ
+PROFILING_SLOW_REQUEST_MS = int(os.environ.get('PROFILING_SLOW_REQUEST_MS', 500))
+#How many of the most repeated SQL statements a slow request logs
+PROFILING_DUPLICATE_QUERIES = 5
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'slow_requests': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': BASE_DIR / 'slow_requests.log',
+            'maxBytes': 1024 * 1024,
+            'backupCount': 5,
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'system.profiling': {
+            'handlers': ['slow_requests'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 # Message level tags should use Bootstrap terms
 MESSAGE_TAGS = {
     message_constants.DEBUG: 'dark',
@@ -153,4 +282,5 @@ MESSAGE_TAGS = {
 # Activate django_heroku
 if 'HEROKU_MODE' in os.environ:
     import django_heroku
-    django_heroku.settings(locals())
+    # DATABASES already follows DATABASE_URL, static files are set up above, and LOGGING keeps the slow request log
+    django_heroku.settings(locals(), databases=False, staticfiles=False, logging=False)
@@ -19,13 +19,17 @@ from clubs import views
 
 apipatterns = [
     path('club/users', views.get_club, name="club"),
+    path('club/dashboard', views.get_club_dashboard, name="club_dashboard"),
+    path('club/changes', views.get_club_changes, name="club_changes"),
     path("club/pending", views.get_club_pending_members, name="pending_applications"),
     path("club/submit", views.post_join_club, name="submit_application"),
     path("club/change_rank", views.post_change_rank, name="change_rank"),
     path("club/tournaments", views.get_club_tournaments, name="club_tournaments"),
     path('applications', views.get_applications, name="applications"),
     path("tournament/toggle", views.post_toggle_tournament, name="toggle_tournament"),
-    path('club/tournament/manage_coorganizers', views.ManageTournamentCoorganizers.as_view(), name='manage_tournament_coorganizers')
+    path('club/tournament/manage_coorganizers', views.ManageTournamentCoorganizers.as_view(), name='manage_tournament_coorganizers'),
+    path("club/export", views.export_club_members, name="export_club_members"),
+    path("club/tournament/export", views.export_tournament_participants, name="export_tournament_participants")
 ]
 
 urlpatterns = [